@@ -1,6 +1,7 @@
 from cs_framework.core.concept import Concept
 from pydantic import BaseModel
 from typing import Any, Dict
+from world.records import EnemyRecord
 
 
 class BattlestartedEvent(BaseModel):
@@ -29,8 +30,8 @@ class BattleSystem(Concept):
     def __init__(self, name: str = "BattleSystem"):
         super().__init__(name)
         self.active_battle = False
-        self.enemies = []
-        self.enemy_templates = {}
+        self.enemies = [] # EnemyRecords in this battle
+        self.enemy_templates = {} # name -> EnemyRecord
         self.log_message = ""
         self.turn_order = []
         self.current_turn_index = 0
@@ -59,7 +60,7 @@ class BattleSystem(Concept):
         if os.path.exists(enemy_file):
             with open(enemy_file, 'r') as f:
                 data = json.load(f)
-                self.enemy_templates = {e["name"]: e for e in data.get("enemies", [])}
+                self.enemy_templates = {e["name"]: EnemyRecord.from_dict(e) for e in data.get("enemies", [])}
                 print(f"Loaded {len(self.enemy_templates)} enemy types")
 
     def update_player_stats(self, payload: dict):
@@ -87,21 +88,19 @@ class BattleSystem(Concept):
             template = self.enemy_templates.get(name)
             if template:
                 # Clone and init HP
-                enemy = template.copy()
-                enemy["hp"] = enemy["max_hp"]
-                self.enemies.append(enemy)
+                self.enemies.append(template.spawn())
             else:
                 # Fallback
-                self.enemies.append({
-                    "name": name, "hp": 10, "max_hp": 10, 
-                    "atk": 5, "def": 0, "spd": 2, "xp_reward": 5,
-                    "sprite_u": 0, "sprite_v": 32 
-                })
+                self.enemies.append(EnemyRecord(
+                    name=name, hp=10, max_hp=10,
+                    atk=5, defense=0, spd=2, xp_reward=5,
+                    sprite_u=0, sprite_v=32
+                ))
         
         # Determine Turn Order (Speed based)
         self.turn_order = ["Player"] + [f"Enemy:{i}" for i in range(len(self.enemies))]
         self.current_turn_index = 0
-        self.log_message = f"Enemies: {', '.join([e['name'] for e in self.enemies])}"
+        self.log_message = f"Enemies: {', '.join([e.name for e in self.enemies])}"
 
     def notify_levelup(self, payload: dict):
         """Action: notify_levelup"""
@@ -229,26 +228,25 @@ class BattleSystem(Concept):
                     if self.enemies: targets = [self.enemies[0]]
 
                 for target in targets:
-                    defence = target.get("def", 0)
-                    dmg = max(1, atk - defence // 2)
-                    target["hp"] -= int(dmg)
+                    dmg = max(1, atk - target.defense // 2)
+                    target.hp -= int(dmg)
                     # For log just show last hit or summary
-                    self.log_message = f"Hit {target['name']} for {int(dmg)} dmg!"
+                    self.log_message = f"Hit {target.name} for {int(dmg)} dmg!"
 
             elif action == "Skill":
                 # Fireball AOE logic (already handles all, but let's unify)
                 atk = self.player_stats.get("atk", 10)
                 damage = max(1, atk * 1.5)
                 for e in self.enemies:
-                    e["hp"] -= int(damage)
+                    e.hp -= int(damage)
                 self.log_message = f"Fireball! {int(damage)} dmg to all!"
         
         # Check deaths
-        active_enemies = [e for e in self.enemies if e["hp"] > 0]
+        active_enemies = [e for e in self.enemies if e.hp > 0]
         
         if not active_enemies:
             # Win!
-            total_xp = sum([e.get("xp_reward", 0) for e in self.enemies]) 
+            total_xp = sum([e.xp_reward for e in self.enemies]) 
             
             # Keep enemies for rendering until ACK
             self.log_message = f"VICTORY! Gained {total_xp} XP"
@@ -289,23 +287,20 @@ class BattleSystem(Concept):
                 y = 60
                 
                 # Draw Sprite
-                u = enemy.get("sprite_u", 0)
-                v = enemy.get("sprite_v", 32)
-                bank = enemy.get("sprite_bank", 0)
-                pyxel.blt(x, y, bank, u, v, 16, 16, 0)
+                pyxel.blt(x, y, enemy.sprite_bank, enemy.sprite_u, enemy.sprite_v, 16, 16, 0)
                 
                 # Draw Target Cursor
                 if self.battle_state == "TARGET_SELECT" and self.target_cursor == i:
                     if pyxel.frame_count % 30 < 15:
                         pyxel.text(x + 5, y - 8, "v", 7) # Flashing cursor
                 
-                pyxel.text(x, y+18, enemy['name'], 7)
+                pyxel.text(x, y+18, enemy.name, 7)
                 # HP Bar
                 bar_w = 24
-                hp_pct = max(0, enemy["hp"]) / enemy["max_hp"]
+                hp_pct = max(0, enemy.hp) / enemy.max_hp
                 pyxel.rect(x, y+26, bar_w, 3, 1) # Red
                 pyxel.rect(x, y+26, int(bar_w * hp_pct), 3, 11) # Green
-                pyxel.text(x, y+30, f"HP:{max(0, int(enemy['hp']))}", 7)
+                pyxel.text(x, y+30, f"HP:{max(0, int(enemy.hp))}", 7)
             
             # Player status
             pyxel.text(10, 100, f"Hero HP: {self.player_stats['hp']}/{self.player_stats['max_hp']}", 7)
@@ -1,28 +1,52 @@
 from cs_framework.core.concept import Concept
+from engine.events import TrustedEmitMixin
+from engine.render import RenderPipeline
 from pydantic import BaseModel
 from typing import Any, Dict
+import time
 
 
 class UpdateEvent(BaseModel):
     # TODO: Define fields for Update
     pass
 
-class DrawEvent(BaseModel):
-    # TODO: Define fields for Draw
-    pass
-
-class GameLoop(Concept):
+class GameLoop(TrustedEmitMixin, Concept):
     """
     Concept: GameLoop
-    Emits Events: Update, Draw
+    Emits Events: Update
+    Drawing goes through render_pipeline, not events.
     """
     __events__ = {
-        "Update": UpdateEvent,
-        "Draw": DrawEvent
+        "Update": UpdateEvent
     }
+    # Per-frame events eligible for the trusted emit fast path
+    __trusted_events__ = frozenset(["Update"])
 
     def __init__(self, name: str = "GameLoop"):
         super().__init__(name)
+        # Event pump
+        # "quiescent": drain the queue until empty or the time budget runs out
+        # "fixed": legacy behaviour, a fixed number of process_events() passes
+        self.pump_mode = "quiescent"
+        self.pump_passes = 5 # Replaced by the rule analysis pass in get_runner()
+        self.pump_budget_us = 4000
+        self.pump_max_passes = 64 # Guard against event ping-pong between rules
+        self.pump_stats = {
+            "frames": 0,
+            "passes": 0,
+            "max_passes": 0,
+            "cutoffs": 0, # Frames that ended with events still queued
+            "deferred_events": 0 # Events carried over into the next frame by cutoffs
+        }
+        self.frame_passes = 0 # process_events() passes in the current frame
+        self.frame_queue_depth = 0 # Largest pending-event count seen by the pump this frame
+        # Layers registered here are drawn directly each frame (see get_runner);
+        # this is the only draw path
+        self.render_pipeline = RenderPipeline()
+        # Rule profiler (set by get_runner when CSFW_PROFILE is on); F9 dumps it
+        self.profiler = None
+        # Frame-time telemetry / HUD (engine.telemetry.FrameTelemetry.install)
+        self.telemetry = None
 
     def init(self, payload: dict):
         """
@@ -65,30 +89,82 @@ class GameLoop(Concept):
 
     def _update_wrapper(self):
         # This method is called by Pyxel every frame
-        # Process pending events to reduce latency (input -> move -> collision)
-        # We loop a fixed number of times to handle causal chains within the frame
-        # independently of the queue size access which caused a crash.
-        # process_events() is safe to call even if empty.
-        limit = 5
-        if hasattr(self, "runner") and self.runner:
-            for _ in range(limit):
-                self.runner.process_events()
-        
-        # Then emit update
-        self.emit("Update", {})
+        start = time.perf_counter_ns()
+        self.frame_passes = 0
+        self.frame_queue_depth = 0
+        self.pump_stats["frames"] += 1
+
+        if self.profiler is not None:
+            import pyxel
+            if pyxel.btnp(pyxel.KEY_F9):
+                self.profiler.dump()
+        if self.telemetry is not None:
+            self.telemetry.poll_input()
+
+        if self.pump_mode == "fixed":
+            # Legacy: process pending chains, then emit update for the next pass
+            self._pump_events()
+            self.emit("Update", {})
+        else:
+            # Emit first so input -> move -> collision resolves within this frame
+            self.emit("Update", {})
+            self._pump_events()
+
+        if self.telemetry is not None:
+            self.telemetry.record_update(time.perf_counter_ns() - start)
         
     def _draw_wrapper(self):
+        start = time.perf_counter_ns()
         # Clear screen
         import pyxel
         pyxel.cls(0)
         
-        # Emit Draw
-        self.emit("Draw", {})
-        
-        # Process any immediate draw events
-        if hasattr(self, "runner") and self.runner:
-             # Just one pass related to draw
-             self.runner.process_events()
+        # Settle pending state changes, then draw layers directly
+        self._pump_events()
+        self.render_pipeline.draw()
+
+        self.pump_stats["max_passes"] = max(self.pump_stats["max_passes"], self.frame_passes)
+        if self.telemetry is not None:
+            self.telemetry.record_frame(time.perf_counter_ns() - start, self.frame_queue_depth, self.frame_passes)
+
+    def _pending_event_count(self):
+        runner = self.runner
+        return len(runner._event_queue) + sum(len(c._pending_events) for c in runner.concepts.values())
+
+    def _pump_events(self):
+        """
+        Run runner.process_events() according to pump_mode.
+        In quiescent mode passes continue while events are pending, bounded by
+        pump_budget_us and pump_max_passes; leftovers are counted as a cutoff.
+        """
+        runner = getattr(self, "runner", None)
+        if not runner:
+            return
+
+        pending = self._pending_event_count()
+        if pending > self.frame_queue_depth:
+            self.frame_queue_depth = pending
+
+        if self.pump_mode == "fixed":
+            for _ in range(self.pump_passes):
+                runner.process_events()
+            self.frame_passes += self.pump_passes
+            self.pump_stats["passes"] += self.pump_passes
+            return
+
+        deadline = time.perf_counter_ns() + self.pump_budget_us * 1000
+        passes = 0
+        while pending:
+            if passes and (passes >= self.pump_max_passes or time.perf_counter_ns() >= deadline):
+                self.pump_stats["cutoffs"] += 1
+                self.pump_stats["deferred_events"] += pending
+                break
+            runner.process_events()
+            passes += 1
+            pending = self._pending_event_count()
+
+        self.frame_passes += passes
+        self.pump_stats["passes"] += passes
 
     def update(self, payload: dict):
         # This might be redundant if we use _update_wrapper to emit.
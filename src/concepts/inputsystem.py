@@ -1,4 +1,5 @@
 from cs_framework.core.concept import Concept
+from engine.events import TrustedEmitMixin
 from pydantic import BaseModel
 from typing import Any, Dict
 
@@ -21,7 +22,7 @@ class BattleCommandEvent(BaseModel):
 class MenuInputEvent(BaseModel):
     key: str
 
-class InputSystem(Concept):
+class InputSystem(TrustedEmitMixin, Concept):
     """
     Concept: InputSystem
     Emits Events: Move, Action, Cancel, BattleCommand, MenuInput
@@ -33,6 +34,8 @@ class InputSystem(Concept):
         "BattleCommand": BattleCommandEvent,
         "MenuInput": MenuInputEvent
     }
+    # Per-frame events eligible for the trusted emit fast path
+    __trusted_events__ = frozenset(["Move"])
 
     def __init__(self, name: str = "InputSystem"):
         super().__init__(name)
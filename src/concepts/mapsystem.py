@@ -1,4 +1,10 @@
 from cs_framework.core.concept import Concept
+from engine.events import TrustedEmitMixin
+from world.collision import CollisionGrid
+from world.encounters import EncounterTable
+from world.tilemap import BakedMap, LAYER2_TILES, find_blank_cell
+from world.mapcache import MapCache
+from engine import trace
 from pydantic import BaseModel
 from typing import Any, Dict
 
@@ -16,7 +22,7 @@ class MoveValidEvent(BaseModel):
 class BattleStartedEvent(BaseModel):
     enemies: Any # List of enemy IDs
 
-class MapSystem(Concept):
+class MapSystem(TrustedEmitMixin, Concept):
     """
     Concept: MapSystem
     Emits Events: MoveValid, MapLoaded, BattleStarted
@@ -26,26 +32,201 @@ class MapSystem(Concept):
         "MapLoaded": MapLoadedEvent,
         "BattleStarted": BattleStartedEvent 
     }
+    # Per-frame events eligible for the trusted emit fast path
+    __trusted_events__ = frozenset(["MoveValid"])
 
     def __init__(self, name: str = "MapSystem"):
         super().__init__(name)
-        self.map_data = {}
+        import os
+        # Maps are read on first entry and kept in a bounded LRU cache
+        # (tune with map_data.max_maps / map_data.max_bytes)
+        maps_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "assets", "data", "maps")
+        self.map_data = MapCache(maps_dir, max_maps=4, max_bytes=2 << 20,
+                                 on_load=self._on_map_loaded, on_evict=self._on_map_evicted,
+                                 derive=self._derive_map)
+        self.baked_lines = {} # map_id -> prepared tilemap data from the map loader
         self.current_map_id = 0
         self.dynamic_obstacles = []
         self.npc_system = None  # Reference to NpcSystem for live collision
+        self.camera_system = None  # Reference to CameraSystem for viewport culling
         self.last_check_pos = (-1, -1)
+        self.collision = {} # map_id -> CollisionGrid, compiled at load
+        self.encounters = {} # map_id -> EncounterTable, compiled at load
+        self.portal_index = {} # map_id -> {(tx, ty): portal}, built at load
+        self.last_portal_tile = None # (map_id, tx, ty) of the last portal check
+        self.baked = {} # map_id -> BakedMap (Pyxel tilemaps), baked on first draw
+        self.blank_cell = None # Transparent 8x8 sheet cell used by baked object layers (None: sheet has none)
+        self.blank_probed = False # Sheet searched for blank_cell yet (needs Pyxel and the sprite sheet)
+        self.use_tilemaps = True
 
     def set_npc_system(self, npc_sys):
         """Set reference to NpcSystem for live NPC collision detection"""
         self.npc_system = npc_sys 
 
+    def _derive_map(self, map_data):
+        # Runs wherever the map is read (prefetch worker or main thread)
+        chunked = map_data.get("chunks")
+        if chunked is not None:
+            # Chunk stores compile collision and encounters per resident chunk
+            return {"collision": chunked, "encounters": chunked}
+        derived = {"collision": CollisionGrid.from_map(map_data), "encounters": EncounterTable.from_map(map_data)}
+        # Tilemap lines depend on the blank cell, so they wait until the sheet was probed
+        if self.use_tilemaps and self.blank_probed:
+            derived["tilemap_lines"] = BakedMap.prepare(map_data, self.blank_cell)
+        return derived
+
+    def _on_map_loaded(self, map_id, map_data, derived):
+        # Derived per-map structures arrive with the map when it is faulted in
+        self.collision[map_id] = derived.get("collision") or CollisionGrid.from_map(map_data)
+        self.encounters[map_id] = derived.get("encounters") or EncounterTable.from_map(map_data)
+        if "tilemap_lines" in derived:
+            self.baked_lines[map_id] = derived["tilemap_lines"]
+        if map_data.get("chunks") is not None:
+            map_data["chunks"].prefetcher = self.map_data.prefetcher
+        self.portal_index.pop(map_id, None)
+        self.get_portal_index(map_id)
+        trace.info("  Loaded: %s (id=%s)", map_data.get("name") or self.map_data.name(map_id), map_id)
+
+    def _on_map_evicted(self, map_id):
+        self.collision.pop(map_id, None)
+        self.encounters.pop(map_id, None)
+        self.portal_index.pop(map_id, None)
+        self.baked.pop(map_id, None)
+        self.baked_lines.pop(map_id, None)
+        trace.info("  Evicted map %s from cache", map_id)
+
+    def set_prefetcher(self, prefetcher):
+        """Share a background Prefetcher for maps reachable through portals"""
+        self.map_data.prefetcher = prefetcher
+
+    def prefetch_neighbours(self, map_id=None):
+        """Queue background loads of every map (and its NPCs) one portal away."""
+        if self.map_data.prefetcher is None:
+            return
+        index = self.get_portal_index(map_id)
+        if not index:
+            return
+        targets = sorted({portal["target_map"] for portal in index.values()})
+        self.map_data.prefetch(targets)
+        if self.npc_system is not None and hasattr(self.npc_system, "prefetch"):
+            self.npc_system.prefetch(targets)
+
+    def set_camera_system(self, cam_sys):
+        """Set reference to CameraSystem so draw() only covers the visible tiles"""
+        self.camera_system = cam_sys
+
+    def visible_tile_range(self, map_w, map_h, margin=1):
+        """
+        (x0, y0, x1, y1) tile range (end-exclusive) covered by the camera plus
+        a margin, clamped to the map. Whole map without a camera reference.
+        """
+        cam = self.camera_system
+        if cam is None:
+            return 0, 0, map_w, map_h
+        x0 = int(cam.cam_x // 16) - margin
+        y0 = int(cam.cam_y // 16) - margin
+        x1 = int((cam.cam_x + cam.screen_w) // 16) + 1 + margin
+        y1 = int((cam.cam_y + cam.screen_h) // 16) + 1 + margin
+        return max(0, x0), max(0, y0), min(map_w, x1), min(map_h, y1)
+
+    def get_collision_grid(self, map_id=None):
+        """CollisionGrid of a map (default: current map), compiled on first use."""
+        if map_id is None:
+            map_id = self.current_map_id
+        grid = self.collision.get(map_id)
+        if grid is None and map_id in self.map_data:
+            map_data = self.map_data[map_id] # Faulting the map in compiles it
+            grid = self.collision.get(map_id)
+            if grid is None:
+                grid = self.collision[map_id] = map_data.get("chunks") or CollisionGrid.from_map(map_data)
+        return grid
+
+    def get_encounter_table(self, map_id=None):
+        """EncounterTable of a map (default: current map), compiled on first use."""
+        if map_id is None:
+            map_id = self.current_map_id
+        table = self.encounters.get(map_id)
+        if table is None and map_id in self.map_data:
+            map_data = self.map_data[map_id]
+            table = self.encounters.get(map_id)
+            if table is None:
+                table = self.encounters[map_id] = map_data.get("chunks") or EncounterTable.from_map(map_data)
+        return table
+
+    def get_baked_map(self, map_id=None):
+        """
+        BakedMap of a map (default: current map), baked on first use once
+        Pyxel and the sprite sheet are up. None if tilemaps are unavailable
+        or the map is chunked (its chunks are baked one by one).
+        """
+        import pyxel
+        if not self.use_tilemaps or not hasattr(pyxel, "Tilemap"):
+            return None
+        if map_id is None:
+            map_id = self.current_map_id
+        baked = self.baked.get(map_id)
+        if baked is None and map_id in self.map_data:
+            map_data = self.map_data[map_id]
+            if map_data.get("chunks") is not None:
+                return None
+            baked = self.baked[map_id] = BakedMap(pyxel, map_data, self._sheet_blank_cell(pyxel),
+                                                  lines=self.baked_lines.pop(map_id, None))
+        return baked
+
+    def _sheet_blank_cell(self, pyxel):
+        """Transparent sheet cell for baked object layers (None if the sheet has none)."""
+        if not self.blank_probed:
+            sheet = pyxel.images[0] if hasattr(pyxel, "images") else pyxel.image(0)
+            self.blank_cell = find_blank_cell(sheet)
+            self.blank_probed = True # Set after blank_cell: the prefetch worker reads both
+        return self.blank_cell
+
+    def set_tile(self, layer: str, tx: int, ty: int, tile: int, map_id=None):
+        """
+        Change one tile of a map layer ("ground" or "objects") and update the
+        collision grid, encounter table and baked tilemap for it.
+        """
+        if map_id is None:
+            map_id = self.current_map_id
+        map_data = self.map_data.get(map_id)
+        if not map_data:
+            return
+        # Mutated maps stay resident, otherwise eviction would revert them
+        self.map_data.pin(map_id)
+        # Tilemap lines prepared at load predate this edit; the bake redoes them
+        self.baked_lines.pop(map_id, None)
+        if map_data.get("chunks") is not None:
+            map_data["chunks"].set_tile(layer, tx, ty, tile)
+            return
+        map_data["layers"][layer][ty][tx] = tile
+        grid = self.collision.get(map_id)
+        if grid is not None:
+            grid.refresh_tile(map_data, tx, ty)
+        table = self.encounters.get(map_id)
+        if table is not None and layer == "ground":
+            table.refresh_tile(map_data, tx, ty)
+        baked = self.baked.get(map_id)
+        if baked is not None:
+            baked.set_tile(layer, tx, ty, tile)
+
+    def get_portal_index(self, map_id=None):
+        """{(tx, ty): portal} for a map (default: current map), built on first use."""
+        if map_id is None:
+            map_id = self.current_map_id
+        index = self.portal_index.get(map_id)
+        if index is None and map_id in self.map_data:
+            index = self.portal_index[map_id] = {
+                (portal["x"], portal["y"]): portal for portal in self.map_data[map_id].get("portals", [])
+            }
+        return index
+
     def load(self, payload: dict):
         """
         Action: load
-        Loads maps from split JSON structure (assets/data/maps/).
+        Reads the map index (assets/data/maps/index.json) or switches maps.
+        Map files are loaded lazily through the map cache.
         """
         import os
-        import json
         
         target_id = payload.get("map_id")
         
@@ -69,37 +250,26 @@ class MapSystem(Concept):
              map_name = get_map_name(self.current_map_id)
              self.emit("MapLoaded", {"map_id": self.current_map_id, "width": w, "height": h, "map_name": map_name})
              print(f"Switched to Map {self.current_map_id} ({map_name})")
+             self.prefetch_neighbours()
              return
 
         print(f"MapSystem.load called with {payload}")
-        base_dir = os.path.dirname(os.path.dirname(__file__))
-        
-        # Load from split JSON structure
-        maps_dir = os.path.join(base_dir, "assets", "data", "maps")
-        index_path = os.path.join(maps_dir, "index.json")
         
+        # Only the index is read here; maps are faulted in on first entry
+        index_path = os.path.join(self.map_data.maps_dir, "index.json")
         if not os.path.exists(index_path):
             print(f"ERROR: Map index not found: {index_path}")
             return
         
-        print("Loading maps from split JSON structure...")
-        with open(index_path, 'r', encoding='utf-8') as f:
-            index = json.load(f)
-        
-        self.map_data = {}
-        for entry in index.get("maps", []):
-            map_file_path = os.path.join(maps_dir, entry["file"])
-            if os.path.exists(map_file_path):
-                with open(map_file_path, 'r', encoding='utf-8') as f:
-                    map_data = json.load(f)
-                    self.map_data[entry["id"]] = map_data
-                    print(f"  Loaded: {entry['name']} (id={entry['id']})")
+        entries = self.map_data.load_index()
+        print(f"Map index: {len(entries)} maps (cache: {self.map_data.max_maps} maps / {self.map_data.max_bytes // 1024} KB)")
         
         # Initial load emit
         w, h = get_map_dims(self.current_map_id)
         map_name = get_map_name(self.current_map_id)
         print(f"Map {self.current_map_id} loaded. Name: {map_name} Size: {w}x{h}")
         self.emit("MapLoaded", {"map_id": self.current_map_id, "width": w, "height": h, "map_name": map_name})
+        self.prefetch_neighbours()
 
     def validate_move(self, payload: dict):
         """
@@ -116,30 +286,26 @@ class MapSystem(Concept):
         current_map = self.map_data.get(self.current_map_id)
         if not current_map: return
 
-        portals = current_map.get("portals", [])
-        for portal in portals:
-            print(f"DEBUG: Check Portal Player({px},{py}) vs Portal({portal['x']},{portal['y']})")
-            if portal["x"] == px and portal["y"] == py:
-                print(f"Portal Triggered! To Map {portal['target_map']} at {px},{py}")
+        # Portals are only checked when the tile under the player's center changes
+        tile = (self.current_map_id, px, py)
+        if tile != self.last_portal_tile:
+            self.last_portal_tile = tile
+            portal = self.get_portal_index().get((px, py))
+            trace.debug("Portal check at (%d,%d) on map %s: %s", px, py, self.current_map_id, portal)
+            if portal is not None:
+                trace.info("Portal Triggered! To Map %s at %d,%d", portal["target_map"], px, py)
                 # Switch Map
                 self.load({"map_id": portal["target_map"]})
                 
                 # Teleport Player
                 tx = portal["target_x"] * 16
                 ty = portal["target_y"] * 16
+                # Arrival tile counts as checked, so a portal there does not bounce back
+                self.last_portal_tile = (self.current_map_id, portal["target_x"], portal["target_y"])
                 self.emit("MoveValid", {"x": tx, "y": ty})
                 return
 
         # ... (Rest of collision logic) ...
-        # Reduced hitbox for forgiveness.
-        margin = 4
-        points = [
-            (x + margin, y + margin),
-            (x + 16 - margin, y + margin),
-            (x + margin, y + 16 - margin),
-            (x + 16 - margin, y + 16 - margin)
-        ]
-        
         is_valid = True
         
         # Check NPC collision (live positions from NpcSystem)
@@ -148,48 +314,16 @@ class MapSystem(Concept):
         ph_w = 8
         ph_h = 8
         
-        # Use live NPC positions instead of cached obstacles
-        if self.npc_system:
-            for npc in self.npc_system.active_npcs:
-                ox = npc.get("x", 0)
-                oy = npc.get("y", 0)
-                ow = 16
-                oh = 16
-                
-                if (ph_x < ox + ow and
-                    ph_x + ph_w > ox and
-                    ph_y < oy + oh and
-                    ph_y + ph_h > oy):
-                    is_valid = False
-                    break
+        # Use live NPC positions (spatial hash kept current by NpcSystem)
+        if self.npc_system and self.npc_system.npcs_in_rect(ph_x, ph_y, ph_w, ph_h):
+            is_valid = False
         
         if not is_valid: return
 
-        # Layer-based maps only
-        layers = current_map.get("layers", {})
-        object_tiles = layers.get("objects", [])
-        
-        map_w = current_map.get("width", 16)
-        map_h = current_map.get("height", 16)
-        
-        for px, py in points:
-            tx = int(px // 16)
-            ty = int(py // 16)
-            
-            if tx < 0 or tx >= map_w or ty < 0 or ty >= map_h:
-                is_valid = False
-                break
-            
-            # Check collision in object layer (or tiles for legacy)
-            if ty < len(object_tiles) and tx < len(object_tiles[ty]):
-                tile_id = object_tiles[ty][tx]
-            else:
-                tile_id = 0
-            
-            # Walkable check: Block on wall(1), water(2), mountain(6)
-            if tile_id in [1, 2, 6]: 
-                is_valid = False
-                break
+        # Tile collision: four corners of the reduced hitbox (margin 4, for
+        # forgiveness) against the compiled grid; off-map counts as blocked
+        if self.get_collision_grid().box_blocked(x, y, margin=4):
+            is_valid = False
         
         if is_valid:
             self.emit("MoveValid", {"x": x, "y": y})
@@ -218,66 +352,18 @@ class MapSystem(Concept):
         # Player Tile Logic
         tx = int((x + 8) // 16)
         ty = int((y + 8) // 16)
-        map_w = current_map.get("width", 16)
-        map_h = current_map.get("height", 16)
-        
-        # Use ground layer for encounter tile check (after layer refactoring)
-        layers = current_map.get("layers", {})
-        ground_tiles = layers.get("ground", [])
-        
-        tile_id = 0
-        if 0 <= tx < map_w and 0 <= ty < map_h:
-            if ty < len(ground_tiles) and tx < len(ground_tiles[ty]):
-                tile_id = ground_tiles[ty][tx]
-            
+
         # Prevent multi-check on same tile (debounce)
         if self.last_check_pos == (tx, ty):
             return
         self.last_check_pos = (tx, ty)
-            
-        # Evaluate Rules
-        # We check specific rules first, then global. Or just check all valid ones?
-        # Let's say we find the FIRST matching rule that triggers.
-        
-        for rule in rules:
-            rule_type = rule.get("type", "global")
-            rate = rule.get("rate", 0.0)
-            
-            is_match = False
-            
-            if rule_type == "global":
-                is_match = True
-            elif rule_type == "tile":
-                target_tiles = rule.get("tile_ids", [])
-                if tile_id in target_tiles:
-                    is_match = True
-            elif rule_type == "rect":
-                rx = rule.get("x", 0)
-                ry = rule.get("y", 0)
-                rw = rule.get("w", 0)
-                rh = rule.get("h", 0)
-                # Check rect in tile coordinates or pixel coordinates? 
-                # Let's assume tile coordinates for ease of editing usually, but pixels are more precise.
-                # Given json ease, tile coords are better.
-                if rx <= tx < rx + rw and ry <= ty < ry + rh:
-                    is_match = True
-                    
-            if is_match:
-                if random.random() < rate:
-                    enemies = rule.get("enemies", ["Slime"])
-                    # Pick random enemy from list? Or all? Usually random one or group.
-                    # Current battle system takes list of enemies. 
-                    # If list has multiple, do we spawn all? Or pick one?
-                    # Let's assume the list defines the "Troop" or allow picking 1-3.
-                    # For now, pass all defined in the list as the encounter group.
-                    self.emit("BattleStarted", {"enemies": enemies})
-                    return # Encounter triggered, stop checking
-                
-                # If matched but didn't trigger rate, should we continue to other rules?
-                # Usually no. If you are in a "Forest" rule, you shouldn't fall back to "Global" 
-                # unless explicitly designed. 
-                # Let's assume priority: first matching rule consumes the check.
-                return
+
+        # The first matching rule consumes the check: if you are in a "Forest"
+        # rule you don't fall back to "Global". The table resolves it per tile.
+        rule = self.get_encounter_table().rule_at(tx, ty)
+        if rule is not None and random.random() < rule.get("rate", 0.0):
+            # The battle system takes the list as the encounter group
+            self.emit("BattleStarted", {"enemies": rule.get("enemies", ["Slime"])})
 
     def register_obstacle(self, payload: dict):
         """
@@ -286,6 +372,44 @@ class MapSystem(Concept):
         print(f"Registered obstacle: {payload}")
         self.dynamic_obstacles.append(payload)
 
+    def _draw_tiles(self, pyxel, rows, x0, y0, x1, y1, include=None, colkey=None):
+        """Per-tile blt fallback when a layer is not baked into a tilemap."""
+        for y in range(y0, min(y1, len(rows))):
+            row = rows[y]
+            for x in range(x0, min(x1, len(row))):
+                tile = row[x]
+                if include is not None and tile not in include:
+                    continue
+                u = (tile % 16) * 16
+                v = (tile // 16) * 16
+                if colkey is None:
+                    pyxel.blt(x * 16, y * 16, 0, u, v, 16, 16)
+                else:
+                    pyxel.blt(x * 16, y * 16, 0, u, v, 16, 16, colkey)
+
+    def _draw_chunks(self, pyxel, chunked, layer, x0, y0, x1, y1):
+        """One layer of a chunked map: a baked tilemap per visible chunk, paged in as needed."""
+        chunks = chunked.chunks_in(x0, y0, x1, y1)
+        if layer == "ground":
+            chunked.prefetch_around(x0, y0, x1, y1)
+        rows = self.map_data[self.current_map_id]["layers"].get(layer, [])
+        include, colkey = (None, None) if layer == "ground" else (LAYER2_TILES, 0)
+        if not self.use_tilemaps or not hasattr(pyxel, "Tilemap"):
+            self._draw_tiles(pyxel, rows, x0, y0, x1, y1, include=include, colkey=colkey)
+            return
+        size = chunked.chunk_size
+        for chunk in chunks:
+            if chunk.baked is None:
+                chunk.baked = BakedMap(pyxel, {"width": size, "height": size, "layers": chunk.rows(size)},
+                                       self._sheet_blank_cell(pyxel))
+            baked = chunk.baked.ground if layer == "ground" else chunk.baked.objects
+            cx0, cy0 = max(x0, chunk.x0), max(y0, chunk.y0)
+            cx1, cy1 = min(x1, chunk.x0 + size), min(y1, chunk.y0 + size)
+            if baked is not None:
+                baked.draw(pyxel, cx0, cy0, cx1, cy1, colkey=colkey, ox=chunk.x0, oy=chunk.y0)
+            else:
+                self._draw_tiles(pyxel, rows, cx0, cy0, cx1, cy1, include=include, colkey=colkey)
+
     def draw(self, payload: dict):
         """
         Action: draw
@@ -306,33 +430,35 @@ class MapSystem(Concept):
         layers = current_map.get("layers", {})
         ground_tiles = layers.get("ground", [])
         object_tiles = layers.get("objects", [])
-        
-        # Layer definitions matching gen_pixel_art.py
-        LAYER2_TILES = {1, 2, 6, 7, 8, 9, 51, 64, 65, 66, 67, 68}  # Buildings, castle, stairs
+
+        # Only the tiles under the camera (plus a one-tile margin) are drawn
+        x0, y0, x1, y1 = self.visible_tile_range(current_map.get("width", 16), current_map.get("height", 16))
+        baked = self.get_baked_map()
+        chunked = current_map.get("chunks")
 
         # === LAYER 1: Draw ground tiles ===
-        for y, row in enumerate(ground_tiles):
-            for x, tile in enumerate(row):
-                u = (tile % 16) * 16
-                v = (tile // 16) * 16
-                if u >= 256: u = 0
-                pyxel.blt(x * 16, y * 16, 0, u, v, 16, 16)
-
-        # === LAYER 2: Draw objects with transparency ===
-        for y, row in enumerate(object_tiles):
-            for x, tile in enumerate(row):
-                if tile != 0 and tile in LAYER2_TILES:
-                    u = (tile % 16) * 16
-                    v = (tile // 16) * 16
-                    if u >= 256: u = 0
-                    # Draw with transparency (color 0 = transparent)
-                    pyxel.blt(x * 16, y * 16, 0, u, v, 16, 16, 0)
+        if chunked is not None:
+            self._draw_chunks(pyxel, chunked, "ground", x0, y0, x1, y1)
+        elif baked is not None:
+            baked.ground.draw(pyxel, x0, y0, x1, y1)
+        else:
+            self._draw_tiles(pyxel, ground_tiles, x0, y0, x1, y1)
+
+        # === LAYER 2: Draw objects with transparency (color 0 = transparent) ===
+        if chunked is not None:
+            self._draw_chunks(pyxel, chunked, "objects", x0, y0, x1, y1)
+        elif baked is not None and baked.objects is not None:
+            baked.objects.draw(pyxel, x0, y0, x1, y1, colkey=0)
+        else:
+            self._draw_tiles(pyxel, object_tiles, x0, y0, x1, y1, include=LAYER2_TILES, colkey=0)
 
         # === LAYER 2 (cont): Draw Portals as visual indicators ===
         portals = current_map.get("portals", [])
         for portal in portals:
             tx = portal.get("x")
             ty = portal.get("y")
+            if not (x0 <= tx < x1 and y0 <= ty < y1):
+                continue
             target_map = portal.get("target_map")
             
             x = tx * 16
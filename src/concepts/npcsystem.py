@@ -1,6 +1,10 @@
 from cs_framework.core.concept import Concept
 from pydantic import BaseModel
 from typing import Any, Dict
+from world.npcrepo import NpcRepository
+from world.npcstore import NpcStore
+from world.records import ItemRecord
+from world.spatial import SpatialHash
 
 
 class DialogStartedEvent(BaseModel):
@@ -35,16 +39,27 @@ class NpcSystem(Concept):
 
     def __init__(self, name: str = "NpcSystem"):
         super().__init__(name)
+        import os
         self.npcs = [] # All NPCs data
-        self.active_npcs = [] # NPCs on current map
+        # NPC definitions (read once per map) and per-map runtime state
+        self.repository = NpcRepository(os.path.join(os.path.dirname(os.path.dirname(__file__)),
+                                                     "assets", "data", "npcs"))
+        self.active_npcs = [] # NpcRecords on current map
         self.active_dialog = None # Current string to show
         self.current_npc = None # The NPC object being talked to
         self.current_line_index = 0
-        # Movement
-        self.move_timer = 0
+        # Movement: each mobile NPC steps once per move_interval frames, on
+        # its own frame (round-robin slots), so the work is spread evenly
+        self.frame = 0
         self.move_interval = 60  # Move every 60 frames (1 second at 60fps)
+        self.offscreen_every = 4 # Off-screen NPCs step only every Nth interval
+        self.schedule = [[]] # Slot -> store indices of the mobile NPCs stepping then
+        self.camera_system = None  # Reference to CameraSystem for off-screen level of detail
         self.map_system = None  # Reference to MapSystem for collision
         self.player = None  # Reference to Player for collision
+        self.prefetcher = None  # Background loader for neighbouring maps' NPC files
+        self.spatial = SpatialHash() # Broadphase over active_npcs (keys are list indices)
+        self.store = NpcStore() # Array columns over active_npcs for the batched wander update
 
     def set_map_system(self, map_sys):
         """Set reference to MapSystem for collision detection"""
@@ -54,92 +69,106 @@ class NpcSystem(Concept):
         """Set reference to Player for collision detection"""
         self.player = player
 
+    def set_camera_system(self, cam_sys):
+        """Set reference to CameraSystem so off-screen NPCs update less often"""
+        self.camera_system = cam_sys
+
+    def set_prefetcher(self, prefetcher):
+        """Share a background Prefetcher for NPC files of neighbouring maps"""
+        self.prefetcher = prefetcher
+
+    def prefetch(self, map_ids):
+        """Queue background reads of the NPC files of the given maps (unless cached)."""
+        if self.prefetcher is None:
+            return
+        repository = self.repository
+        for map_id in map_ids:
+            if not repository.is_cached(map_id):
+                self.prefetcher.request(("npcs", map_id), lambda mid=map_id: ("ok", repository.read(mid)))
+
     def load(self, payload: dict):
         """
         Action: load
-        Loads NPCs from split JSON structure (assets/data/npcs/).
+        Activates a map's NPCs. Definitions come from assets/data/npcs/ once
+        per map; re-entering a map resumes its NPCs where they were left.
         """
-        import os
-        import json
-        
         current_map_id = payload.get("map_id")
         
         if current_map_id is None:
             current_map_id = 0
         
-        base_dir = os.path.dirname(os.path.dirname(__file__))
-        
-        # Load from split JSON structure
-        npcs_dir = os.path.join(base_dir, "assets", "data", "npcs")
-        npc_file_path = os.path.join(npcs_dir, f"map_{current_map_id}_npcs.json")
-        
-        if os.path.exists(npc_file_path):
-            with open(npc_file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                map_npcs = data.get("npcs", [])
-            print(f"Loaded {len(map_npcs)} NPCs for map {current_map_id}")
-        else:
-            # No NPCs for this map
-            map_npcs = []
-            print(f"No NPC file found for map {current_map_id}")
-        
-        self.active_npcs = [npc.copy() for npc in map_npcs]
-        # Store original positions for mobile NPCs
-        for npc in self.active_npcs:
-            npc["origin_x"] = npc["x"]
-            npc["origin_y"] = npc["y"]
+        repository = self.repository
+        if not repository.is_cached(current_map_id):
+            # Prefetched on the worker thread when the map became a portal neighbour
+            ready = self.prefetcher.take(("npcs", current_map_id)) if self.prefetcher else None
+            if ready is not None:
+                repository.put(current_map_id, ready[1])
+            map_npcs = repository.get_definitions(current_map_id)
+            if map_npcs:
+                print(f"Loaded {len(map_npcs)} NPCs for map {current_map_id}")
+            else:
+                print(f"No NPC file found for map {current_map_id}")
+
+        # Same records as on the last visit: positions and opened chests persist
+        self.active_npcs = repository.enter(current_map_id)
         print(f"Active NPCs for Map {current_map_id}: {len(self.active_npcs)}")
+        self.store = NpcStore.from_npcs(self.active_npcs)
+        self._build_schedule()
+        self.spatial.clear()
+        for i, npc in enumerate(self.active_npcs):
+            self.spatial.insert(i, npc.x, npc.y)
 
         for npc in self.active_npcs:
             self.emit("NpcSpawned", {
-                "id": npc["id"],
-                "x": npc["x"],
-                "y": npc["y"], 
-                "sprite_u": npc["sprite_u"],
-                "sprite_v": npc["sprite_v"],
-                "name": str(npc["id"])
+                "id": npc.id,
+                "x": npc.x,
+                "y": npc.y, 
+                "sprite_u": npc.sprite_u,
+                "sprite_v": npc.sprite_v,
+                "name": str(npc.id)
             })
 
     def check_interaction(self, payload: dict):
         """Action: check_interaction"""
         px = payload.get("x")
         py = payload.get("y")
+
+        # Nearest NPC within 20px, from the NPCs around the player only
+        index = self.spatial.nearest(px, py, 20)
+        if index is None:
+            return
+        npc = self.active_npcs[index]
+        self.current_npc = npc
         
-        for npc in self.active_npcs:
-            nx, ny = npc["x"], npc["y"]
-            dist = ((px - nx)**2 + (py - ny)**2)**0.5
-            if dist < 20:
-                self.current_npc = npc
+        # Chest Logic
+        if npc.is_chest:
+            self.current_line_index = 0
+            if not npc.opened:
+                npc.opened = True
+                # Change Sprite to Opened Chest (Next tile)
+                npc.sprite_u += 16 
+                
+                item = npc.item_reward or ItemRecord(name="Potion", type="item", value=1)
+                item_name = item.name
+                
+                dialog_text = f"Found {item_name}!"
+                npc.dialog = [dialog_text] # Inject dialog based on item
                 
-                # Chest Logic
-                if npc.get("is_chest", False):
-                    self.current_line_index = 0
-                    if not npc.get("opened", False):
-                        npc["opened"] = True
-                        # Change Sprite to Opened Chest (Next tile)
-                        npc["sprite_u"] += 16 
-                        
-                        item_data = npc.get("item_reward", {"name": "Potion", "type": "item", "value": 1})
-                        item_name = item_data.get("name", "Item")
-                        
-                        dialog_text = f"Found {item_name}!"
-                        npc["dialog"] = [dialog_text] # Inject dialog based on item
-                        
-                        self.active_dialog = dialog_text
-                        print(f"Chest opened! Got {item_name}")
-                        self.emit("DialogStarted", {"npc_id": npc["id"]})
-                        self.emit("ItemFound", {"item": item_data})
-                    else:
-                        npc["dialog"] = ["It's empty."]
-                        self.active_dialog = "It's empty."
-                        self.emit("DialogStarted", {"npc_id": npc["id"]})
-                    return
+                self.active_dialog = dialog_text
+                print(f"Chest opened! Got {item_name}")
+                self.emit("DialogStarted", {"npc_id": npc.id})
+                self.emit("ItemFound", {"item": item.to_dict()})
+            else:
+                npc.dialog = ["It's empty."]
+                self.active_dialog = "It's empty."
+                self.emit("DialogStarted", {"npc_id": npc.id})
+            return
 
-                self.current_line_index = 0
-                self.active_dialog = npc["dialog"][0]
-                print(f"Interacted with NPC {npc['id']}: {self.active_dialog}")
-                self.emit("DialogStarted", {"npc_id": npc["id"]})
-                return
+        self.current_line_index = 0
+        self.active_dialog = npc.dialog[0]
+        print(f"Interacted with NPC {npc.id}: {self.active_dialog}")
+        self.emit("DialogStarted", {"npc_id": npc.id})
+        return
 
     def advance_dialog(self, payload: dict):
         """Action: advance_dialog"""
@@ -147,12 +176,12 @@ class NpcSystem(Concept):
             return
 
         self.current_line_index += 1
-        if self.current_line_index >= len(self.current_npc["dialog"]):
-            npc_id = self.current_npc["id"]
+        if self.current_line_index >= len(self.current_npc.dialog):
+            npc_id = self.current_npc.id
             self.clear_dialog({})
             self.emit("DialogEnded", {"npc_id": npc_id})
         else:
-            self.active_dialog = self.current_npc["dialog"][self.current_line_index]
+            self.active_dialog = self.current_npc.dialog[self.current_line_index]
             print(f"Dialog advanced: {self.active_dialog}")
 
     def clear_dialog(self, payload: dict):
@@ -162,115 +191,65 @@ class NpcSystem(Concept):
         self.current_line_index = 0
 
     def update(self, payload: dict):
-        """Action: update - Move mobile NPCs periodically"""
-        import random
-        
-        self.move_timer += 1
-        if self.move_timer < self.move_interval:
+        """Action: update - Move this frame's slot of mobile NPCs"""
+        self.frame += 1
+        slots = len(self.schedule)
+        bucket = self.schedule[self.frame % slots]
+        if not bucket:
             return
-        
-        self.move_timer = 0
-        
-        for npc in self.active_npcs:
-            # Skip non-mobile NPCs
-            if not npc.get("mobile", False):
-                continue
-            
-            # Skip if this NPC is in conversation
-            if self.current_npc and self.current_npc["id"] == npc["id"]:
-                continue
-            
-            # Random movement direction
-            dx = random.choice([-8, 0, 0, 8])  # More likely to stay still
-            dy = random.choice([-8, 0, 0, 8])
-            
-            if dx == 0 and dy == 0:
-                continue
-            
-            new_x = npc["x"] + dx
-            new_y = npc["y"] + dy
-            
-            # Limit movement range from origin (32px radius)
-            origin_x = npc.get("origin_x", npc["x"])
-            origin_y = npc.get("origin_y", npc["y"])
-            max_range = 32
-            
-            if abs(new_x - origin_x) > max_range or abs(new_y - origin_y) > max_range:
-                continue
-            
-            # Basic bounds check (stay on screen)
-            if not (0 <= new_x <= 240 and 0 <= new_y <= 200):
-                continue
-            
-            # Collision check with map tiles
-            if self._is_walkable(new_x, new_y):
-                npc["x"] = new_x
-                npc["y"] = new_y
 
-    def _is_walkable(self, x, y):
-        """Check if position is walkable (not wall/water/mountain/player)"""
-        # Check player collision first
-        if self.player:
-            px = self.player.x
-            py = self.player.y
-            # Simple box collision (both are 16x16)
-            if (x < px + 16 and x + 16 > px and
-                y < py + 16 and y + 16 > py):
-                return False
-        
-        if not self.map_system:
-            return True  # No map reference, allow movement
-        
-        current_map = self.map_system.map_data.get(self.map_system.current_map_id)
-        if not current_map:
-            return True
-        
-        tiles = current_map.get("tiles", [])
-        map_w = current_map.get("width", 16)
-        map_h = current_map.get("height", 16)
-        
-        # Check all 4 corners of the NPC (16x16 sprite)
-        margin = 4
-        points = [
-            (x + margin, y + margin),
-            (x + 16 - margin, y + margin),
-            (x + margin, y + 16 - margin),
-            (x + 16 - margin, y + 16 - margin)
-        ]
-        
-        for px, py in points:
-            tx = int(px // 16)
-            ty = int(py // 16)
-            
-            if tx < 0 or tx >= map_w or ty < 0 or ty >= map_h:
-                return False
-            
-            tile_id = tiles[ty][tx]
-            # Block tiles: 1=Wall, 2=Water, 6=Mountain
-            if tile_id in [1, 2, 6]:
-                return False
-        
-        return True
+        # Level of detail: between coarse ticks only on-screen NPCs step
+        cam = self.camera_system
+        if cam is not None and (self.frame // slots) % self.offscreen_every:
+            margin = 16
+            bucket = self.store.in_rect(bucket, cam.cam_x - margin, cam.cam_y - margin,
+                                        cam.cam_x + cam.screen_w + margin, cam.cam_y + cam.screen_h + margin)
+            if not bucket:
+                return
+
+        # One batched pass over the store's columns; the NPC in conversation
+        # stays put, walls/water/player block steps
+        grid = self.map_system.get_collision_grid() if self.map_system else None
+        skip_id = self.current_npc.id if self.current_npc else None
+        store = self.store
+        xs, ys = store.x, store.y
+        npcs, move = self.active_npcs, self.spatial.move
+        for i in store.wander(grid, self.player, skip_id, indices=bucket):
+            npc = npcs[i]
+            npc.x = x = xs[i]
+            npc.y = y = ys[i]
+            move(i, x, y)
+
+    def _build_schedule(self):
+        """Deal the mobile NPCs round-robin into move_interval frame slots."""
+        slots = max(1, self.move_interval)
+        self.schedule = [[] for _ in range(slots)]
+        for k, i in enumerate(self.store.mobile):
+            self.schedule[k % slots].append(i)
+
+    def npcs_in_rect(self, x, y, w, h):
+        """Active NPCs whose 16x16 boxes overlap the rectangle."""
+        return [self.active_npcs[i] for i in self.spatial.query_rect(x, y, w, h)]
 
     def draw(self, payload: dict):
         """Action: draw"""
         import pyxel
         
         for npc in self.active_npcs:
-             if npc.get("is_chest"):
+             if npc.is_chest:
                  # Chest Logic: Open vs Closed
                  # Using Item Assets (generated at y=48)
                  # Closed: u=0, v=48
                  # Opened: u=16, v=48
-                 u = 16 if npc.get("opened") else 0
+                 u = 16 if npc.opened else 0
                  v = 48
-                 pyxel.blt(npc["x"], npc["y"], 0, u, v, 16, 16, 0)
+                 pyxel.blt(npc.x, npc.y, 0, u, v, 16, 16, 0)
              else:
-                 u = npc.get("sprite_u", 0)
-                 v = npc.get("sprite_v", 32)
+                 u = npc.sprite_u
+                 v = npc.sprite_v
                  # Use color 0 (black) as transparent
                  # Sprites must have black (color 0) backgrounds to be transparent
-                 pyxel.blt(npc["x"], npc["y"], 0, u, v, 16, 16, 0)
+                 pyxel.blt(npc.x, npc.y, 0, u, v, 16, 16, 0)
         
         if self.active_dialog:
              # Draw box at bottom
@@ -1,6 +1,8 @@
 from cs_framework.core.concept import Concept
+from engine.events import TrustedEmitMixin
 from pydantic import BaseModel
 from typing import Any, Dict, List
+from world.records import item_from
 
 
 class MovedEvent(BaseModel):
@@ -49,7 +51,7 @@ class EquipItemEvent(BaseModel):
     slot: str
     item: dict
 
-class Player(Concept):
+class Player(TrustedEmitMixin, Concept):
     """
     Concept: Player
     Emits Events: Moved, InteractionAttempt, CheckCollision, CheckEncounter, LevelUp, StatChanged
@@ -64,6 +66,8 @@ class Player(Concept):
         "StatChanged": StatChangedEvent,
         "EquipItem": EquipItemEvent
     }
+    # Per-frame events eligible for the trusted emit fast path
+    __trusted_events__ = frozenset(["Moved", "CheckCollision", "CheckEncounter"])
 
     def load(self, payload: dict):
         """
@@ -104,7 +108,7 @@ class Player(Concept):
         self.spd = self.base_spd
         
         # Inventory & Equipment
-        self.inventory = [] # List of Item Dicts
+        self.inventory = [] # List of ItemRecords
         self.equipment = {
             "weapon": None,
             "shield": None, # Added
@@ -176,31 +180,31 @@ class Player(Concept):
     def equip_item(self, payload: dict):
         """Action: equip_item"""
         slot = payload.get("slot")
-        item = payload.get("item")
+        item = item_from(payload.get("item"))
         if slot in self.equipment:
             old_item = self.equipment.get(slot)
             self.equipment[slot] = item
             if item:
-                print(f"Equipped {item['name']} to {slot}")
+                print(f"Equipped {item.name} to {slot}")
             else:
                 if old_item:
-                    print(f"Unequipped {old_item['name']} from {slot}")
+                    print(f"Unequipped {old_item.name} from {slot}")
                 else:
                     print(f"Nothing to unequip from {slot}")
             self.recalc_stats()
 
     def add_to_inventory(self, payload: dict):
         """Action: add_to_inventory"""
-        item = payload.get("item")
+        item = item_from(payload.get("item"))
         if item:
             # Deduct gold if item has a price
-            price = item.get("price", 0)
+            price = item.price
             if price > 0:
                 self.gold -= price
                 print(f"Spent {price}G. Remaining gold: {self.gold}")
             
             self.inventory.append(item)
-            print(f"Player inventory: {[i['name'] for i in self.inventory]}")
+            print(f"Player inventory: {[i.name for i in self.inventory]}")
             self.recalc_stats()
 
     def recalc_stats(self):
@@ -211,12 +215,12 @@ class Player(Concept):
         self.spd = self.base_spd
         
         # Add Equipment stats
-        for slot, item in self.equipment.items():
+        for item in self.equipment.values():
             if item:
-                self.max_hp += item.get("hp_bonus", 0)
-                self.atk += item.get("atk_bonus", 0)
-                self.def_stat += item.get("def_bonus", 0)
-                self.spd += item.get("spd_bonus", 0)
+                self.max_hp += item.hp_bonus
+                self.atk += item.atk_bonus
+                self.def_stat += item.def_bonus
+                self.spd += item.spd_bonus
         
         # Clamp HP
         self.hp = min(self.hp, self.max_hp)
@@ -230,8 +234,8 @@ class Player(Concept):
             "xp": self.xp,
             "next_xp": self.next_level_xp,
             "gold": self.gold,
-            "inventory": self.inventory,
-            "equipment": self.equipment
+            "inventory": [item.to_dict() for item in self.inventory],
+            "equipment": {slot: item.to_dict() if item else None for slot, item in self.equipment.items()}
         })
 
     def initiate_move(self, payload: dict):
@@ -1,6 +1,7 @@
 from cs_framework.core.concept import Concept
 from pydantic import BaseModel
 from typing import List, Dict, Any
+from world.records import ItemRecord
 
 class ItemBoughtEvent(BaseModel):
     item: Dict[str, Any]
@@ -23,7 +24,7 @@ class ShopSystem(Concept):
         self.active = False
         self.confirming = False  # Confirmation dialog state
         self.player_gold = 0  # Synced from player
-        self.shop_inventory = [
+        self.shop_inventory = [ItemRecord.from_dict(item) for item in [
             {"name": "Potion", "type": "ITEM", "hp_bonus": 20, "price": 50, "desc": "Restores 20 HP"},
             {"name": "Iron Sword", "type": "weapon", "atk_bonus": 8, "price": 150, "desc": "+8 Attack", "target_type": "SINGLE"},
             {"name": "Steel Blade", "type": "weapon", "atk_bonus": 15, "price": 300, "desc": "+15 Attack", "target_type": "SINGLE"},
@@ -35,7 +36,7 @@ class ShopSystem(Concept):
             {"name": "Steel Plate", "type": "body", "def_bonus": 12, "price": 400, "desc": "+12 Defense"},
             {"name": "Gantlets", "type": "arms", "def_bonus": 2, "price": 70, "desc": "+2 Defense"},
             {"name": "Iron Boots", "type": "legs", "def_bonus": 3, "price": 90, "desc": "+3 Defense"}
-        ]
+        ]]
         self.cursor = 0
 
     def update_player_gold(self, payload: dict):
@@ -62,9 +63,9 @@ class ShopSystem(Concept):
         if self.confirming:
             # Confirmation dialog active
             if key == "CONFIRM":
-                item = self.shop_inventory[self.cursor].copy()
-                print(f"Acquired: {item['name']}")
-                self.emit("ItemBought", {"item": item})
+                item = self.shop_inventory[self.cursor]
+                print(f"Acquired: {item.name}")
+                self.emit("ItemBought", {"item": item.to_dict()})
                 self.confirming = False
             elif key == "CANCEL":
                 self.confirming = False
@@ -105,8 +106,8 @@ class ShopSystem(Concept):
                 pyxel.rect(list_x - 2, list_y + i*14 - 2, 120, 12, 1)
             
             prefix = "> " if i == self.cursor else "  "
-            pyxel.text(list_x, list_y + i*14, f"{prefix}{item['name']}", color)
-            pyxel.text(list_x + 80, list_y + i*14, f"{item['price']}G", 11)
+            pyxel.text(list_x, list_y + i*14, f"{prefix}{item.name}", color)
+            pyxel.text(list_x + 80, list_y + i*14, f"{item.price}G", 11)
 
         # Item Details Pane
         detail_x = x + 130
@@ -115,17 +116,17 @@ class ShopSystem(Concept):
         
         curr_item = self.shop_inventory[self.cursor]
         pyxel.text(detail_x, detail_y, "[DETAILS]", 6)
-        pyxel.text(detail_x, detail_y + 15, curr_item["name"], 10)
-        pyxel.text(detail_x, detail_y + 27, f"Type: {curr_item['type']}", 7)
-        pyxel.text(detail_x, detail_y + 39, f"Price: {curr_item['price']}G", 11)
+        pyxel.text(detail_x, detail_y + 15, curr_item.name, 10)
+        pyxel.text(detail_x, detail_y + 27, f"Type: {curr_item.type}", 7)
+        pyxel.text(detail_x, detail_y + 39, f"Price: {curr_item.price}G", 11)
         
         y_offset = 51
-        if curr_item['type'] == 'weapon':
-            t_type = curr_item.get('target_type', 'SINGLE')
+        if curr_item.type == 'weapon':
+            t_type = curr_item.target_type or 'SINGLE'
             pyxel.text(detail_x, detail_y + y_offset, f"Target: {t_type}", 9)
             y_offset += 12
             
-        pyxel.text(detail_x, detail_y + y_offset + 5, curr_item.get("desc", ""), 13)
+        pyxel.text(detail_x, detail_y + y_offset + 5, curr_item.desc or "", 13)
         
         # Navigation Instructions (always visible)
         pyxel.text(x + 10, y + h - 15, "[Z]: Buy  [X]: Exit  [UP/DOWN]: Select", 6)
@@ -140,7 +141,7 @@ class ShopSystem(Concept):
             pyxel.text(cx + 60, cy + 5, "CONFIRM", 7)
             
             item = self.shop_inventory[self.cursor]
-            pyxel.text(cx + 10, cy + 25, f"{item['name']} costs", 7)
-            pyxel.text(cx + 10, cy + 37, f"{item['price']} Gold.", 11)
+            pyxel.text(cx + 10, cy + 25, f"{item.name} costs", 7)
+            pyxel.text(cx + 10, cy + 37, f"{item.price} Gold.", 11)
             pyxel.text(cx + 10, cy + 52, "Buy this item?", 7)
             pyxel.text(cx + 10, cy + 65, "[Z]: Yes  [X]: No", 6)
@@ -0,0 +1,87 @@
+"""
+Trusted emit: a fast path for high-frequency events.
+
+Concept.emit() builds the event's pydantic model, dumps it back to a dict and
+wraps it in an Event that generates a UUID and timestamp. For per-frame
+events (Update, Move, Moved, ...) the payloads are produced by our own
+code, so once trusted mode is enabled they skip the model round trip and
+are queued as slotted FastEvent records.
+
+- Debug builds (``__debug__``) still validate the first emission of each
+  event type, so schema drift is caught early.
+- ``python -O`` skips validation entirely.
+- ``CSFW_VALIDATE_EVENTS=1`` (or configure(validate=True)) validates every
+  emission, e.g. for test runs.
+"""
+import os
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+TRUSTED_EMIT = os.environ.get("CSFW_TRUSTED_EMIT") == "1"
+VALIDATE_EVENTS = os.environ.get("CSFW_VALIDATE_EVENTS") == "1"
+
+
+def configure(trusted: Optional[bool] = None, validate: Optional[bool] = None):
+    """Enable/disable trusted emit and always-validate mode at runtime."""
+    global TRUSTED_EMIT, VALIDATE_EVENTS
+    if trusted is not None:
+        TRUSTED_EMIT = trusted
+    if validate is not None:
+        VALIDATE_EVENTS = validate
+
+
+class FastEvent:
+    """
+    Slotted stand-in for cs_framework Event. Same attributes; id and
+    timestamp are only generated if something (logger, failure) asks.
+    """
+    __slots__ = ("name", "payload", "source_id", "causal_link", "status", "_id", "_timestamp")
+
+    def __init__(self, name: str, payload: Dict[str, Any], source_id: uuid.UUID, causal_link: Optional[uuid.UUID] = None):
+        self.name = name
+        self.payload = payload
+        self.source_id = source_id
+        self.causal_link = causal_link
+        self.status = "Success"
+        self._id = None
+        self._timestamp = None
+
+    @property
+    def id(self) -> uuid.UUID:
+        if self._id is None:
+            self._id = uuid.uuid4()
+        return self._id
+
+    @property
+    def timestamp(self) -> datetime:
+        if self._timestamp is None:
+            self._timestamp = datetime.now()
+        return self._timestamp
+
+    def __repr__(self):
+        return f"<FastEvent {self.name} from {self.source_id} status={self.status}>"
+
+
+class TrustedEmitMixin:
+    """
+    Mix into a Concept (before Concept in the bases) and list the event
+    names that may take the fast path in __trusted_events__.
+    """
+    __trusted_events__ = frozenset()
+    _validated_events = set() # (class, event name) pairs checked once in debug builds
+
+    def emit(self, event_name: str, payload: Any, causal_link: Optional[uuid.UUID] = None) -> None:
+        if not (TRUSTED_EMIT and event_name in self.__trusted_events__ and isinstance(payload, dict)):
+            return super().emit(event_name, payload, causal_link)
+
+        if VALIDATE_EVENTS or (__debug__ and (type(self), event_name) not in self._validated_events):
+            model_class = self.__events__.get(event_name)
+            if model_class is not None:
+                try:
+                    model_class(**payload)
+                except Exception as e:
+                    raise TypeError(f"Invalid payload for event '{event_name}': {e}")
+            self._validated_events.add((type(self), event_name))
+
+        self._pending_events.append(FastEvent(event_name, payload, self.id, causal_link))
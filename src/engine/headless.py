@@ -0,0 +1,325 @@
+"""
+Headless Pyxel backend.
+
+install() puts a display-free stand-in for the ``pyxel`` module into
+sys.modules. It implements the calls the concepts use (input, drawing
+primitives, camera, frame_count, image banks, tilemaps, init/run/quit). Drawing only
+counts calls, and input comes from press()/release()/tap() or a per-frame
+script, so runs are deterministic.
+
+HeadlessGame builds the full Runner through main.get_runner() and steps
+GameLoop update/draw ticks as fast as the CPU allows:
+
+    game = HeadlessGame(seed=1)
+    game.run(600, inputs={0: [("press", "RIGHT")], 120: [("release", "RIGHT")]})
+"""
+import io
+import os
+import random
+import sys
+import time
+import types
+import contextlib
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Key codes match Pyxel 2.x so recorded inputs stay valid with the real backend
+KEYS = {
+    "KEY_UP": 1073741906,
+    "KEY_DOWN": 1073741905,
+    "KEY_LEFT": 1073741904,
+    "KEY_RIGHT": 1073741903,
+    "KEY_RETURN": 13,
+    "KEY_SPACE": 32,
+    "KEY_ESCAPE": 27,
+    "KEY_TAB": 9,
+    "KEY_BACKSPACE": 8,
+    "GAMEPAD1_BUTTON_A": 1342177798,
+    "GAMEPAD1_BUTTON_B": 1342177799,
+    "GAMEPAD1_BUTTON_X": 1342177800,
+    "GAMEPAD1_BUTTON_Y": 1342177801,
+    "GAMEPAD1_BUTTON_DPAD_UP": 1342177809,
+    "GAMEPAD1_BUTTON_DPAD_DOWN": 1342177810,
+    "GAMEPAD1_BUTTON_DPAD_LEFT": 1342177811,
+    "GAMEPAD1_BUTTON_DPAD_RIGHT": 1342177812,
+}
+KEYS.update({f"KEY_{chr(c).upper()}": c for c in range(ord("a"), ord("z") + 1)})
+KEYS.update({f"KEY_{d}": ord(str(d)) for d in range(10)})
+KEYS.update({f"KEY_F{i}": 1073741881 + i for i in range(1, 13)})
+
+DRAW_CALLS = ("cls", "blt", "bltm", "rect", "rectb", "text", "pset", "line", "circ", "circb")
+
+
+def resolve_key(key: Any) -> int:
+    """Accept a key code, 'KEY_RIGHT' or just 'RIGHT'."""
+    if isinstance(key, int):
+        return key
+    name = str(key).upper()
+    if name in KEYS:
+        return KEYS[name]
+    if f"KEY_{name}" in KEYS:
+        return KEYS[f"KEY_{name}"]
+    raise KeyError(f"Unknown key '{key}'")
+
+
+class HeadlessImage:
+    def __init__(self, width: int = 256, height: int = 256):
+        self.width = width
+        self.height = height
+        self.source = None
+
+    def load(self, x, y, filename, *args, **kwargs):
+        self.source = filename
+
+    def pget(self, x, y):
+        return 0
+
+    def pset(self, x, y, col):
+        pass
+
+    def blt(self, *args, **kwargs):
+        pass
+
+
+class HeadlessTilemap:
+    """
+    Tilemap stand-in that keeps its cells, so baked maps can be inspected.
+    set() data is parsed lazily on the first pget/pset, keeping bakes cheap.
+    """
+
+    def __init__(self, width: int, height: int, img: Any = 0):
+        self.width = width
+        self.height = height
+        self.imgsrc = img
+        self._cells = [(0, 0)] * (width * height)
+        self._pending = []
+
+    @property
+    def cells(self):
+        for x, y, data in self._pending:
+            for dy, line in enumerate(data):
+                row = y + dy
+                if not 0 <= row < self.height:
+                    continue
+                parsed = [(int(c[:2], 16), int(c[2:], 16)) for c in line.split()][:max(0, self.width - x)]
+                start = row * self.width + x
+                self._cells[start:start + len(parsed)] = parsed
+        self._pending = []
+        return self._cells
+
+    def set(self, x, y, data):
+        self._pending.append((x, y, list(data)))
+
+    def pset(self, x, y, tile):
+        if 0 <= x < self.width and 0 <= y < self.height:
+            self.cells[y * self.width + x] = tuple(tile)
+
+    def pget(self, x, y):
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.cells[y * self.width + x]
+        return (0, 0)
+
+
+class HeadlessBackend:
+    """State behind the fake ``pyxel`` module."""
+
+    def __init__(self):
+        self.width = 256
+        self.height = 256
+        self.fps = 60
+        self.frame_count = 0
+        self.held: Dict[int, int] = {} # key -> frame it went down
+        self.camera_offset = (0, 0)
+        self.quit_requested = False
+        self.max_frames: Optional[int] = None
+        self.images = [HeadlessImage() for _ in range(3)]
+        self.frame_calls = dict.fromkeys(DRAW_CALLS, 0)
+        self.total_calls = dict.fromkeys(DRAW_CALLS, 0)
+        self.module = self._build_module()
+
+    def reset(self):
+        """Start a fresh run: frame 0, no keys held, counters cleared."""
+        self.frame_count = 0
+        self.module.frame_count = 0
+        self.held.clear()
+        self.camera_offset = (0, 0)
+        self.quit_requested = False
+        self.frame_calls = dict.fromkeys(DRAW_CALLS, 0)
+        self.total_calls = dict.fromkeys(DRAW_CALLS, 0)
+
+    # ===== Input injection =====
+
+    def press(self, key):
+        code = resolve_key(key)
+        if code not in self.held:
+            self.held[code] = self.frame_count
+
+    def release(self, key):
+        self.held.pop(resolve_key(key), None)
+
+    def release_all(self):
+        self.held.clear()
+
+    def btn(self, key):
+        return key in self.held
+
+    def btnp(self, key, hold=0, repeat=0):
+        down = self.held.get(key)
+        if down is None:
+            return False
+        held_for = self.frame_count - down
+        if held_for == 0:
+            return True
+        return bool(hold and repeat and held_for >= hold and (held_for - hold) % repeat == 0)
+
+    def btnr(self, key):
+        return False
+
+    # ===== Frame control =====
+
+    def end_frame(self):
+        self.frame_count += 1
+        self.module.frame_count = self.frame_count
+        for name, count in self.frame_calls.items():
+            self.total_calls[name] += count
+        self.frame_calls = dict.fromkeys(DRAW_CALLS, 0)
+
+    def init(self, width, height, title=None, fps=60, **kwargs):
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.module.width = width
+        self.module.height = height
+
+    def run(self, update, draw):
+        """Run update/draw until quit() or max_frames (never blocks on vsync)."""
+        while not self.quit_requested:
+            if self.max_frames is not None and self.frame_count >= self.max_frames:
+                break
+            update()
+            draw()
+            self.end_frame()
+
+    def quit(self):
+        self.quit_requested = True
+
+    def camera(self, x=0, y=0):
+        self.camera_offset = (x, y)
+
+    def image(self, n):
+        return self.images[n]
+
+    def _build_module(self):
+        module = types.ModuleType("pyxel")
+        module.__headless__ = self
+        for name, code in KEYS.items():
+            setattr(module, name, code)
+        for name in ("btn", "btnp", "btnr", "init", "run", "quit", "camera", "image"):
+            setattr(module, name, getattr(self, name))
+        for name in DRAW_CALLS:
+            setattr(module, name, self._dynamic_counter(name))
+        module.images = self.images
+        module.Tilemap = HeadlessTilemap
+        module.frame_count = 0
+        module.width = self.width
+        module.height = self.height
+        return module
+
+    def _dynamic_counter(self, name):
+        def call(*args, **kwargs):
+            self.frame_calls[name] += 1
+        return call
+
+
+def install() -> HeadlessBackend:
+    """Install the headless backend as ``pyxel`` and return it."""
+    existing = sys.modules.get("pyxel")
+    backend = getattr(existing, "__headless__", None)
+    if backend is None:
+        backend = HeadlessBackend()
+        sys.modules["pyxel"] = backend.module
+    return backend
+
+
+class _NullWriter(io.TextIOBase):
+    def write(self, s):
+        return len(s)
+
+
+class HeadlessGame:
+    """
+    Full game (Runner + all Concepts + rules) driven without a window.
+    Input scripts map frame numbers to [("press"|"release"|"tap", key), ...].
+    """
+
+    def __init__(self, seed: int = 0, quiet: bool = True, trusted_emit: Optional[bool] = None):
+        self.backend = install()
+        self.backend.reset()
+        self.quiet = quiet
+        self._taps: List[int] = []
+        random.seed(seed)
+
+        src_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        if src_dir not in sys.path:
+            sys.path.append(src_dir)
+
+        from engine.events import configure as configure_events
+        if trusted_emit is not None:
+            configure_events(trusted=trusted_emit)
+
+        with self.output_context():
+            from main import get_runner
+            from concepts.gameloop import GameLoop
+            self.runner = get_runner()
+            self.loop = next(c for c in self.runner.concepts.values() if isinstance(c, GameLoop))
+            self.loop.init({})
+
+    def output_context(self):
+        if self.quiet:
+            return contextlib.redirect_stdout(_NullWriter())
+        return contextlib.nullcontext()
+
+    def concept(self, name: str):
+        """Look up a concept by registered name or class name."""
+        concept = self.runner.get_concept_by_name(name)
+        if concept is None:
+            concept = next((c for c in self.runner.concepts.values() if type(c).__name__ == name), None)
+        return concept
+
+    def apply_input(self, actions: Iterable[Tuple[str, Any]]):
+        for kind, key in actions:
+            if kind == "press":
+                self.backend.press(key)
+            elif kind == "release":
+                self.backend.release(key)
+            elif kind == "tap":
+                self.backend.press(key)
+                self._taps.append(resolve_key(key))
+            else:
+                raise ValueError(f"Unknown input action '{kind}'")
+
+    def step(self, frames: int = 1):
+        """Advance whole frames: GameLoop update + draw, then frame bookkeeping."""
+        with self.output_context():
+            for _ in range(frames):
+                self.loop._update_wrapper()
+                self.loop._draw_wrapper()
+                self.backend.end_frame()
+                for key in self._taps:
+                    self.backend.release(key)
+                self._taps = []
+
+    def run(self, frames: int, inputs: Optional[Dict[int, List[Tuple[str, Any]]]] = None) -> Dict[str, Any]:
+        """Run frames with an optional input script; returns throughput stats."""
+        inputs = inputs or {}
+        start_frame = self.backend.frame_count
+        start = time.perf_counter()
+        for i in range(frames):
+            if i in inputs:
+                self.apply_input(inputs[i])
+            self.step()
+        elapsed = time.perf_counter() - start
+        return {
+            "frames": self.backend.frame_count - start_frame,
+            "seconds": elapsed,
+            "fps": frames / elapsed if elapsed > 0 else float("inf")
+        }
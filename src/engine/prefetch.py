@@ -0,0 +1,105 @@
+"""
+Background prefetching.
+
+A Prefetcher runs loader callables on one daemon worker thread and keeps
+their results until the main thread take()s them. Loaders must only read
+files and build new objects (no shared game state), so their results can
+be handed over as-is.
+
+    prefetcher.request(("map", 1), lambda: read_map(1))
+    ...
+    ready = prefetcher.take(("map", 1))   # None -> load synchronously
+"""
+import queue
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+class _Job:
+    __slots__ = ("loader", "done", "result", "error")
+
+    def __init__(self, loader: Callable[[], Any]):
+        self.loader = loader
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class Prefetcher:
+    def __init__(self, max_ready: int = 16, wait_timeout: float = 1.0):
+        self.max_ready = max_ready
+        self.wait_timeout = wait_timeout # Longest take() waits for an in-flight job
+        self.stats = {"requested": 0, "hits": 0, "waits": 0, "misses": 0, "errors": 0, "dropped": 0}
+        self._jobs: "OrderedDict[Hashable, _Job]" = OrderedDict() # queued, running or finished
+        self._lock = threading.Lock()
+        self._queue: "queue.Queue[Optional[Hashable]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+
+    def request(self, key: Hashable, loader: Callable[[], Any]) -> bool:
+        """Schedule loader() under key unless it is already queued or ready."""
+        with self._lock:
+            if key in self._jobs:
+                return False
+            self._jobs[key] = _Job(loader)
+            self.stats["requested"] += 1
+            # Bound finished-but-untaken results (oldest first)
+            while len(self._jobs) > self.max_ready:
+                oldest = next((k for k, j in self._jobs.items() if j.done.is_set()), None)
+                if oldest is None:
+                    break
+                del self._jobs[oldest]
+                self.stats["dropped"] += 1
+        self._ensure_worker()
+        self._queue.put(key)
+        return True
+
+    def take(self, key: Hashable) -> Any:
+        """
+        The prefetched result for key (removed from the store). Waits for an
+        in-flight job up to wait_timeout; None if never requested, failed or
+        still running.
+        """
+        with self._lock:
+            job = self._jobs.get(key)
+        if job is None:
+            self.stats["misses"] += 1
+            return None
+        if not job.done.is_set():
+            self.stats["waits"] += 1
+            if not job.done.wait(self.wait_timeout):
+                return None
+        with self._lock:
+            self._jobs.pop(key, None)
+        if job.error is not None:
+            self.stats["errors"] += 1
+            return None
+        self.stats["hits"] += 1
+        return job.result
+
+    def pending(self) -> int:
+        with self._lock:
+            return sum(1 for job in self._jobs.values() if not job.done.is_set())
+
+    def clear(self):
+        """Forget queued and finished results (running jobs finish unobserved)."""
+        with self._lock:
+            self._jobs.clear()
+
+    def _ensure_worker(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="prefetch", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            key = self._queue.get()
+            with self._lock:
+                job = self._jobs.get(key)
+            if job is None or job.done.is_set():
+                continue
+            try:
+                job.result = job.loader()
+            except Exception as e:
+                job.error = e
+            job.done.set()
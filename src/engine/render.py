@@ -0,0 +1,125 @@
+"""
+Retained render pipeline.
+
+Concepts register their draw callables once, in explicit layer order.
+GameLoop calls RenderPipeline.draw() every frame, which invokes each
+enabled layer directly: no Draw event, payload mapping or queue traffic.
+Each layer keeps its own timing counters. A layer that raises is counted
+and logged, and the remaining layers still draw (as the runner did when
+draw actions went through rules).
+"""
+import time
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Optional
+
+NO_PAYLOAD = MappingProxyType({})
+
+
+class RenderLayer:
+    __slots__ = ("name", "draw", "order", "enabled", "calls", "last_ns", "total_ns", "max_ns",
+                 "errors", "last_error")
+
+    def __init__(self, name: str, draw: Callable[[Any], None], order: int, enabled: bool = True):
+        self.name = name
+        self.draw = draw
+        self.order = order
+        self.enabled = enabled
+        self.calls = 0
+        self.last_ns = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.errors = 0
+        self.last_error: Optional[str] = None
+
+
+class RenderPipeline:
+    def __init__(self):
+        self.layers: List[RenderLayer] = []
+        self._active: List[RenderLayer] = []
+        self.last_frame_ns = 0
+
+    def add_layer(self, name: str, draw: Callable[[Any], None], order: Optional[int] = None, enabled: bool = True) -> RenderLayer:
+        """
+        Register a draw callable. Layers draw in ascending order; without an
+        explicit order a layer goes on top of everything registered so far.
+        """
+        if self.get_layer(name):
+            raise ValueError(f"Render layer '{name}' already registered")
+        if order is None:
+            order = (self.layers[-1].order + 10) if self.layers else 0
+        layer = RenderLayer(name, draw, order, enabled)
+        self.layers.append(layer)
+        self.layers.sort(key=lambda l: l.order)
+        self._refresh()
+        return layer
+
+    def remove_layer(self, name: str):
+        self.layers = [l for l in self.layers if l.name != name]
+        self._refresh()
+
+    def get_layer(self, name: str) -> Optional[RenderLayer]:
+        for layer in self.layers:
+            if layer.name == name:
+                return layer
+        return None
+
+    def set_enabled(self, name: str, enabled: bool):
+        layer = self.get_layer(name)
+        if layer is None:
+            raise KeyError(f"Unknown render layer '{name}'")
+        layer.enabled = enabled
+        self._refresh()
+
+    def _refresh(self):
+        self._active = [l for l in self.layers if l.enabled]
+
+    def draw(self):
+        """Draw all enabled layers in order, timing each one."""
+        clock = time.perf_counter_ns
+        frame_start = start = clock()
+        for layer in self._active:
+            try:
+                layer.draw(NO_PAYLOAD)
+            except Exception as e:
+                layer.errors += 1
+                error = f"{type(e).__name__}: {e}"
+                if error != layer.last_error: # Log once per distinct error, not every frame
+                    print(f"[RenderPipeline] Layer '{layer.name}' failed: {error}")
+                    layer.last_error = error
+            end = clock()
+            elapsed = end - start
+            layer.last_ns = elapsed
+            layer.total_ns += elapsed
+            layer.calls += 1
+            if elapsed > layer.max_ns:
+                layer.max_ns = elapsed
+            start = end
+        self.last_frame_ns = start - frame_start
+
+    def __len__(self):
+        return len(self.layers)
+
+    # ===== Timing =====
+
+    def timings(self) -> List[Dict[str, Any]]:
+        return [{
+            "layer": l.name,
+            "enabled": l.enabled,
+            "calls": l.calls,
+            "errors": l.errors,
+            "last_us": l.last_ns / 1000,
+            "avg_us": (l.total_ns / l.calls / 1000) if l.calls else 0.0,
+            "max_us": l.max_ns / 1000
+        } for l in self.layers]
+
+    def format_timings(self) -> str:
+        lines = [f"{'Layer':<16} {'On':>3} {'Calls':>7} {'Err':>5} {'Last us':>9} {'Avg us':>9} {'Max us':>9}"]
+        for t in self.timings():
+            lines.append(f"{t['layer']:<16} {'y' if t['enabled'] else 'n':>3} {t['calls']:>7} {t['errors']:>5} "
+                         f"{t['last_us']:>9.1f} {t['avg_us']:>9.1f} {t['max_us']:>9.1f}")
+        return "\n".join(lines)
+
+    def reset_timings(self):
+        for layer in self.layers:
+            layer.calls = layer.last_ns = layer.total_ns = layer.max_ns = layer.errors = 0
+            layer.last_error = None
@@ -0,0 +1,214 @@
+"""
+Scenario engine for headless playthroughs.
+
+A scenario is a YAML/JSON list of steps, or a mapping with ``steps`` plus
+optional ``name``, ``seed`` and ``boot_ticks``. Step types:
+
+- dispatch:      target, action, payload  -> Runner.dispatch()
+- wait:          ticks                    -> full GameLoop update/draw frames
+- input:         press / release / tap    -> key names or codes (lists)
+- assert_state:  target, expected_state   -> checked against the concept's
+                                             state snapshot, then attributes
+
+Every step and every tick is timed, so a run doubles as a performance
+sample. run_scenarios() spreads files across a process pool.
+"""
+import glob
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import yaml
+
+from engine.headless import HeadlessGame
+
+STEP_TYPES = ("dispatch", "wait", "input", "assert_state")
+_MISSING = object()
+
+
+def load_scenario(path: str) -> Dict[str, Any]:
+    """Read a scenario file into {'name', 'seed', 'boot_ticks', 'steps'}."""
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.endswith(".json"):
+            data = json.load(f)
+        else:
+            data = yaml.safe_load(f)
+
+    if isinstance(data, list):
+        data = {"steps": data}
+    if not isinstance(data, dict) or not isinstance(data.get("steps"), list):
+        raise ValueError(f"Scenario {path} must be a list of steps or a mapping with 'steps'")
+
+    for i, step in enumerate(data["steps"]):
+        if step.get("type") not in STEP_TYPES:
+            raise ValueError(f"Scenario {path} step {i}: unknown type '{step.get('type')}'")
+
+    return {
+        "name": data.get("name", os.path.splitext(os.path.basename(path))[0]),
+        "seed": data.get("seed", 0),
+        "boot_ticks": data.get("boot_ticks", 1),
+        "steps": data["steps"]
+    }
+
+
+def state_fingerprint(game: HeadlessGame) -> str:
+    """Hash of every concept's primitive attributes; equal runs give equal hashes."""
+    items = []
+    for concept in sorted(game.runner.concepts.values(), key=lambda c: type(c).__name__):
+        for key, value in sorted(vars(concept).items()):
+            if isinstance(value, (int, float, str, bool)) and key not in ("id",):
+                items.append((type(concept).__name__, key, value))
+    return hashlib.sha1(repr(items).encode()).hexdigest()
+
+
+class ScenarioRunner:
+    """Executes one scenario on a HeadlessGame, timing steps and ticks."""
+
+    def __init__(self, game: HeadlessGame):
+        self.game = game
+        self.tick_times: List[float] = []
+
+    def tick(self, count: int = 1):
+        clock = time.perf_counter
+        for _ in range(count):
+            start = clock()
+            self.game.step()
+            self.tick_times.append(clock() - start)
+
+    def run(self, scenario: Dict[str, Any]) -> Dict[str, Any]:
+        result = {
+            "name": scenario["name"],
+            "passed": True,
+            "error": None,
+            "steps": [],
+            "ticks": 0
+        }
+        self.tick(scenario.get("boot_ticks", 1))
+        start = time.perf_counter()
+
+        for index, step in enumerate(scenario["steps"]):
+            step_start = time.perf_counter()
+            try:
+                self.execute(step)
+            except Exception as e:
+                result["passed"] = False
+                result["error"] = f"step {index} ({step.get('type')}): {e}"
+            result["steps"].append({
+                "index": index,
+                "type": step["type"],
+                "seconds": time.perf_counter() - step_start
+            })
+            if not result["passed"]:
+                break
+
+        result["seconds"] = time.perf_counter() - start
+        result["ticks"] = len(self.tick_times)
+        result["tick_times"] = self.tick_times
+        result["fingerprint"] = state_fingerprint(self.game)
+        return result
+
+    def execute(self, step: Dict[str, Any]):
+        kind = step["type"]
+        if kind == "wait":
+            self.tick(int(step.get("ticks", 1)))
+
+        elif kind == "input":
+            actions = []
+            for action in ("press", "release", "tap"):
+                keys = step.get(action, [])
+                if not isinstance(keys, list):
+                    keys = [keys]
+                actions.extend((action, key) for key in keys)
+            self.game.apply_input(actions)
+
+        elif kind == "dispatch":
+            concept = self._concept(step["target"])
+            with self.game.output_context():
+                self.game.runner.dispatch(concept.id, step["action"], step.get("payload") or {})
+
+        elif kind == "assert_state":
+            concept = self._concept(step["target"])
+            snapshot = concept.get_state_snapshot()
+            for key, expected in (step.get("expected_state") or {}).items():
+                actual = snapshot.get(key, _MISSING)
+                if actual is _MISSING:
+                    actual = getattr(concept, key, None)
+                if actual != expected:
+                    raise AssertionError(f"State mismatch for {step['target']}. Expected {key}={expected}, got {actual}")
+
+    def _concept(self, name: str):
+        concept = self.game.concept(name)
+        if concept is None:
+            raise LookupError(f"Concept {name} not found")
+        return concept
+
+
+def run_scenario_file(path: str, replays: int = 1) -> Dict[str, Any]:
+    """
+    Run one scenario file in a fresh game. With replays > 1 the scenario is
+    re-run from scratch and the final state fingerprints must match.
+    """
+    try:
+        scenario = load_scenario(path)
+    except Exception as e:
+        return {"name": os.path.basename(path), "path": path, "passed": False, "error": str(e), "steps": [], "ticks": 0, "tick_times": []}
+
+    result = None
+    for attempt in range(max(1, replays)):
+        game = HeadlessGame(seed=scenario["seed"])
+        current = ScenarioRunner(game).run(scenario)
+        if result is None:
+            result = current
+        elif current["fingerprint"] != result["fingerprint"] and result["passed"]:
+            result["passed"] = False
+            result["error"] = f"non-deterministic: replay {attempt} ended in a different state"
+    result["path"] = path
+    return result
+
+
+def collect_scenarios(paths: List[str]) -> List[str]:
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for pattern in ("*.yaml", "*.yml", "*.json"):
+                files.extend(sorted(glob.glob(os.path.join(path, "**", pattern), recursive=True)))
+        else:
+            files.append(path)
+    return files
+
+
+def run_scenarios(paths: List[str], workers: Optional[int] = None, replays: int = 1) -> List[Dict[str, Any]]:
+    """Run scenario files (or directories of them) across a process pool."""
+    files = collect_scenarios(paths)
+    if workers == 1 or len(files) <= 1:
+        return [run_scenario_file(f, replays) for f in files]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(run_scenario_file, files, [replays] * len(files)))
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Per-scenario timing summary (milliseconds) without the raw tick list."""
+    ticks = result.get("tick_times", [])
+    return {
+        "name": result["name"],
+        "path": result.get("path"),
+        "passed": result["passed"],
+        "error": result["error"],
+        "ticks": len(ticks),
+        "seconds": result.get("seconds", 0.0),
+        "tick_ms_p50": percentile(ticks, 50) * 1000,
+        "tick_ms_p95": percentile(ticks, 95) * 1000,
+        "tick_ms_max": max(ticks) * 1000 if ticks else 0.0,
+        "steps": [{"index": s["index"], "type": s["type"], "ms": s["seconds"] * 1000} for s in result["steps"]]
+    }
@@ -0,0 +1,148 @@
+"""
+Frame-time telemetry.
+
+GameLoop hands FrameTelemetry one sample per frame: update time, draw time,
+event-queue depth and process_events() passes. It keeps a rolling window
+for the HUD (p50/p95/p99) and can stream every sample to a CSV file, tagged
+with the current scene (map name), so frame-pacing traces can be attached
+to bug reports.
+
+Hotkeys (polled by GameLoop): F3 toggles the HUD, F4 starts/stops recording.
+CSFW_FRAME_LOG=<file>.csv starts recording at boot.
+"""
+import csv
+import os
+import time
+from typing import Callable, Dict, List, Optional
+
+FRAME_BUDGET_MS = 1000.0 / 60
+CSV_HEADER = ("frame", "scene", "update_us", "draw_us", "queue", "passes")
+
+
+def _percentile(ordered: List[int], pct: float) -> int:
+    if not ordered:
+        return 0
+    return ordered[min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))]
+
+
+class FrameRecorder:
+    """Buffered CSV writer for per-frame samples."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.frames = 0
+        self._file = open(path, 'w', encoding='utf-8', newline='', buffering=1 << 16)
+        self._writer = csv.writer(self._file, lineterminator="\n") # Quotes scenes with commas/quotes
+        self._writer.writerow(CSV_HEADER)
+
+    def write(self, frame: int, scene: str, update_ns: int, draw_ns: int, queue: int, passes: int):
+        self._writer.writerow((frame, scene, update_ns // 1000, draw_ns // 1000, queue, passes))
+        self.frames += 1
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+
+class FrameTelemetry:
+    def __init__(self, window: int = 240, scene: Optional[Callable[[], str]] = None):
+        self.window = window
+        self.scene = scene or (lambda: "")
+        self.update_ns = [0] * window
+        self.draw_ns = [0] * window
+        self.frames = 0
+        self.last = {"update_ns": 0, "draw_ns": 0, "queue": 0, "passes": 0}
+        self.recorder: Optional[FrameRecorder] = None
+        self.pipeline = None
+        self.layer = "hud"
+        self.refresh_every = 15 # HUD percentile refresh interval (frames)
+        self._summary: Dict[str, Dict[str, float]] = {}
+        self._pending_update_ns = 0
+
+    # ===== Wiring =====
+
+    def install(self, loop, layer: str = "hud"):
+        """Attach to a GameLoop and add the (initially hidden) HUD as the top render layer."""
+        loop.telemetry = self
+        self.pipeline = loop.render_pipeline
+        self.pipeline.add_layer(layer, self.draw, enabled=False)
+        self.layer = layer
+        path = os.environ.get("CSFW_FRAME_LOG")
+        if path:
+            self.start_recording(path)
+
+    def toggle_hud(self):
+        if self.pipeline is not None:
+            self.pipeline.set_enabled(self.layer, not self.pipeline.get_layer(self.layer).enabled)
+
+    def poll_input(self):
+        import pyxel
+        if pyxel.btnp(pyxel.KEY_F3):
+            self.toggle_hud()
+        if pyxel.btnp(pyxel.KEY_F4):
+            if self.recorder:
+                self.stop_recording()
+            else:
+                self.start_recording(time.strftime("frames_%Y%m%d_%H%M%S.csv"))
+
+    # ===== Recording =====
+
+    def start_recording(self, path: str):
+        self.stop_recording()
+        self.recorder = FrameRecorder(path)
+        print(f"Frame telemetry: recording to {path}")
+
+    def stop_recording(self):
+        if self.recorder:
+            self.recorder.close()
+            print(f"Frame telemetry: {self.recorder.frames} frames written to {self.recorder.path}")
+            self.recorder = None
+
+    # ===== Samples =====
+
+    def record_update(self, update_ns: int):
+        self._pending_update_ns = update_ns
+
+    def record_frame(self, draw_ns: int, queue: int, passes: int):
+        """Close the current frame (called after draw)."""
+        slot = self.frames % self.window
+        update_ns = self._pending_update_ns
+        self.update_ns[slot] = update_ns
+        self.draw_ns[slot] = draw_ns
+        self.last = {"update_ns": update_ns, "draw_ns": draw_ns, "queue": queue, "passes": passes}
+        if self.recorder:
+            self.recorder.write(self.frames, self.scene(), update_ns, draw_ns, queue, passes)
+        self.frames += 1
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Rolling p50/p95/p99 (ms) of update, draw and total frame time."""
+        count = min(self.frames, self.window)
+        update = self.update_ns[:count] if count < self.window else self.update_ns
+        draw = self.draw_ns[:count] if count < self.window else self.draw_ns
+        series = {
+            "update": sorted(update),
+            "draw": sorted(draw),
+            "frame": sorted(u + d for u, d in zip(update, draw))
+        }
+        return {name: {f"p{p}": _percentile(values, p) / 1e6 for p in (50, 95, 99)}
+                for name, values in series.items()}
+
+    # ===== HUD =====
+
+    def draw(self, payload: dict):
+        import pyxel
+        if not self._summary or self.frames % self.refresh_every == 0:
+            self._summary = self.summary()
+
+        pyxel.camera(0, 0)
+        pyxel.rect(0, 0, 132, 38, 0)
+        last = self.last
+        frame_ms = (last["update_ns"] + last["draw_ns"]) / 1e6
+        col = 8 if frame_ms > FRAME_BUDGET_MS else 11
+        pyxel.text(2, 2, f"UPD {last['update_ns'] / 1e6:5.2f} DRW {last['draw_ns'] / 1e6:5.2f}ms", col)
+        pyxel.text(2, 9, f"QUEUE {last['queue']:3d} PASSES {last['passes']:2d}", 7)
+        frame = self._summary["frame"]
+        pyxel.text(2, 16, f"p50 {frame['p50']:5.2f} p95 {frame['p95']:5.2f}", 7)
+        pyxel.text(2, 23, f"p99 {frame['p99']:5.2f} ms", 8 if frame['p99'] > FRAME_BUDGET_MS else 7)
+        if self.recorder:
+            pyxel.text(2, 30, f"REC {self.recorder.frames}", 8)
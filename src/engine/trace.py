@@ -0,0 +1,66 @@
+"""
+Level-gated trace output for hot-path diagnostics.
+
+Messages use %-style arguments and are only formatted when their level is
+enabled, so a disabled trace() in a per-step path costs one comparison.
+The level comes from CSFW_TRACE (a name such as "debug" or a number) and
+defaults to INFO:
+
+    from engine import trace
+    trace.debug("Portal check at %d,%d", tx, ty)
+"""
+import os
+import sys
+
+ERROR = 40
+WARN = 30
+INFO = 20
+DEBUG = 10
+TRACE = 5
+
+LEVEL_NAMES = {
+    "error": ERROR,
+    "warn": WARN,
+    "info": INFO,
+    "debug": DEBUG,
+    "trace": TRACE
+}
+
+
+def _parse_level(value, default: int = INFO) -> int:
+    if value is None or value == "":
+        return default
+    if isinstance(value, int):
+        return value
+    value = str(value).strip().lower()
+    if value.isdigit():
+        return int(value)
+    return LEVEL_NAMES.get(value, default)
+
+
+LEVEL = _parse_level(os.environ.get("CSFW_TRACE"))
+
+
+def set_level(level):
+    """Set the threshold by number or name ('debug', 'info', ...)."""
+    global LEVEL
+    LEVEL = _parse_level(level)
+
+
+def enabled(level: int) -> bool:
+    return level >= LEVEL
+
+
+def trace(level: int, message: str, *args):
+    if level >= LEVEL:
+        sys.stdout.write((message % args if args else message) + "\n")
+
+
+def debug(message: str, *args):
+    if DEBUG >= LEVEL:
+        trace(DEBUG, message, *args)
+
+
+def info(message: str, *args):
+    if INFO >= LEVEL:
+        trace(INFO, message, *args)
@@ -1,5 +1,6 @@
 import sys
 import os
+import atexit
 import yaml # Need to install pyyaml if not present, but usually std env has it? No, need to check.
 
 # Ensure src is in path
@@ -22,9 +23,18 @@ from concepts.camerasystem import CameraSystem
 from concepts.menusystem import MenuSystem
 from concepts.shopsystem import ShopSystem
 from concepts.effectsystem import EffectSystem
+from sync.conditions import compile_condition
+from sync.mappers import compile_payload_mapper
+from sync.analysis import analyze_rules
+from sync.profiling import RuleProfiler
+from engine.events import configure as configure_events
+from engine.telemetry import FrameTelemetry
+from engine.prefetch import Prefetcher
+from engine import trace
 
 try:
     from cs_framework.engine.runner import Runner
+    from sync.dispatch import IndexedRunner
 except ImportError:
     print("Could not import Runner.")
     sys.exit(1)
@@ -36,7 +46,7 @@ def load_rules(runner, rules_file, concepts_map):
 
     try:
         with open(rules_file, 'r') as f:
-            data = yaml.safe_load(f)
+            data = yaml.load(f, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
             
         if "synchronizations" in data:
             try:
@@ -70,26 +80,6 @@ def load_rules(runner, rules_file, concepts_map):
                         event_name=when_data["event"]
                     )
                     
-                    # Define mapper factory
-                    def make_mapper(static_p):
-                        def mapper(event):
-                            resolved = {}
-                            for k, v in static_p.items():
-                                if isinstance(v, str) and v.startswith("event."):
-                                    attr = v.split(".", 1)[1]
-                                    val = None
-                                    if isinstance(event, dict) and attr in event:
-                                        val = event[attr]
-                                    elif hasattr(event, attr):
-                                        val = getattr(event, attr)
-                                    elif hasattr(event, "payload") and isinstance(event.payload, dict) and attr in event.payload:
-                                        val = event.payload[attr]
-                                    resolved[k] = val
-                                else:
-                                    resolved[k] = v
-                            return resolved
-                        return mapper
-
                     # Parse 'then'
                     then_objs = []
                     for action_data in sync_data.get("then", []):
@@ -103,49 +93,17 @@ def load_rules(runner, rules_file, concepts_map):
                         ai = ActionInvocation(
                             target_concept=target_obj,
                             action_name=action_data["action"],
-                            payload_mapper=make_mapper(static_payload)
+                            payload_mapper=compile_payload_mapper(
+                                static_payload,
+                                name=f"{sync_data['name']}.{target_name}.{action_data['action']}"
+                            )
                         )
                         then_objs.append(ai)
                     
-                    # Parse condition
+                    # Parse condition (compiled once, evaluated per matching event)
                     condition_str = sync_data.get("condition")
                     if condition_str:
-                        class AttrDict:
-                            def __init__(self, obj):
-                                self._obj = obj
-                            def __getattr__(self, name):
-                                if isinstance(self._obj, dict) and name in self._obj:
-                                    return self._obj[name]
-                                if hasattr(self._obj, "payload") and isinstance(self._obj.payload, dict) and name in self._obj.payload:
-                                    return self._obj.payload[name]
-                                if hasattr(self._obj, name):
-                                    return getattr(self._obj, name)
-                                return None
-
-                        def get_concept_helper(name):
-                            return concepts_map.get(name)
-
-                        def condition_fn(event, runner=runner, condition_str=condition_str):
-                            try:
-                                ctx = {
-                                    "event": AttrDict(event),
-                                    "runner": runner,
-                                    "concepts": concepts_map,
-                                    "get_concept": get_concept_helper
-                                }
-                                # We allow some basic builtins for string/int operations
-                                safe_builtins = {
-                                    "len": len,
-                                    "int": int,
-                                    "str": str,
-                                    "list": list,
-                                    "dict": dict
-                                }
-                                return eval(condition_str, {"__builtins__": safe_builtins}, ctx)
-                            except Exception as e:
-                                # if condition_str:
-                                #     print(f"Error evaluating condition '{condition_str}': {e}")
-                                return False
+                        condition_fn = compile_condition(condition_str, runner, concepts_map, name=sync_data["name"])
 
                         sync_obj = ConditionalSynchronization(
                             name=sync_data["name"],
@@ -179,7 +137,7 @@ def get_runner():
     except ImportError:
         print("Could not import RDFLogger, logging disabled.")
         logger = None
-    runner = Runner(logger=logger)
+    runner = IndexedRunner(logger=logger)
     
     # Initialize Concepts
     loop = GameLoop("GameLoop")
@@ -230,16 +188,75 @@ def get_runner():
     
     # Set NpcSystem reference for player-NPC collision (live positions)
     map_sys.set_npc_system(npc_sys)
+
+    # Set CameraSystem reference so MapSystem only draws visible tiles
+    map_sys.set_camera_system(cam_sys)
+
+    # NpcSystem steps off-screen NPCs at a lower rate
+    npc_sys.set_camera_system(cam_sys)
+
+    # Maps and NPC files one portal away are loaded in the background
+    prefetcher = Prefetcher()
+    map_sys.set_prefetcher(prefetcher)
+    npc_sys.set_prefetcher(prefetcher)
     
     # Set Player reference for NPC-to-Player collision avoidance
     npc_sys.set_player(player)
 
+    # Render pipeline (bottom to top); replaces the GameLoopDraw rule
+    render_layers = [
+        ("camera", cam_sys.apply),
+        ("map", map_sys.draw),
+        ("player", player.draw),
+        ("npcs", npc_sys.draw),
+        ("battle", battle_sys.draw),
+        ("shop", shop_sys.draw),
+        ("menu", menu_sys.draw),
+        ("effects", eff_sys.draw)
+    ]
+    for layer_name, draw_fn in render_layers:
+        loop.render_pipeline.add_layer(layer_name, draw_fn)
+
+    # Frame-time HUD on top of everything (F3), frame recorder (F4 / CSFW_FRAME_LOG)
+    telemetry = FrameTelemetry(scene=lambda: map_sys.map_data.get(map_sys.current_map_id, {}).get("name", ""))
+    telemetry.install(loop)
+    atexit.register(telemetry.stop_recording)
+
     # Load Rules
-    load_rules(runner, "src/sync/rules.yaml", concepts_map)
+    rules_path = os.path.join(project_root, "sync", "rules.yaml")
+    load_rules(runner, rules_path, concepts_map)
+    # Dispatch fan-out table only with CSFW_TRACE=debug (not on every boot)
+    if trace.enabled(trace.DEBUG):
+        trace.debug("Synchronization dispatch index:\n%s", runner.format_fanout_report())
+
+    # Static rule analysis: size the fixed event pump and flag dead rules
+    try:
+        graph = analyze_rules(rules_path, concepts_map)
+        loop.pump_passes = graph.passes_needed(runner.max_depth)
+        print(f"Rule analysis: roots={graph.roots} passes/frame={loop.pump_passes}")
+        for cycle in graph.cycles():
+            print(f"Warning: event cycle {' -> '.join(cycle)}")
+        for name, reason in graph.dead_rules.items():
+            print(f"Warning: dead rule {name} ({reason})")
+        for name in graph.unreachable_rules():
+            print(f"Warning: unreachable rule {name}")
+    except Exception as e:
+        print(f"Rule analysis skipped: {e}")
+
+    # Rule/action profiling: CSFW_PROFILE=1 prints a table at exit (and on F9),
+    # CSFW_PROFILE=<file>.json also writes the full stats there
+    profile = os.environ.get("CSFW_PROFILE")
+    if profile:
+        profiler = runner.enable_profiling(RuleProfiler(json_path=None if profile == "1" else profile))
+        loop.profiler = profiler
+        atexit.register(profiler.dump)
     
     return runner
 
 def main():
+    # Per-frame events take the trusted emit fast path in the game build
+    # (set CSFW_VALIDATE_EVENTS=1 to validate every event instead)
+    configure_events(trusted=True)
     runner = get_runner()
     
     # Find GameLoop to run it
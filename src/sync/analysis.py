@@ -0,0 +1,264 @@
+"""
+Static analysis of synchronization rules.
+
+Builds the causal graph  event -> rule -> action -> event  from rules.yaml
+and the Concept sources (``self.emit("Name", ...)`` calls, followed through
+``self.method()`` calls), then reports:
+
+- cycles between events
+- the longest causal chain below each root event (Update, Draw, ...)
+- how many Runner.process_events() passes a frame needs for those chains
+- dead rules (never-emitted trigger, missing action, empty 'then')
+- rules unreachable from any root event
+"""
+import ast
+import functools
+import inspect
+import math
+import os
+import textwrap
+from typing import Any, Dict, List, Optional, Set
+
+import yaml
+
+# libyaml is much faster when PyYAML was built with it
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def _class_methods(cls) -> Dict[str, ast.FunctionDef]:
+    """Method ASTs of cls and its project base classes (framework bases skipped)."""
+    methods = {}
+    for klass in reversed(cls.__mro__):
+        if klass is object or klass.__module__.startswith("cs_framework"):
+            continue
+        try:
+            source = textwrap.dedent(inspect.getsource(klass))
+        except (OSError, TypeError):
+            continue
+        class_node = ast.parse(source).body[0]
+        for node in class_node.body:
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                methods[node.name] = node
+    return methods
+
+
+def _self_calls(func: ast.FunctionDef):
+    """(emitted event names, called self-method names) for one method."""
+    emits, calls = set(), set()
+    for node in ast.walk(func):
+        if not isinstance(node, ast.Call) or not isinstance(node.func, ast.Attribute):
+            continue
+        owner = node.func.value
+        if not (isinstance(owner, ast.Name) and owner.id == "self"):
+            continue
+        if node.func.attr == "emit":
+            if node.args and isinstance(node.args[0], ast.Constant) and isinstance(node.args[0].value, str):
+                emits.add(node.args[0].value)
+        else:
+            calls.add(node.func.attr)
+    return emits, calls
+
+
+class ConceptEmits:
+    """Which events each method of a Concept class can emit (transitively)."""
+
+    def __init__(self, cls):
+        self.cls = cls
+        self.declared = set(getattr(cls, "__events__", {}) or {})
+        methods = _class_methods(cls)
+        direct = {name: _self_calls(fn) for name, fn in methods.items()}
+
+        self.method_emits: Dict[str, Set[str]] = {}
+        for name in direct:
+            seen, stack, emits = set(), [name], set()
+            while stack:
+                current = stack.pop()
+                if current in seen or current not in direct:
+                    continue
+                seen.add(current)
+                emits |= direct[current][0]
+                stack.extend(direct[current][1])
+            self.method_emits[name] = emits
+
+        self.methods = set(methods)
+        self.emitted = set().union(*self.method_emits.values()) if self.method_emits else set()
+
+
+@functools.lru_cache(maxsize=None)
+def concept_emits(cls) -> ConceptEmits:
+    """ConceptEmits for a class, computed once per process."""
+    return ConceptEmits(cls)
+
+
+@functools.lru_cache(maxsize=8)
+def _read_rules(path: str, mtime: float) -> List[Dict[str, Any]]:
+    with open(path, 'r', encoding='utf-8') as f:
+        data = yaml.load(f, Loader=YAML_LOADER) or {}
+    return data.get("synchronizations", [])
+
+
+class RuleGraph:
+    """Causal graph over 'Concept.Event' nodes plus per-rule diagnostics."""
+
+    def __init__(self, rules: List[Dict[str, Any]], concept_classes: Dict[str, type], roots: Optional[List[str]] = None):
+        self.rules = rules
+        self.concepts = {name: concept_emits(cls) for name, cls in concept_classes.items()}
+        self.issues: List[str] = []
+        self.dead_rules: Dict[str, str] = {}
+        # event -> [(rule name, 'Target.action', {events emitted by the action})]
+        self.edges: Dict[str, List[Any]] = {}
+
+        targeted = {}
+        for rule in rules:
+            name = rule.get("name", "?")
+            when = rule.get("when", {})
+            source, event = when.get("source"), when.get("event")
+            node = f"{source}.{event}"
+
+            if source not in self.concepts:
+                self.dead_rules[name] = f"unknown source concept '{source}'"
+                continue
+            if event not in self.concepts[source].emitted:
+                self.dead_rules[name] = f"{node} is never emitted"
+
+            actions = rule.get("then") or []
+            if not actions:
+                self.dead_rules.setdefault(name, "empty 'then'")
+
+            for action in actions:
+                target, action_name = action.get("target"), action.get("action")
+                info = self.concepts.get(target)
+                if info is None or action_name not in info.methods:
+                    self.dead_rules.setdefault(name, f"action {target}.{action_name} does not exist")
+                    continue
+                targeted.setdefault(target, set()).add(action_name)
+                emits = {f"{target}.{e}" for e in info.method_emits[action_name]}
+                self.edges.setdefault(node, []).append((name, f"{target}.{action_name}", emits))
+
+        # Roots: events emitted from methods no rule invokes (driven by Pyxel or main()).
+        if roots is None:
+            roots = set()
+            for cname, info in self.concepts.items():
+                reachable = set()
+                for action_name in targeted.get(cname, ()):
+                    reachable |= info.method_emits.get(action_name, set())
+                for method, emits in info.method_emits.items():
+                    if method not in targeted.get(cname, ()):
+                        roots |= {f"{cname}.{e}" for e in emits - reachable}
+        self.roots = sorted(roots)
+
+        for cname, info in self.concepts.items():
+            for event in sorted(info.declared - info.emitted):
+                self.issues.append(f"{cname}.{event} is declared in __events__ but never emitted")
+            for event in sorted(info.emitted - info.declared):
+                self.issues.append(f"{cname}.{event} is emitted without an __events__ schema")
+
+    # ===== Graph queries =====
+
+    def successors(self, event: str) -> Set[str]:
+        out = set()
+        for _, _, emits in self.edges.get(event, []):
+            out |= emits
+        return out
+
+    def reachable(self) -> Set[str]:
+        seen, stack = set(), list(self.roots)
+        while stack:
+            event = stack.pop()
+            if event in seen:
+                continue
+            seen.add(event)
+            stack.extend(self.successors(event))
+        return seen
+
+    def cycles(self) -> List[List[str]]:
+        """Elementary cycles found by DFS back edges (one per back edge)."""
+        found, state, path = [], {}, []
+
+        def visit(event):
+            state[event] = 1
+            path.append(event)
+            for nxt in sorted(self.successors(event)):
+                if state.get(nxt) == 1:
+                    found.append(path[path.index(nxt):] + [nxt])
+                elif nxt not in state:
+                    visit(nxt)
+            path.pop()
+            state[event] = 2
+
+        for event in sorted(set(self.edges) | set(self.roots)):
+            if event not in state:
+                visit(event)
+        return found
+
+    def chain_depth(self, root: str) -> float:
+        """Longest causal chain (in events) starting at root; inf if it reaches a cycle."""
+        memo = {}
+
+        def depth(event, stack):
+            if event in stack:
+                return math.inf
+            if event in memo:
+                return memo[event]
+            stack.add(event)
+            best = 1 + max((depth(n, stack) for n in self.successors(event)), default=0)
+            stack.discard(event)
+            memo[event] = best
+            return best
+
+        return depth(root, set())
+
+    def passes_needed(self, max_depth: int = 10, max_passes: int = 5) -> int:
+        """
+        process_events() passes per frame so every root chain completes.
+        One pass resolves up to max_depth + 1 levels of a chain; cyclic
+        chains are clamped to max_passes.
+        """
+        depths = [self.chain_depth(r) for r in self.roots] or [1]
+        longest = max(depths)
+        if math.isinf(longest):
+            return max_passes
+        return max(1, min(max_passes, math.ceil(longest / (max_depth + 1))))
+
+    def unreachable_rules(self) -> List[str]:
+        live = self.reachable()
+        names = []
+        for rule in self.rules:
+            when = rule.get("when", {})
+            if f"{when.get('source')}.{when.get('event')}" not in live and rule.get("name") not in self.dead_rules:
+                names.append(rule.get("name"))
+        return names
+
+    # ===== Reporting =====
+
+    def report(self, max_depth: int = 10) -> str:
+        lines = ["Root events (max chain depth):"]
+        for root in self.roots:
+            lines.append(f"  {root:<32} {self.chain_depth(root)}")
+        lines.append(f"process_events passes per frame: {self.passes_needed(max_depth)}")
+
+        cycles = self.cycles()
+        lines.append(f"Cycles: {len(cycles)}")
+        for cycle in cycles:
+            lines.append("  " + " -> ".join(cycle))
+
+        lines.append(f"Dead rules: {len(self.dead_rules)}")
+        for name, reason in self.dead_rules.items():
+            lines.append(f"  {name}: {reason}")
+
+        unreachable = self.unreachable_rules()
+        lines.append(f"Unreachable rules: {len(unreachable)}")
+        for name in unreachable:
+            lines.append(f"  {name}")
+
+        if self.issues:
+            lines.append("Notes:")
+            lines.extend(f"  {issue}" for issue in self.issues)
+        return "\n".join(lines)
+
+
+def analyze_rules(rules_file: str, concepts_map: Dict[str, Any], roots: Optional[List[str]] = None) -> RuleGraph:
+    """Build the RuleGraph for a rules.yaml file and a name -> Concept (instance or class) map."""
+    rules = _read_rules(os.path.abspath(rules_file), os.path.getmtime(rules_file))
+    classes = {name: (c if isinstance(c, type) else type(c)) for name, c in concepts_map.items()}
+    return RuleGraph(rules, classes, roots=roots)
@@ -0,0 +1,154 @@
+"""
+Rule condition compiler.
+
+Conditions in rules.yaml are small Python expressions such as
+``get_concept('GameState').current_state == 'EXPLORING'``. They are parsed
+once at load time, checked against an AST allowlist and compiled into a
+plain function, so matching events only pay for a function call.
+"""
+import ast
+from typing import Any, Callable, Dict
+
+# Builtins available inside conditions (string/int helpers only)
+SAFE_BUILTINS = {
+    "len": len,
+    "int": int,
+    "str": str,
+    "list": list,
+    "dict": dict
+}
+
+# Names a condition may reference besides SAFE_BUILTINS
+CONTEXT_NAMES = {"event", "runner", "concepts", "get_concept"}
+
+ALLOWED_NODES = (
+    ast.Expression, ast.Load,
+    ast.BoolOp, ast.And, ast.Or,
+    ast.UnaryOp, ast.Not, ast.USub, ast.UAdd,
+    ast.BinOp, ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod,
+    ast.Compare, ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE,
+    ast.In, ast.NotIn, ast.Is, ast.IsNot,
+    ast.IfExp, ast.Call, ast.Name, ast.Attribute, ast.Subscript,
+    ast.Constant, ast.List, ast.Tuple, ast.Set, ast.Dict,
+)
+
+
+class ConditionError(ValueError):
+    """Raised when a rule condition fails to parse or uses a forbidden construct."""
+
+
+def resolve_field(event: Any, name: str) -> Any:
+    """
+    Resolve ``event.<name>`` the way rules expect:
+    dict key, then payload key, then plain attribute, else None.
+    """
+    if isinstance(event, dict) and name in event:
+        return event[name]
+    payload = getattr(event, "payload", None)
+    if isinstance(payload, dict) and name in payload:
+        return payload[name]
+    return getattr(event, name, None)
+
+
+class _Validator(ast.NodeVisitor):
+    def __init__(self, source: str):
+        self.source = source
+
+    def generic_visit(self, node):
+        if not isinstance(node, ALLOWED_NODES):
+            raise ConditionError(f"Forbidden syntax '{type(node).__name__}' in condition: {self.source}")
+        super().generic_visit(node)
+
+    def visit_Name(self, node):
+        if node.id not in CONTEXT_NAMES and node.id not in SAFE_BUILTINS:
+            raise ConditionError(f"Unknown name '{node.id}' in condition: {self.source}")
+
+    def visit_Attribute(self, node):
+        if node.attr.startswith("_"):
+            raise ConditionError(f"Private attribute '{node.attr}' in condition: {self.source}")
+        self.generic_visit(node)
+
+    def visit_Call(self, node):
+        if not isinstance(node.func, ast.Name) or (node.func.id not in SAFE_BUILTINS and node.func.id != "get_concept"):
+            raise ConditionError(f"Only builtins and get_concept() may be called in condition: {self.source}")
+        if node.keywords:
+            raise ConditionError(f"Keyword arguments are not allowed in condition: {self.source}")
+        self.generic_visit(node)
+
+
+class _Specializer(ast.NodeTransformer):
+    """
+    Rewrites the validated tree for fast evaluation:
+    - ``event.attr``              -> ``_field(event, 'attr')``
+    - ``get_concept('Name')``     -> a name bound to the concept at load time
+    """
+
+    def __init__(self, concepts_map: Dict[str, Any], bindings: Dict[str, Any]):
+        self.concepts_map = concepts_map
+        self.bindings = bindings
+
+    def visit_Attribute(self, node):
+        self.generic_visit(node)
+        if isinstance(node.value, ast.Name) and node.value.id == "event":
+            return ast.copy_location(ast.Call(
+                func=ast.Name(id="_field", ctx=ast.Load()),
+                args=[node.value, ast.Constant(value=node.attr)],
+                keywords=[]
+            ), node)
+        return node
+
+    def visit_Call(self, node):
+        self.generic_visit(node)
+        if (isinstance(node.func, ast.Name) and node.func.id == "get_concept"
+                and len(node.args) == 1 and isinstance(node.args[0], ast.Constant)
+                and node.args[0].value in self.concepts_map
+                and str(node.args[0].value).isidentifier()):
+            alias = f"_concept_{node.args[0].value}"
+            self.bindings[alias] = self.concepts_map[node.args[0].value]
+            return ast.copy_location(ast.Name(id=alias, ctx=ast.Load()), node)
+        return node
+
+
+def compile_condition(source: str, runner: Any, concepts_map: Dict[str, Any], name: str = "rule") -> Callable[[Any], bool]:
+    """
+    Compile a rule condition into a reusable ``fn(event) -> bool``.
+
+    Raises ConditionError at load time for syntax errors or constructs outside
+    the allowlist. Errors raised while evaluating make the condition False,
+    matching the previous eval()-based behaviour.
+    """
+    try:
+        tree = ast.parse(source.strip(), mode="eval")
+    except SyntaxError as e:
+        raise ConditionError(f"Invalid condition '{source}': {e}") from None
+
+    _Validator(source).visit(tree)
+
+    namespace = {
+        "__builtins__": SAFE_BUILTINS,
+        "_field": resolve_field,
+        "runner": runner,
+        "concepts": concepts_map,
+        "get_concept": concepts_map.get
+    }
+    body = _Specializer(concepts_map, namespace).visit(tree.body)
+
+    # Wrap as ``lambda event: <body>`` so evaluation is a plain function call
+    lam = ast.Expression(body=ast.Lambda(
+        args=ast.arguments(
+            posonlyargs=[], args=[ast.arg(arg="event")], vararg=None,
+            kwonlyargs=[], kw_defaults=[], kwarg=None, defaults=[]
+        ),
+        body=body
+    ))
+    ast.fix_missing_locations(lam)
+    predicate = eval(compile(lam, f"<condition:{name}>", "eval"), namespace)
+
+    def condition_fn(event):
+        try:
+            return predicate(event)
+        except Exception:
+            return False
+
+    condition_fn.source = source
+    return condition_fn
@@ -0,0 +1,197 @@
+"""
+Indexed synchronization dispatch.
+
+The stock Runner scans every registered synchronization for each event and
+builds a deep-copied global state snapshot before matching. IndexedRunner
+keeps a dispatch table keyed by (source concept id, event name) that is
+maintained at registration time, so an event only touches the rules that
+actually subscribe to it.
+"""
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+from cs_framework.engine.runner import Runner
+from cs_framework.core.synchronization import Synchronization
+from cs_framework.core.event import Event, FailureEvent
+
+from sync.profiling import RuleProfiler
+
+
+def _source_key(source: Any) -> Any:
+    """Normalize an EventPattern source (Concept, UUID or id string) to a UUID key."""
+    if hasattr(source, "id"):
+        return source.id
+    if isinstance(source, uuid.UUID):
+        return source
+    try:
+        return uuid.UUID(str(source))
+    except ValueError:
+        return str(source)
+
+
+class IndexedRunner(Runner):
+    """
+    Runner with an O(1) (source, event) -> synchronizations dispatch table.
+    Rule order within a key follows registration order, as with Runner.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._dispatch_index: Dict[Tuple[Any, str], List[Synchronization]] = {}
+        self._indexed_count = 0
+        self._has_where = False
+        self.profiler: Optional[RuleProfiler] = None
+        self.profiling = False # Set by enable_profiling()
+
+    # ===== Index maintenance =====
+
+    def register(self, entity: Any):
+        super().register(entity)
+        if isinstance(entity, Synchronization):
+            self._index_synchronization(entity)
+
+    def clear_synchronizations(self):
+        super().clear_synchronizations()
+        self._dispatch_index = {}
+        self._indexed_count = 0
+        self._has_where = False
+
+    def rebuild_index(self):
+        """Rebuild the dispatch table from self.synchronizations."""
+        self._dispatch_index = {}
+        self._indexed_count = 0
+        self._has_where = False
+        for sync in self.synchronizations:
+            self._index_synchronization(sync)
+
+    def _index_synchronization(self, sync: Synchronization):
+        key = (_source_key(sync.when.source_concept), sync.when.event_name)
+        self._dispatch_index.setdefault(key, []).append(sync)
+        self._indexed_count += 1
+        if sync.where:
+            self._has_where = True
+
+    def subscribers(self, source_id: Any, event_name: str) -> List[Synchronization]:
+        """Synchronizations listening to event_name from the given source."""
+        if len(self.synchronizations) != self._indexed_count:
+            # Synchronizations were added without register(); resync.
+            self.rebuild_index()
+        return self._dispatch_index.get((_source_key(source_id), event_name), [])
+
+    # ===== Fan-out reporting =====
+
+    def fanout_report(self) -> List[Dict[str, Any]]:
+        """
+        Fan-out per event: every declared or subscribed event with its rules
+        and the number of actions one emission triggers. Sorted by actions.
+        """
+        rows = {}
+        for concept in self.concepts.values():
+            label = type(concept).__name__
+            for event_name in getattr(concept, "__events__", {}):
+                rows[(concept.id, event_name)] = {"event": f"{label}.{event_name}", "rules": [], "actions": 0}
+
+        for (source_id, event_name), syncs in self._dispatch_index.items():
+            concept = self.concepts.get(source_id)
+            label = type(concept).__name__ if concept else str(source_id)
+            row = rows.setdefault((source_id, event_name), {"event": f"{label}.{event_name}", "rules": [], "actions": 0})
+            row["rules"] = [s.name for s in syncs]
+            row["actions"] = sum(len(s.then) for s in syncs)
+
+        return sorted(rows.values(), key=lambda r: (-r["actions"], r["event"]))
+
+    def format_fanout_report(self) -> str:
+        lines = [f"{'Event':<36} {'Rules':>5} {'Actions':>7}  Synchronizations"]
+        for row in self.fanout_report():
+            lines.append(f"{row['event']:<36} {len(row['rules']):>5} {row['actions']:>7}  {', '.join(row['rules']) or '-'}")
+        return "\n".join(lines)
+
+    # ===== Profiling =====
+
+    def enable_profiling(self, profiler: Optional[RuleProfiler] = None) -> RuleProfiler:
+        """Time each phase of event handling into profiler (see sync.profiling)."""
+        self.profiler = profiler or self.profiler or RuleProfiler()
+        self.profiling = True
+        return self.profiler
+
+    def disable_profiling(self):
+        """Stop timing; collected stats are kept."""
+        self.profiling = False
+
+    def _event_label(self, event: Event) -> str:
+        concept = self.concepts.get(event.source_id)
+        return f"{type(concept).__name__ if concept else event.source_id}.{event.name}"
+
+    # ===== Dispatch =====
+
+    def _handle_event(self, event: Event, depth: int):
+        # Timing hooks are only taken while profiling; otherwise each is one None check
+        profiler = self.profiler if self.profiling else None
+        clock = time.perf_counter_ns
+        if self.logger:
+            self.logger.log_event(event.id, event.name, event.source_id, event.causal_link, event.status, payload=event.payload)
+
+        if profiler is not None:
+            start = clock()
+        if len(self.synchronizations) != self._indexed_count:
+            self.rebuild_index()
+
+        syncs = self._dispatch_index.get((event.source_id, event.name)) or ()
+        if syncs and self._has_where:
+            # Global state is only needed by 'where' clauses; skip the deep copy otherwise.
+            global_state = self._get_global_state()
+            syncs = [sync for sync in syncs if not (sync.where and not sync.where(global_state))]
+        if profiler is not None:
+            profiler.stat("match", self._event_label(event)).add(clock() - start)
+
+        for sync in syncs:
+            if profiler is not None:
+                rule_start = clock()
+            invocations = sync.execute(event)
+            if profiler is not None and getattr(sync, "cond_fn", None):
+                profiler.stat("condition", sync.name).add(clock() - rule_start)
+
+            for invocation in invocations:
+                target_concept = invocation.target_concept
+                target_id = target_concept.id if hasattr(target_concept, 'id') else target_concept
+
+                concept = self.concepts.get(target_id)
+                if concept is None:
+                    print(f"Target concept {target_id} not found.")
+                    continue
+                if profiler is not None:
+                    key = f"{type(concept).__name__}.{invocation.action_name}"
+                    phase = "map"
+                    step = clock()
+                try:
+                    payload = invocation.payload_mapper(event)
+                    if profiler is not None:
+                        mapped = clock()
+                        profiler.stat("map", key).add(mapped - step)
+                        phase = "action"
+
+                    action_id = uuid.uuid4()
+                    if self.logger:
+                        self.logger.log_action(action_id, invocation.action_name, concept.id, triggered_by=event.id)
+
+                    concept.dispatch(invocation.action_name, payload)
+
+                    new_events = concept.collect_events()
+                    for ne in new_events:
+                        ne.causal_link = action_id
+
+                    self._event_queue.extend(new_events)
+                    if profiler is not None:
+                        profiler.stat("action", key).add(clock() - mapped)
+                except Exception as e:
+                    if profiler is not None:
+                        profiler.stat(phase, key).errors += 1
+                    self._event_queue.append(FailureEvent(event, str(e), concept.id))
+
+            if profiler is not None:
+                profiler.stat("rule", sync.name).add(clock() - rule_start)
+
+        # Recursive call if there are new events
+        if self._event_queue:
+            self.process_events(depth + 1)
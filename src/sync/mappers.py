@@ -0,0 +1,85 @@
+"""
+Payload mapper compiler.
+
+A rule's ``then`` payload mixes constants with ``event.<field>`` references.
+Instead of re-inspecting every value on each invocation, each payload is
+compiled once into a specialized function whose per-field lookup strategy
+is fixed at load time. Constant-only payloads are built once and handed
+out as a fresh dict copy per call, so actions get a plain dict (which
+Concept.dispatch turns into the action's model) and cannot change the
+rule's payload for later calls.
+"""
+from types import MappingProxyType
+from typing import Any, Callable, Dict
+
+# Attributes defined on cs_framework Event objects; everything else lives in the payload.
+EVENT_ATTRS = frozenset(["id", "name", "payload", "source_id", "timestamp", "causal_link", "status"])
+
+EMPTY_PAYLOAD = MappingProxyType({})
+
+
+def resolve_event_value(event: Any, attr: str) -> Any:
+    """Generic lookup: dict key, then event attribute, then payload key, else None."""
+    if isinstance(event, dict) and attr in event:
+        return event[attr]
+    if hasattr(event, attr):
+        return getattr(event, attr)
+    payload = getattr(event, "payload", None)
+    if isinstance(payload, dict) and attr in payload:
+        return payload[attr]
+    return None
+
+
+def _event_ref(value: Any):
+    if isinstance(value, str) and value.startswith("event."):
+        return value.split(".", 1)[1]
+    return None
+
+
+def compile_payload_mapper(static_payload: Dict[str, Any], name: str = "mapper") -> Callable[[Any], Any]:
+    """
+    Compile a rule payload into ``fn(event) -> dict``.
+
+    The generated fast path handles Event objects with a dict payload (the
+    only shape the Runner produces); anything else falls back to the generic
+    resolver so behaviour matches the original per-call mapper.
+    """
+    static_payload = static_payload or {}
+    refs = {k: _event_ref(v) for k, v in static_payload.items()}
+
+    if not any(refs.values()):
+        frozen = MappingProxyType(dict(static_payload)) if static_payload else EMPTY_PAYLOAD
+        copy_payload = frozen.copy # MappingProxyType.copy() returns a plain dict
+
+        def constant_mapper(event):
+            return copy_payload()
+
+        constant_mapper.payload = frozen
+        return constant_mapper
+
+    def resolve_all(event):
+        return {k: (resolve_event_value(event, refs[k]) if refs[k] else v) for k, v in static_payload.items()}
+
+    namespace = {"_resolve_all": resolve_all}
+    fields = []
+    for i, (key, value) in enumerate(static_payload.items()):
+        attr = refs[key]
+        if attr is None:
+            namespace[f"_c{i}"] = value
+            fields.append(f"{key!r}: _c{i}")
+        elif attr in EVENT_ATTRS:
+            fields.append(f"{key!r}: event.{attr}")
+        else:
+            fields.append(f"{key!r}: payload.get({attr!r})")
+
+    source = (
+        "def mapper(event):\n"
+        "    payload = getattr(event, 'payload', None)\n"
+        "    if payload.__class__ is dict and event.__class__ is not dict:\n"
+        f"        return {{{', '.join(fields)}}}\n"
+        "    return _resolve_all(event)\n"
+    )
+    exec(compile(source, f"<payload:{name}>", "exec"), namespace)
+    mapper = namespace["mapper"]
+    mapper.payload = static_payload
+    return mapper
@@ -0,0 +1,119 @@
+"""
+Synchronization profiling.
+
+RuleProfiler collects call counts, cumulative/max time and log2 latency
+histograms for each phase of event handling:
+
+- match:     dispatch lookup + 'where' checks, keyed by 'Concept.Event'
+- condition: rule condition evaluation, keyed by rule name
+- rule:      whole rule (condition + all its actions), keyed by rule name
+- map:       payload mapping, keyed by 'Concept.action'
+- action:    action dispatch + event collection, keyed by 'Concept.action'
+
+IndexedRunner.enable_profiling() turns on the timing hooks in its
+_handle_event; while profiling is off each hook is a single None check.
+"""
+import json
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+PHASES = ("match", "condition", "rule", "map", "action")
+# Bucket 0 is < 1 us, bucket i covers [2^(i-1), 2^i) us, the last is open-ended
+HISTOGRAM_BUCKETS = 18
+
+
+class Stat:
+    __slots__ = ("calls", "errors", "total_ns", "max_ns", "buckets")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.buckets = [0] * HISTOGRAM_BUCKETS
+
+    def add(self, ns: int):
+        self.calls += 1
+        self.total_ns += ns
+        if ns > self.max_ns:
+            self.max_ns = ns
+        index = (ns // 1000).bit_length()
+        self.buckets[index if index < HISTOGRAM_BUCKETS else HISTOGRAM_BUCKETS - 1] += 1
+
+    def percentile_us(self, pct: float) -> float:
+        """Upper bound (us) of the histogram bucket holding the pct-th sample."""
+        if not self.calls:
+            return 0.0
+        rank = pct / 100.0 * self.calls
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank and count:
+                return float(1 << index) if index < HISTOGRAM_BUCKETS - 1 else self.max_ns / 1000
+        return self.max_ns / 1000
+
+
+class RuleProfiler:
+    def __init__(self, json_path: Optional[str] = None):
+        self.stats: Dict[Tuple[str, str], Stat] = {}
+        self.json_path = json_path
+        self.started = time.perf_counter()
+
+    def stat(self, phase: str, key: str) -> Stat:
+        stat = self.stats.get((phase, key))
+        if stat is None:
+            stat = self.stats[(phase, key)] = Stat()
+        return stat
+
+    def reset(self):
+        self.stats = {}
+        self.started = time.perf_counter()
+
+    # ===== Reporting =====
+
+    def rows(self, phase: Optional[str] = None) -> List[Dict[str, Any]]:
+        """One row per (phase, key), most expensive (cumulative time) first."""
+        rows = []
+        for (stat_phase, key), s in self.stats.items():
+            if phase and stat_phase != phase:
+                continue
+            rows.append({
+                "phase": stat_phase,
+                "key": key,
+                "calls": s.calls,
+                "errors": s.errors,
+                "total_ms": s.total_ns / 1e6,
+                "avg_us": (s.total_ns / s.calls / 1000) if s.calls else 0.0,
+                "max_us": s.max_ns / 1000,
+                "p50_us": s.percentile_us(50),
+                "p95_us": s.percentile_us(95),
+                "p99_us": s.percentile_us(99),
+                "histogram": list(s.buckets)
+            })
+        rows.sort(key=lambda r: -r["total_ms"])
+        return rows
+
+    def format_table(self, phase: Optional[str] = None, limit: int = 30) -> str:
+        elapsed = time.perf_counter() - self.started
+        lines = [f"Rule profile ({elapsed:.1f}s wall)",
+                 f"{'Phase':<10} {'Key':<40} {'Calls':>8} {'Err':>4} {'Total ms':>9} {'Avg us':>8} {'p95 us':>8} {'Max us':>9}"]
+        for r in self.rows(phase)[:limit]:
+            lines.append(f"{r['phase']:<10} {r['key']:<40} {r['calls']:>8} {r['errors']:>4} {r['total_ms']:>9.2f} "
+                         f"{r['avg_us']:>8.1f} {r['p95_us']:>8.0f} {r['max_us']:>9.1f}")
+        return "\n".join(lines)
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "seconds": time.perf_counter() - self.started,
+            "histogram_buckets_us": [0] + [1 << i for i in range(HISTOGRAM_BUCKETS - 1)],
+            "rows": self.rows()
+        }
+
+    def dump(self, json_path: Optional[str] = None):
+        """Print the table; also write JSON if a path is given or configured."""
+        print(self.format_table())
+        path = json_path or self.json_path
+        if path:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(self.to_json(), f, indent=2)
+            print(f"Rule profile written to {path}")
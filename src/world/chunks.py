@@ -0,0 +1,496 @@
+"""
+Chunked map store for very large maps.
+
+A .chunks file holds a map as square chunks (CHUNK_SIZE tiles a side) so
+only the part around the camera has to be in memory. Layout (little-endian):
+
+    header      <4sHHIIHxxII magic b"CSFC", version, layer count, width,
+                             height, chunk size, metadata offset, length
+    layer table <16sBxxx     per layer: name, bytes per tile (1 or 2)
+    metadata    UTF-8 JSON   everything except "layers"
+    chunks      8-byte aligned, row-major chunk grid; each chunk holds every
+                layer's chunk_size x chunk_size plane in layer table order,
+                zero padded past the map edge
+
+ChunkedMap maps the file read-only and pages chunks in on first touch: a
+chunk's planes are copied out (so set_tile() can change them) and its
+collision flags and encounter rule numbers are compiled for just those
+tiles. Resident chunks live in an LRU bounded by max_chunks, so memory does
+not grow with the world. Edits are kept as a sparse per-tile record and
+replayed when their chunk is paged back in, so an edited chunk can be
+evicted like any other. A 1-byte plane is widened to 2 bytes in memory when
+a tile id past 255 is written into it. ChunkedMap answers
+the CollisionGrid and EncounterTable queries (flags_at, is_walkable,
+box_blocked, rule_at, heatmap, rule_counts), and open_chunked_map() wraps
+it in a map dict whose layers index like the JSON lists (layer[ty][tx]).
+"""
+import array
+import json
+import mmap
+import struct
+import sys
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from world.collision import BLOCKED, ENCOUNTER, PORTAL, SOLID, TILE_FLAGS, TILE_SIZE
+from world.encounters import apply_rect_rules, match_rule, tile_rule, tile_rule_lookup
+
+MAGIC = b"CSFC"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIIHxxII")
+LAYER_ENTRY = struct.Struct("<16sBxxx")
+FORMATS = {1: "B", 2: "H"}
+CHUNK_SIZE = 32
+EXTENSION = ".chunks"
+
+SOLID_LOOKUP = bytes(TILE_FLAGS.get(tile, 0) for tile in range(256))
+
+
+def _align(offset: int, boundary: int = 8) -> int:
+    return (offset + boundary - 1) // boundary * boundary
+
+
+# ===== Writing =====
+
+class ChunkWriter:
+    """
+    Streams a map into a .chunks file one band of chunk_size map rows at a
+    time, so a generator never has to hold the whole world:
+
+        with ChunkWriter(path, meta, 1024, 1024) as writer:
+            for band in bands:          # {"ground": rows, "objects": rows}
+                writer.write_band(band)
+    """
+
+    def __init__(self, path: str, meta: Dict[str, Any], width: int, height: int,
+                 layers: Iterable[str] = ("ground", "objects"), itemsizes: Optional[Dict[str, int]] = None,
+                 chunk_size: int = CHUNK_SIZE):
+        self.width = width
+        self.height = height
+        self.chunk_size = chunk_size
+        self.layers = [(name, (itemsizes or {}).get(name, 1)) for name in layers]
+        self.cols = (width + chunk_size - 1) // chunk_size
+        self.band_rows = (height + chunk_size - 1) // chunk_size
+        self.bands_written = 0
+
+        meta = dict(meta, width=width, height=height)
+        meta.pop("layers", None)
+        meta_bytes = json.dumps(meta, separators=(",", ":")).encode("utf-8")
+        meta_offset = HEADER.size + LAYER_ENTRY.size * len(self.layers)
+
+        self._file = open(path, "wb")
+        self._file.write(HEADER.pack(MAGIC, VERSION, len(self.layers), width, height, chunk_size,
+                                     meta_offset, len(meta_bytes)))
+        for name, itemsize in self.layers:
+            self._file.write(LAYER_ENTRY.pack(name.encode("ascii")[:16], itemsize))
+        self._file.write(meta_bytes)
+        self._file.write(bytes(_align(meta_offset + len(meta_bytes)) - meta_offset - len(meta_bytes)))
+
+    def write_band(self, band: Dict[str, List[List[int]]]):
+        """Write the next chunk_size map rows (fewer for the last band) of every layer."""
+        cs = self.chunk_size
+        for cx in range(self.cols):
+            x0 = cx * cs
+            for name, itemsize in self.layers:
+                rows = band.get(name, [])
+                plane = array.array(FORMATS[itemsize], [0]) * (cs * cs)
+                for ly in range(min(cs, len(rows))):
+                    row = rows[ly][x0:x0 + cs]
+                    plane[ly * cs:ly * cs + len(row)] = array.array(FORMATS[itemsize], row)
+                if itemsize == 2 and sys.byteorder != "little":
+                    plane.byteswap()
+                self._file.write(plane.tobytes())
+        self.bands_written += 1
+
+    def close(self):
+        if self._file.closed:
+            return
+        # Bands never written stay zero (empty) chunks
+        empty = bytes(sum(itemsize for _, itemsize in self.layers) * self.chunk_size ** 2 * self.cols)
+        while self.bands_written < self.band_rows:
+            self._file.write(empty)
+            self.bands_written += 1
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_chunked_map(map_data: Dict[str, Any], path: str, chunk_size: int = CHUNK_SIZE):
+    """Write a JSON-shaped map dict as a chunk store."""
+    width = map_data.get("width", 16)
+    height = map_data.get("height", 16)
+    layers = map_data.get("layers", {})
+    itemsizes = {name: 1 if max((max(row, default=0) for row in rows), default=0) < 256 else 2
+                 for name, rows in layers.items()}
+    with ChunkWriter(path, map_data, width, height, list(layers), itemsizes, chunk_size) as writer:
+        for y0 in range(0, height, chunk_size):
+            writer.write_band({name: rows[y0:y0 + chunk_size] for name, rows in layers.items()})
+
+
+# ===== Reading =====
+
+class Chunk:
+    __slots__ = ("cx", "cy", "x0", "y0", "planes", "flags", "rules", "baked")
+
+    def __init__(self, cx: int, cy: int, x0: int, y0: int, planes: Dict[str, array.array]):
+        self.cx = cx
+        self.cy = cy
+        self.x0 = x0 # Map tile of the chunk's top-left corner
+        self.y0 = y0
+        self.planes = planes
+        self.flags = None # bytearray, CollisionGrid flag bits per tile
+        self.rules = None # array, EncounterTable rule numbers per tile
+        self.baked = None # BakedMap, set by MapSystem on first draw
+
+    def rows(self, size: int) -> Dict[str, List[memoryview]]:
+        """Layer rows of the chunk (memoryview slices), e.g. for BakedMap."""
+        return {name: [memoryview(plane)[ly * size:(ly + 1) * size] for ly in range(size)]
+                for name, plane in self.planes.items()}
+
+
+class ChunkedMap:
+    def __init__(self, path: str, max_chunks: int = 64):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, layer_count, width, height, chunk_size, meta_offset, meta_length = \
+            HEADER.unpack_from(self._mapped, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path}: not a chunked map")
+        if version != VERSION:
+            raise ValueError(f"{path}: unsupported chunked map version {version}")
+
+        self.width = width
+        self.height = height
+        self.chunk_size = chunk_size
+        self.cols = (width + chunk_size - 1) // chunk_size
+        self.rows_count = (height + chunk_size - 1) // chunk_size
+        self.meta = json.loads(bytes(self._mapped[meta_offset:meta_offset + meta_length]).decode("utf-8"))
+
+        self.layer_table: List[Tuple[str, int, int]] = [] # (name, itemsize, offset inside a chunk)
+        offset = 0
+        for i in range(layer_count):
+            raw_name, itemsize = LAYER_ENTRY.unpack_from(self._mapped, HEADER.size + i * LAYER_ENTRY.size)
+            self.layer_table.append((raw_name.rstrip(b"\0").decode("ascii"), itemsize, offset))
+            offset += itemsize * chunk_size * chunk_size
+        self.layer_names = [name for name, _, _ in self.layer_table]
+        self.chunk_bytes = offset
+        self.data_offset = _align(meta_offset + meta_length)
+
+        # Compiled once for every chunk
+        self.rules = self.meta.get("encounter_rules", [])
+        self.rates = [0.0] + [rule.get("rate", 0.0) for rule in self.rules]
+        self.flat_encounter = not self.rules and self.meta.get("encounter_rate", 0.0) > 0
+        self._rule_lookup = tile_rule_lookup(self.rules) if 0 < len(self.rules) < 256 else None
+        self._encounter_lookup = bytes(ENCOUNTER if number < len(self.rates) and self.rates[number] > 0 else 0
+                                       for number in range(256))
+        self.portals = {}
+        for portal in self.meta.get("portals", []):
+            px, py = portal.get("x", -1), portal.get("y", -1)
+            if 0 <= px < width and 0 <= py < height:
+                self.portals.setdefault((px // chunk_size, py // chunk_size), []).append((px, py))
+
+        self.max_chunks = max_chunks
+        self.prefetcher = None
+        self._prefetch_window = None
+        self.edits: Dict[Tuple[int, int], Dict[Tuple[str, int], int]] = {} # chunk -> {(layer, index): tile}
+        self.stats = {"loads": 0, "prefetched": 0, "evictions": 0}
+        self._chunks: "OrderedDict[Tuple[int, int], Chunk]" = OrderedDict() # LRU order
+
+    @property
+    def max_bytes(self) -> int:
+        """Upper bound of resident chunk data (planes, flags and rule numbers), before any widening."""
+        return self.max_chunks * (self.chunk_bytes + 2 * self.chunk_size * self.chunk_size)
+
+    # ===== Paging =====
+
+    def chunk(self, cx: int, cy: int) -> Chunk:
+        """A chunk by chunk coordinates, paged in on a miss."""
+        key = (cx, cy)
+        chunk = self._chunks.get(key)
+        if chunk is not None:
+            self._chunks.move_to_end(key)
+            return chunk
+        chunk = self.prefetcher.take(("chunk", self.path, key)) if self.prefetcher else None
+        if chunk is None:
+            chunk = self._read_chunk(cx, cy)
+        else:
+            self.stats["prefetched"] += 1
+        edits = self.edits.get(key)
+        if edits:
+            # Replayed here on the main thread, so a copy prefetched before an edit still gets it
+            for (layer, i), tile in edits.items():
+                self._store(chunk, layer, i, tile)
+            self._compile(chunk)
+        self.stats["loads"] += 1
+        self._chunks[key] = chunk
+        self._evict(keep=key)
+        return chunk
+
+    def chunks_in(self, x0: int, y0: int, x1: int, y1: int) -> List[Chunk]:
+        """Chunks covering map tiles [x0, x1) x [y0, y1), paged in as needed."""
+        cs = self.chunk_size
+        x0, y0 = max(0, x0), max(0, y0)
+        x1, y1 = min(self.width, x1), min(self.height, y1)
+        return [self.chunk(cx, cy)
+                for cy in range(y0 // cs, (y1 - 1) // cs + 1) if y1 > y0
+                for cx in range(x0 // cs, (x1 - 1) // cs + 1) if x1 > x0]
+
+    def prefetch_around(self, x0: int, y0: int, x1: int, y1: int, ring: int = 1) -> int:
+        """Queue background loads of non-resident chunks within `ring` chunks of a tile range."""
+        if self.prefetcher is None:
+            return 0
+        cs = self.chunk_size
+        window = (x0 // cs, y0 // cs, (x1 - 1) // cs, (y1 - 1) // cs, ring)
+        if window == self._prefetch_window:
+            return 0 # Same chunks as last frame, already requested
+        self._prefetch_window = window
+        queued = 0
+        for cy in range(max(0, y0 // cs - ring), min(self.rows_count, (y1 - 1) // cs + ring + 1)):
+            for cx in range(max(0, x0 // cs - ring), min(self.cols, (x1 - 1) // cs + ring + 1)):
+                if (cx, cy) not in self._chunks:
+                    queued += self.prefetcher.request(("chunk", self.path, (cx, cy)),
+                                                      lambda cx=cx, cy=cy: self._read_chunk(cx, cy))
+        return queued
+
+    def is_resident(self, cx: int, cy: int) -> bool:
+        return (cx, cy) in self._chunks
+
+    def resident(self) -> List[Tuple[int, int]]:
+        """Resident chunk coordinates, least recently used first."""
+        return list(self._chunks)
+
+    def _evict(self, keep=None):
+        while len(self._chunks) > self.max_chunks:
+            victim = next(key for key in self._chunks if key != keep)
+            del self._chunks[victim]
+            self.stats["evictions"] += 1
+
+    def _read_chunk(self, cx: int, cy: int) -> Chunk:
+        """Copy a chunk's planes out of the file and compile it. Thread-safe."""
+        cs = self.chunk_size
+        base = self.data_offset + (cy * self.cols + cx) * self.chunk_bytes
+        planes = {}
+        for name, itemsize, offset in self.layer_table:
+            plane = array.array(FORMATS[itemsize])
+            plane.frombytes(self._mapped[base + offset:base + offset + itemsize * cs * cs])
+            if itemsize == 2 and sys.byteorder != "little":
+                plane.byteswap()
+            planes[name] = plane
+        chunk = Chunk(cx, cy, cx * cs, cy * cs, planes)
+        self._compile(chunk)
+        return chunk
+
+    def _compile(self, chunk: Chunk):
+        cs = self.chunk_size
+        area = cs * cs
+        rules = self.rules
+        ground = chunk.planes.get("ground")
+        objects = chunk.planes.get("objects")
+
+        index = array.array("B" if len(rules) < 256 else "H", [0]) * area
+        if rules:
+            if self._rule_lookup is not None and ground is not None and ground.itemsize == 1:
+                index[:] = array.array("B", ground.tobytes().translate(self._rule_lookup))
+            elif ground is not None:
+                by_tile = {}
+                for i, tile in enumerate(ground):
+                    number = by_tile.get(tile)
+                    if number is None:
+                        number = by_tile[tile] = tile_rule(rules, tile)
+                    index[i] = number
+            apply_rect_rules(index, rules, cs, cs, chunk.x0, chunk.y0)
+        chunk.rules = index
+
+        if objects is None:
+            solid = bytes(area)
+        elif objects.itemsize == 1:
+            solid = objects.tobytes().translate(SOLID_LOOKUP)
+        else:
+            solid = bytes(TILE_FLAGS.get(tile, 0) for tile in objects)
+        if rules:
+            encounter = (index.tobytes().translate(self._encounter_lookup) if index.itemsize == 1 else
+                         bytes(ENCOUNTER if self.rates[number] > 0 else 0 for number in index))
+        else:
+            encounter = bytes([ENCOUNTER if self.flat_encounter else 0]) * area
+        flags = bytearray((int.from_bytes(solid, "little") | int.from_bytes(encounter, "little")).to_bytes(area, "little"))
+        for px, py in self.portals.get((chunk.cx, chunk.cy), ()):
+            flags[(py - chunk.y0) * cs + (px - chunk.x0)] |= PORTAL
+        chunk.flags = flags
+
+    # ===== Tiles =====
+
+    def tile(self, layer: str, tx: int, ty: int) -> int:
+        """Tile id of a layer; 0 outside the map or for unknown layers."""
+        if not (0 <= tx < self.width and 0 <= ty < self.height):
+            return 0
+        cs = self.chunk_size
+        chunk = self.chunk(tx // cs, ty // cs)
+        plane = chunk.planes.get(layer)
+        return plane[(ty - chunk.y0) * cs + (tx - chunk.x0)] if plane is not None else 0
+
+    @staticmethod
+    def _store(chunk: Chunk, layer: str, i: int, tile: int):
+        plane = chunk.planes[layer]
+        if tile > 0xFF and plane.itemsize == 1:
+            plane = chunk.planes[layer] = array.array("H", plane)
+        plane[i] = tile
+
+    def set_tile(self, layer: str, tx: int, ty: int, tile: int):
+        """Change one tile; the edit is recorded so it survives eviction."""
+        if not (0 <= tx < self.width and 0 <= ty < self.height):
+            return
+        if not 0 <= tile <= 0xFFFF:
+            raise ValueError(f"tile id {tile} does not fit a chunk plane (0..65535)")
+        cs = self.chunk_size
+        chunk = self.chunk(tx // cs, ty // cs)
+        i = (ty - chunk.y0) * cs + (tx - chunk.x0)
+        self._store(chunk, layer, i, tile)
+        self.edits.setdefault((chunk.cx, chunk.cy), {})[(layer, i)] = tile
+        self.refresh_tile(None, tx, ty)
+        if chunk.baked is not None:
+            chunk.baked.set_tile(layer, tx - chunk.x0, ty - chunk.y0, tile)
+
+    def refresh_tile(self, map_data, tx: int, ty: int):
+        """Recompute one tile's flags and rule (map_data is unused; CollisionGrid signature)."""
+        if not (0 <= tx < self.width and 0 <= ty < self.height):
+            return
+        cs = self.chunk_size
+        chunk = self.chunk(tx // cs, ty // cs)
+        i = (ty - chunk.y0) * cs + (tx - chunk.x0)
+        number = match_rule(self.rules, self.tile("ground", tx, ty), tx, ty)
+        chunk.rules[i] = number
+        value = TILE_FLAGS.get(self.tile("objects", tx, ty), 0)
+        if self.rates[number] > 0 or self.flat_encounter:
+            value |= ENCOUNTER
+        if (tx, ty) in self.portals.get((chunk.cx, chunk.cy), ()):
+            value |= PORTAL
+        chunk.flags[i] = value
+
+    # ===== Queries (CollisionGrid / EncounterTable) =====
+
+    def flags_at(self, tx: int, ty: int) -> int:
+        """Flags of a tile; everything outside the map counts as SOLID."""
+        if 0 <= tx < self.width and 0 <= ty < self.height:
+            cs = self.chunk_size
+            chunk = self.chunk(tx // cs, ty // cs)
+            return chunk.flags[(ty - chunk.y0) * cs + (tx - chunk.x0)]
+        return SOLID
+
+    def is_walkable(self, tx: int, ty: int) -> bool:
+        return not self.flags_at(tx, ty) & BLOCKED
+
+    def box_blocked(self, x: float, y: float, margin: int = 4, size: int = TILE_SIZE) -> bool:
+        """Same contract as CollisionGrid.box_blocked()."""
+        x0 = int((x + margin) // TILE_SIZE)
+        y0 = int((y + margin) // TILE_SIZE)
+        x1 = int((x + size - margin) // TILE_SIZE)
+        y1 = int((y + size - margin) // TILE_SIZE)
+        if x0 < 0 or y0 < 0 or x1 >= self.width or y1 >= self.height:
+            return True
+        flags_at = self.flags_at
+        return bool((flags_at(x0, y0) | flags_at(x1, y0) | flags_at(x0, y1) | flags_at(x1, y1)) & BLOCKED)
+
+    def rule_at(self, tx: int, ty: int) -> Optional[Dict[str, Any]]:
+        """The encounter rule in effect on a tile (None if no rule matches)."""
+        if 0 <= tx < self.width and 0 <= ty < self.height:
+            cs = self.chunk_size
+            chunk = self.chunk(tx // cs, ty // cs)
+            number = chunk.rules[(ty - chunk.y0) * cs + (tx - chunk.x0)]
+        else:
+            number = match_rule(self.rules, 0, tx, ty)
+        return self.rules[number - 1] if number else None
+
+    def rate_at(self, tx: int, ty: int) -> float:
+        rule = self.rule_at(tx, ty)
+        return rule.get("rate", 0.0) if rule else 0.0
+
+    def _bands(self):
+        """(ty, chunk row) per band of chunks, paged in one band at a time."""
+        cs = self.chunk_size
+        for cy in range(self.rows_count):
+            yield cy * cs, [self.chunk(cx, cy) for cx in range(self.cols)]
+
+    def heatmap(self) -> Iterable[List[float]]:
+        """Effective encounter rate per tile, as rows (generated band by band)."""
+        cs, width = self.chunk_size, self.width
+        rates = self.rates
+        for y0, band in self._bands():
+            for ly in range(min(cs, self.height - y0)):
+                row = []
+                for chunk in band:
+                    start = ly * cs
+                    row.extend(rates[number] for number in chunk.rules[start:start + min(cs, width - chunk.x0)])
+                yield row
+
+    def rule_counts(self) -> List[int]:
+        """Tiles governed by each rule; element 0 counts tiles with no rule."""
+        cs, width = self.chunk_size, self.width
+        counts = [0] * (len(self.rules) + 1)
+        for y0, band in self._bands():
+            for ly in range(min(cs, self.height - y0)):
+                for chunk in band:
+                    start = ly * cs
+                    for number in chunk.rules[start:start + min(cs, width - chunk.x0)]:
+                        counts[number] += 1
+        return counts
+
+
+class ChunkedRow:
+    __slots__ = ("chunked", "layer", "ty")
+
+    def __init__(self, chunked: ChunkedMap, layer: str, ty: int):
+        self.chunked = chunked
+        self.layer = layer
+        self.ty = ty
+
+    def __len__(self):
+        return self.chunked.width
+
+    def __getitem__(self, tx: int) -> int:
+        if not 0 <= tx < self.chunked.width:
+            raise IndexError(tx)
+        return self.chunked.tile(self.layer, tx, self.ty)
+
+    def __setitem__(self, tx: int, tile: int):
+        if not 0 <= tx < self.chunked.width:
+            raise IndexError(tx)
+        self.chunked.set_tile(self.layer, tx, self.ty, tile)
+
+    def __iter__(self):
+        for tx in range(self.chunked.width):
+            yield self.chunked.tile(self.layer, tx, self.ty)
+
+
+class ChunkedLayer:
+    """One layer of a ChunkedMap, indexable as layer[ty][tx] like the JSON lists."""
+    __slots__ = ("chunked", "layer")
+
+    def __init__(self, chunked: ChunkedMap, layer: str):
+        self.chunked = chunked
+        self.layer = layer
+
+    def __len__(self):
+        return self.chunked.height
+
+    def __getitem__(self, ty: int) -> ChunkedRow:
+        if not 0 <= ty < self.chunked.height:
+            raise IndexError(ty)
+        return ChunkedRow(self.chunked, self.layer, ty)
+
+    def __iter__(self):
+        for ty in range(self.chunked.height):
+            yield ChunkedRow(self.chunked, self.layer, ty)
+
+
+def open_chunked_map(path: str, max_chunks: int = 64) -> Dict[str, Any]:
+    """A map dict backed by a ChunkedMap (under "chunks")."""
+    chunked = ChunkedMap(path, max_chunks)
+    map_data = dict(chunked.meta)
+    map_data["layers"] = {name: ChunkedLayer(chunked, name) for name in chunked.layer_names}
+    map_data["chunks"] = chunked
+    return map_data
@@ -0,0 +1,162 @@
+"""
+Per-map collision grid.
+
+Each map is compiled once into a flat bytearray of per-tile flag bits
+(row-major, width * height). Collision, NPC wandering and pathfinding query
+the grid instead of the nested layer lists: one index and one bit test per
+point, no list indexing, bounds juggling over ragged rows, or allocation.
+"""
+from typing import Any, Dict
+
+# ===== Tile flags =====
+SOLID = 0x01
+WATER = 0x02
+ENCOUNTER = 0x04 # Some encounter rule with a non-zero rate applies here
+PORTAL = 0x08
+
+BLOCKED = SOLID | WATER
+
+# Object-layer tile id -> flags (matches gen_pixel_art.py: 1=wall, 2=water, 6=mountain)
+TILE_FLAGS = {
+    1: SOLID,
+    2: WATER,
+    6: SOLID
+}
+
+TILE_SIZE = 16
+
+
+def _encounter_possible(map_data: Dict[str, Any], tile_id: int, tx: int, ty: int) -> bool:
+    """Mirror of MapSystem.check_encounter's rule matching: first matching rule wins."""
+    rules = map_data.get("encounter_rules", [])
+    if not rules:
+        return map_data.get("encounter_rate", 0.0) > 0
+    for rule in rules:
+        rule_type = rule.get("type", "global")
+        if rule_type == "global":
+            matched = True
+        elif rule_type == "tile":
+            matched = tile_id in rule.get("tile_ids", [])
+        elif rule_type == "rect":
+            matched = (rule.get("x", 0) <= tx < rule.get("x", 0) + rule.get("w", 0) and
+                       rule.get("y", 0) <= ty < rule.get("y", 0) + rule.get("h", 0))
+        else:
+            matched = False
+        if matched:
+            return rule.get("rate", 0.0) > 0
+    return False
+
+
+class CollisionGrid:
+    __slots__ = ("width", "height", "flags")
+
+    def __init__(self, width: int, height: int, flags: bytearray = None):
+        self.width = width
+        self.height = height
+        self.flags = flags if flags is not None else bytearray(width * height)
+
+    @classmethod
+    def from_map(cls, map_data: Dict[str, Any]) -> "CollisionGrid":
+        width = map_data.get("width", 16)
+        height = map_data.get("height", 16)
+        grid = cls._from_planes(map_data, width, height)
+        if grid is not None:
+            return grid
+        grid = cls(width, height)
+        flags = grid.flags
+        layers = map_data.get("layers", {})
+        objects = layers.get("objects", [])
+        ground = layers.get("ground", [])
+
+        for ty in range(height):
+            obj_row = objects[ty] if ty < len(objects) else ()
+            ground_row = ground[ty] if ty < len(ground) else ()
+            base = ty * width
+            for tx in range(width):
+                value = TILE_FLAGS.get(obj_row[tx], 0) if tx < len(obj_row) else 0
+                ground_id = ground_row[tx] if tx < len(ground_row) else 0
+                if _encounter_possible(map_data, ground_id, tx, ty):
+                    value |= ENCOUNTER
+                flags[base + tx] = value
+
+        for portal in map_data.get("portals", []):
+            px, py = portal.get("x", -1), portal.get("y", -1)
+            if 0 <= px < width and 0 <= py < height:
+                flags[py * width + px] |= PORTAL
+        return grid
+
+    @classmethod
+    def _from_planes(cls, map_data: Dict[str, Any], width: int, height: int):
+        """
+        Fast path for binary maps with uint8 planes: per-tile-id lookup tables
+        applied with bytes.translate(). None when not applicable (JSON
+        layers, uint16 planes or position-dependent 'rect' encounter rules).
+        """
+        layers = map_data.get("layers", {})
+        objects = getattr(layers.get("objects"), "plane", None)
+        ground = getattr(layers.get("ground"), "plane", None)
+        if objects is None or ground is None or objects.itemsize != 1 or ground.itemsize != 1:
+            return None
+        if any(rule.get("type") == "rect" for rule in map_data.get("encounter_rules", [])):
+            return None
+
+        solid_table = bytes(TILE_FLAGS.get(tile, 0) for tile in range(256))
+        encounter_table = bytes(ENCOUNTER if _encounter_possible(map_data, tile, 0, 0) else 0 for tile in range(256))
+        size = width * height
+        combined = (int.from_bytes(bytes(objects).translate(solid_table), "little") |
+                    int.from_bytes(bytes(ground).translate(encounter_table), "little"))
+        flags = bytearray(combined.to_bytes(size, "little"))
+
+        for portal in map_data.get("portals", []):
+            px, py = portal.get("x", -1), portal.get("y", -1)
+            if 0 <= px < width and 0 <= py < height:
+                flags[py * width + px] |= PORTAL
+        return cls(width, height, flags)
+
+    def refresh_tile(self, map_data: Dict[str, Any], tx: int, ty: int):
+        """Recompute one tile's flags after its layer data changed."""
+        if not (0 <= tx < self.width and 0 <= ty < self.height):
+            return
+        layers = map_data.get("layers", {})
+        objects = layers.get("objects", [])
+        ground = layers.get("ground", [])
+        obj_row = objects[ty] if ty < len(objects) else ()
+        ground_row = ground[ty] if ty < len(ground) else ()
+        value = TILE_FLAGS.get(obj_row[tx], 0) if tx < len(obj_row) else 0
+        if _encounter_possible(map_data, ground_row[tx] if tx < len(ground_row) else 0, tx, ty):
+            value |= ENCOUNTER
+        if any(p.get("x") == tx and p.get("y") == ty for p in map_data.get("portals", [])):
+            value |= PORTAL
+        self.flags[ty * self.width + tx] = value
+
+    # ===== Queries =====
+
+    def flags_at(self, tx: int, ty: int) -> int:
+        """Flags of a tile; everything outside the map counts as SOLID."""
+        if 0 <= tx < self.width and 0 <= ty < self.height:
+            return self.flags[ty * self.width + tx]
+        return SOLID
+
+    def is_walkable(self, tx: int, ty: int) -> bool:
+        return not self.flags_at(tx, ty) & BLOCKED
+
+    def box_blocked(self, x: float, y: float, margin: int = 4, size: int = TILE_SIZE) -> bool:
+        """
+        True if any corner of the (size - 2*margin) box inside the sprite at
+        pixel (x, y) is outside the map or on a blocking tile.
+        """
+        x0 = int((x + margin) // TILE_SIZE)
+        y0 = int((y + margin) // TILE_SIZE)
+        x1 = int((x + size - margin) // TILE_SIZE)
+        y1 = int((y + size - margin) // TILE_SIZE)
+        width = self.width
+        if x0 < 0 or y0 < 0 or x1 >= width or y1 >= self.height:
+            return True
+        flags = self.flags
+        row0 = y0 * width
+        row1 = y1 * width
+        return bool((flags[row0 + x0] | flags[row0 + x1] | flags[row1 + x0] | flags[row1 + x1]) & BLOCKED)
+
+    def count(self, mask: int) -> int:
+        """Number of tiles with any of the given flag bits set."""
+        return sum(1 for value in self.flags if value & mask)
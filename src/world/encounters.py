@@ -0,0 +1,148 @@
+"""
+Per-map encounter table.
+
+A map's encounter_rules are compiled once into a flat per-tile grid of rule
+numbers (row-major, width * height; 0 = no rule, n = encounter_rules[n - 1]).
+The grid honours MapSystem's first-match semantics: a tile gets the earliest
+rule that matches it, whether that rule is global, by ground tile id or by
+rect. An encounter check is then one grid lookup plus one RNG draw.
+
+The same table gives the effective encounter rate of every tile, which
+tools/encounter_heatmap.py exports for map designers.
+"""
+import array
+from typing import Any, Dict, List, Optional
+
+
+def _matches(rule: Dict[str, Any], tile_id: int, tx: int, ty: int) -> bool:
+    rule_type = rule.get("type", "global")
+    if rule_type == "global":
+        return True
+    if rule_type == "tile":
+        return tile_id in rule.get("tile_ids", [])
+    if rule_type == "rect":
+        return (rule.get("x", 0) <= tx < rule.get("x", 0) + rule.get("w", 0) and
+                rule.get("y", 0) <= ty < rule.get("y", 0) + rule.get("h", 0))
+    return False
+
+
+def match_rule(rules: List[Dict[str, Any]], tile_id: int, tx: int, ty: int) -> int:
+    """Rule number (1-based) of the first rule matching a tile; 0 if none."""
+    for number, rule in enumerate(rules, 1):
+        if _matches(rule, tile_id, tx, ty):
+            return number
+    return 0
+
+
+def tile_rule(rules: List[Dict[str, Any]], tile_id: int) -> int:
+    """First matching global/tile rule for a ground tile id, ignoring rect rules."""
+    for number, rule in enumerate(rules, 1):
+        if rule.get("type", "global") != "rect" and _matches(rule, tile_id, 0, 0):
+            return number
+    return 0
+
+
+def tile_rule_lookup(rules: List[Dict[str, Any]]) -> bytes:
+    """tile_rule() for tile ids 0-255 as a bytes.translate() table (< 256 rules)."""
+    return bytes(tile_rule(rules, tile) for tile in range(256))
+
+
+def apply_rect_rules(index, rules: List[Dict[str, Any]], width: int, height: int, ox: int = 0, oy: int = 0):
+    """
+    Let rect rules claim the tiles of a width x height window at map tile
+    (ox, oy) wherever they come before the tile's current rule.
+    """
+    for number, rule in enumerate(rules, 1):
+        if rule.get("type", "global") != "rect":
+            continue
+        x0 = max(0, rule.get("x", 0) - ox)
+        y0 = max(0, rule.get("y", 0) - oy)
+        x1 = min(width, rule.get("x", 0) + rule.get("w", 0) - ox)
+        y1 = min(height, rule.get("y", 0) + rule.get("h", 0) - oy)
+        for ty in range(y0, y1):
+            base = ty * width
+            for i in range(base + x0, base + x1):
+                current = index[i]
+                if current == 0 or current > number:
+                    index[i] = number
+
+
+class EncounterTable:
+    __slots__ = ("width", "height", "rules", "index")
+
+    def __init__(self, width: int, height: int, rules: List[Dict[str, Any]], index=None):
+        self.width = width
+        self.height = height
+        self.rules = rules
+        if index is None:
+            index = array.array("B" if len(rules) < 256 else "H", [0]) * (width * height)
+        self.index = index
+
+    @classmethod
+    def from_map(cls, map_data: Dict[str, Any]) -> "EncounterTable":
+        width = map_data.get("width", 16)
+        height = map_data.get("height", 16)
+        rules = map_data.get("encounter_rules", [])
+        table = cls(width, height, rules)
+        if not rules:
+            return table
+        index = table.index
+        ground = map_data.get("layers", {}).get("ground", [])
+
+        # Position-independent rules resolve per ground tile id
+        plane = getattr(ground, "plane", None)
+        if plane is not None and plane.itemsize == 1 and index.itemsize == 1:
+            index[:] = array.array("B", bytes(plane).translate(tile_rule_lookup(rules)))
+        else:
+            by_tile = {}
+            for ty in range(height):
+                row = ground[ty] if ty < len(ground) else ()
+                base = ty * width
+                for tx in range(width):
+                    tile = row[tx] if tx < len(row) else 0
+                    number = by_tile.get(tile)
+                    if number is None:
+                        number = by_tile[tile] = tile_rule(rules, tile)
+                    index[base + tx] = number
+
+        # Rect rules win wherever they come before the tile's current rule
+        apply_rect_rules(index, rules, width, height)
+        return table
+
+    def refresh_tile(self, map_data: Dict[str, Any], tx: int, ty: int):
+        """Recompute one tile's rule after its ground tile changed."""
+        if not (0 <= tx < self.width and 0 <= ty < self.height):
+            return
+        ground = map_data.get("layers", {}).get("ground", [])
+        row = ground[ty] if ty < len(ground) else ()
+        tile = row[tx] if tx < len(row) else 0
+        self.index[ty * self.width + tx] = match_rule(self.rules, tile, tx, ty)
+
+    # ===== Queries =====
+
+    def rule_at(self, tx: int, ty: int) -> Optional[Dict[str, Any]]:
+        """The rule in effect on a tile (None if no rule matches)."""
+        if 0 <= tx < self.width and 0 <= ty < self.height:
+            number = self.index[ty * self.width + tx]
+        else:
+            # Off-map positions see ground tile 0, as check_encounter always did
+            number = match_rule(self.rules, 0, tx, ty)
+        return self.rules[number - 1] if number else None
+
+    def rate_at(self, tx: int, ty: int) -> float:
+        rule = self.rule_at(tx, ty)
+        return rule.get("rate", 0.0) if rule else 0.0
+
+    def heatmap(self) -> List[List[float]]:
+        """Effective encounter rate per tile, as rows."""
+        rates = [0.0] + [rule.get("rate", 0.0) for rule in self.rules]
+        index = self.index
+        width = self.width
+        return [[rates[number] for number in index[ty * width:(ty + 1) * width]] for ty in range(self.height)]
+
+    def rule_counts(self) -> List[int]:
+        """Tiles governed by each rule; element 0 counts tiles with no rule."""
+        counts = [0] * (len(self.rules) + 1)
+        for number in self.index:
+            counts[number] += 1
+        return counts
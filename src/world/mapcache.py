@@ -0,0 +1,210 @@
+"""
+Lazy map storage.
+
+Only assets/data/maps/index.json is read at boot. Map files are loaded on
+first access and kept in a bounded LRU cache, limited by map count and by
+total size. A map's size is the estimated memory of its decoded layers:
+width x height x layers x the cost of one stored tile (a list slot for
+JSON rows, the plane's item size for a .bin), not its file size. A map's
+.bin container (world.mapformat) is used instead of its JSON when present and up to date. Chunk stores
+(world.chunks) page their own tiles in and out; they count with their
+resident-chunk bound and may be listed in the index directly (for worlds
+too large for JSON) or sit next to a JSON map like a .bin. Pinned maps (e.g. mutated ones) are never
+evicted.
+
+MapCache is dict-like (``in``, ``[]``, ``get``), so MapSystem.map_data can
+be one: ``map_id in cache`` asks the index, and reading an entry faults the
+map in. With a Prefetcher attached, prefetch() reads and decodes maps (plus
+whatever ``derive`` builds from them) on the worker thread and a later miss
+takes the finished result instead of touching the disk.
+"""
+import json
+import os
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+from world import chunks
+from world.mapformat import PlaneRows, read_binary_map
+
+LIST_TILE_BYTES = 8 # One list slot per tile; tile ints below 257 are shared objects
+
+
+def decoded_size(map_data: Dict[str, Any]) -> int:
+    """Estimated memory of a map's decoded layers (width x height x layers x tile cost)."""
+    tiles = map_data.get("width", 16) * map_data.get("height", 16)
+    size = 0
+    for rows in map_data.get("layers", {}).values():
+        size += tiles * (rows.plane.itemsize if isinstance(rows, PlaneRows) else LIST_TILE_BYTES)
+    return size
+
+
+class MapCache:
+    def __init__(self, maps_dir: str, max_maps: int = 4, max_bytes: int = 2 << 20,
+                 on_load: Optional[Callable[[int, Dict[str, Any], Dict[str, Any]], None]] = None,
+                 on_evict: Optional[Callable[[int], None]] = None,
+                 derive: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None):
+        self.maps_dir = maps_dir
+        self.max_maps = max_maps
+        self.max_bytes = max_bytes
+        self.on_load = on_load
+        self.on_evict = on_evict
+        self.derive = derive # map data -> derived structures, passed to on_load
+        self.prefetcher = None
+        self.prefer_binary = True # Use <map>.bin / <map>.chunks (tools/convert_maps.py) when up to date
+        self.max_chunks = 64 # Resident chunks per chunked map
+        self.entries: Dict[int, Dict[str, Any]] = {} # map_id -> index entry
+        self.pinned = set()
+        self.bytes = 0
+        self.stats = {"hits": 0, "misses": 0, "prefetched": 0, "evictions": 0}
+        self._cache: "OrderedDict[int, Any]" = OrderedDict() # map_id -> (data, size), LRU order
+
+    # ===== Index =====
+
+    def load_index(self) -> List[Dict[str, Any]]:
+        """Read index.json (and drop anything cached from a previous index)."""
+        index_path = os.path.join(self.maps_dir, "index.json")
+        with open(index_path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        self.clear()
+        if self.prefetcher:
+            self.prefetcher.clear()
+        self.entries = {entry["id"]: entry for entry in index.get("maps", [])}
+        return list(self.entries.values())
+
+    def name(self, map_id: int, default: Optional[str] = None) -> Optional[str]:
+        """Map name from the index, without loading the map."""
+        entry = self.entries.get(map_id)
+        return entry.get("name", default) if entry else default
+
+    def path(self, map_id: int) -> str:
+        return os.path.join(self.maps_dir, self.entries[map_id]["file"])
+
+    # ===== Dict-like access =====
+
+    def __contains__(self, map_id) -> bool:
+        return map_id in self.entries
+
+    def __getitem__(self, map_id) -> Dict[str, Any]:
+        data = self.get(map_id)
+        if data is None:
+            raise KeyError(map_id)
+        return data
+
+    def __len__(self):
+        return len(self.entries)
+
+    def keys(self):
+        return self.entries.keys()
+
+    def get(self, map_id, default=None):
+        """Map data, loading it on a miss; default if unknown or missing on disk."""
+        cached = self._cache.get(map_id)
+        if cached is not None:
+            self.stats["hits"] += 1
+            self._cache.move_to_end(map_id)
+            return cached[0]
+        if map_id not in self.entries:
+            return default
+
+        self.stats["misses"] += 1
+        loaded = self.prefetcher.take(("map", map_id)) if self.prefetcher else None
+        if loaded is None:
+            loaded = self.read(map_id)
+            if loaded is None:
+                return default
+        else:
+            self.stats["prefetched"] += 1
+        data, size, derived = loaded
+        self.put(map_id, data, size, derived)
+        return data
+
+    def binary_path(self, map_id: int, ext: str = ".bin") -> Optional[str]:
+        """The map's .bin (or other ext) container if present and not older than its JSON."""
+        path = self.path(map_id)
+        binary = os.path.splitext(path)[0] + ext
+        if not os.path.exists(binary):
+            return None
+        if os.path.exists(path) and os.path.getmtime(binary) < os.path.getmtime(path):
+            return None # Stale: the JSON was edited after conversion
+        return binary
+
+    def read(self, map_id: int):
+        """
+        (data, size, derived) from disk, preferring the binary container;
+        None if the map file is missing. Thread-safe.
+        """
+        path = self.path(map_id)
+        chunk_store = path if path.endswith(chunks.EXTENSION) else None
+        if chunk_store is None and self.prefer_binary:
+            chunk_store = self.binary_path(map_id, chunks.EXTENSION)
+        binary = self.binary_path(map_id) if self.prefer_binary and chunk_store is None else None
+        if chunk_store is not None:
+            if not os.path.exists(chunk_store):
+                return None
+            data = chunks.open_chunked_map(chunk_store, self.max_chunks)
+            size = data["chunks"].max_bytes
+        elif binary is not None:
+            data = read_binary_map(binary)
+            size = decoded_size(data)
+        else:
+            if not os.path.exists(path):
+                return None
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            size = decoded_size(data)
+        derived = self.derive(data) if self.derive else {}
+        return data, size, derived
+
+    def prefetch(self, map_ids) -> int:
+        """Queue background loads for known, non-resident maps; returns how many."""
+        if self.prefetcher is None:
+            return 0
+        queued = 0
+        for map_id in map_ids:
+            if map_id in self.entries and map_id not in self._cache:
+                queued += self.prefetcher.request(("map", map_id), lambda mid=map_id: self.read(mid))
+        return queued
+
+    # ===== Cache management =====
+
+    def is_loaded(self, map_id) -> bool:
+        return map_id in self._cache
+
+    def loaded(self) -> List[int]:
+        """Resident map ids, least recently used first."""
+        return list(self._cache)
+
+    def put(self, map_id: int, data: Dict[str, Any], size: int, derived: Optional[Dict[str, Any]] = None):
+        """Insert an already-decoded map as most recently used."""
+        if map_id in self._cache:
+            self.bytes -= self._cache.pop(map_id)[1]
+        self._cache[map_id] = (data, size)
+        self.bytes += size
+        if self.on_load:
+            self.on_load(map_id, data, derived or {})
+        self._evict(keep=map_id)
+
+    def pin(self, map_id: int):
+        self.pinned.add(map_id)
+
+    def unpin(self, map_id: int):
+        self.pinned.discard(map_id)
+        self._evict()
+
+    def _evict(self, keep: Optional[int] = None):
+        while len(self._cache) > self.max_maps or (self.bytes > self.max_bytes and len(self._cache) > 1):
+            victim = next((mid for mid in self._cache if mid != keep and mid not in self.pinned), None)
+            if victim is None:
+                return
+            self.bytes -= self._cache.pop(victim)[1]
+            self.stats["evictions"] += 1
+            if self.on_evict:
+                self.on_evict(victim)
+
+    def clear(self):
+        for map_id in list(self._cache):
+            if self.on_evict:
+                self.on_evict(map_id)
+        self._cache.clear()
+        self.pinned.clear()
+        self.bytes = 0
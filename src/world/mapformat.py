@@ -0,0 +1,131 @@
+"""
+Binary map container (.bin next to the map's .json).
+
+Layout (little-endian):
+
+    header      <4sHHIIII   magic b"CSFM", version, layer count,
+                            width, height, metadata offset, metadata length
+    layer table <16sBxxxII  per layer: name, bytes per tile (1 = uint8,
+                            2 = uint16), plane offset, plane length
+    metadata    UTF-8 JSON  everything except "layers" (id, name, portals,
+                            encounter rules, ...)
+    planes      raw row-major tile planes, 8-byte aligned
+
+read_binary_map() mmaps the file copy-on-write and returns the same dict
+shape as the JSON maps. Each layer is a PlaneRows list of per-row
+memoryview slices over the mapping: rows index like the JSON lists
+(layer[ty][tx]) without copying or creating Python ints per tile. The
+mapping is private, so MapSystem.set_tile() writes never reach the file.
+"""
+import array
+import json
+import mmap
+import struct
+import sys
+from typing import Any, Dict, List
+
+MAGIC = b"CSFM"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIIII")
+LAYER_ENTRY = struct.Struct("<16sBxxxII")
+FORMATS = {1: "B", 2: "H"}
+
+
+class PlaneRows(list):
+    """Rows of one layer (memoryview slices) plus the flat plane behind them."""
+
+    def __init__(self, rows, plane: memoryview, width: int, height: int):
+        super().__init__(rows)
+        self.plane = plane
+        self.width = width
+        self.height = height
+
+    def as_numpy(self):
+        """(height, width) NumPy view of the plane (needs numpy, no copy)."""
+        import numpy
+        return numpy.frombuffer(self.plane, dtype=numpy.uint8 if self.plane.itemsize == 1 else numpy.uint16) \
+            .reshape(self.height, self.width)
+
+
+def _align(offset: int, boundary: int = 8) -> int:
+    return (offset + boundary - 1) // boundary * boundary
+
+
+def write_binary_map(map_data: Dict[str, Any], path: str):
+    """Write a JSON-shaped map dict as a binary container."""
+    width = map_data.get("width", 16)
+    height = map_data.get("height", 16)
+    layers = map_data.get("layers", {})
+    meta = json.dumps({k: v for k, v in map_data.items() if k != "layers"}, separators=(",", ":")).encode("utf-8")
+
+    planes = []
+    for name, rows in layers.items():
+        flat = [0] * (width * height)
+        for ty in range(min(height, len(rows))):
+            row = rows[ty]
+            n = min(width, len(row))
+            flat[ty * width:ty * width + n] = row[:n]
+        itemsize = 1 if max(flat, default=0) < 256 else 2
+        values = array.array(FORMATS[itemsize], flat)
+        if itemsize == 2 and sys.byteorder != "little":
+            values.byteswap()
+        data = values.tobytes()
+        planes.append((name, itemsize, data))
+
+    offset = HEADER.size + LAYER_ENTRY.size * len(planes)
+    meta_offset = offset
+    offset = _align(offset + len(meta))
+    table = []
+    for name, itemsize, data in planes:
+        table.append(LAYER_ENTRY.pack(name.encode("ascii")[:16], itemsize, offset, len(data)))
+        offset = _align(offset + len(data))
+
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(planes), width, height, meta_offset, len(meta)))
+        for entry in table:
+            f.write(entry)
+        f.write(meta)
+        for (_, _, data), entry in zip(planes, table):
+            f.seek(LAYER_ENTRY.unpack(entry)[2])
+            f.write(data)
+
+
+def read_binary_map(path: str) -> Dict[str, Any]:
+    """mmap a binary map and return it as a map dict with zero-copy layer rows."""
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+
+    magic, version, layer_count, width, height, meta_offset, meta_length = HEADER.unpack_from(mapped, 0)
+    if magic != MAGIC:
+        raise ValueError(f"{path}: not a binary map")
+    if version != VERSION:
+        raise ValueError(f"{path}: unsupported binary map version {version}")
+
+    map_data = json.loads(bytes(mapped[meta_offset:meta_offset + meta_length]).decode("utf-8"))
+    view = memoryview(mapped)
+    layers = {}
+    for i in range(layer_count):
+        raw_name, itemsize, offset, length = LAYER_ENTRY.unpack_from(mapped, HEADER.size + i * LAYER_ENTRY.size)
+        name = raw_name.rstrip(b"\0").decode("ascii")
+        plane = view[offset:offset + length]
+        if itemsize == 2:
+            if sys.byteorder != "little":
+                # Planes are little-endian; big-endian hosts get a swapped copy
+                swapped = array.array("H", bytes(plane))
+                swapped.byteswap()
+                plane = memoryview(swapped)
+            else:
+                plane = plane.cast("H")
+        layers[name] = PlaneRows((plane[ty * width:(ty + 1) * width] for ty in range(height)), plane, width, height)
+    map_data["layers"] = layers
+    return map_data
+
+
+def layer_planes(map_data: Dict[str, Any]) -> Dict[str, memoryview]:
+    """Flat planes of a binary-loaded map (empty for JSON maps)."""
+    return {name: rows.plane for name, rows in map_data.get("layers", {}).items() if isinstance(rows, PlaneRows)}
+
+
+def to_lists(map_data: Dict[str, Any]) -> Dict[str, List[List[int]]]:
+    """Layer rows as plain lists (for comparisons and JSON export)."""
+    return {name: [list(row) for row in rows] for name, rows in map_data.get("layers", {}).items()}
@@ -0,0 +1,89 @@
+"""
+NPC definitions and per-map runtime state.
+
+NpcRepository reads assets/data/npcs/index.json once and parses each map's
+NPC file at most once, into NpcRecords. enter(map_id) hands out that map's
+runtime NPC records: built from the definitions on the first visit and
+kept in an overlay afterwards, so walking back through a portal is a
+dictionary lookup and NPC positions, opened chests and changed dialog
+survive leaving the map.
+"""
+import json
+import os
+import threading
+from typing import Dict, List, Optional
+
+from world.records import NpcRecord
+
+
+class NpcRepository:
+    def __init__(self, npcs_dir: str):
+        self.npcs_dir = npcs_dir
+        self.files: Optional[Dict[int, str]] = None # map_id -> file name, from index.json
+        self.definitions: Dict[int, List[NpcRecord]] = {} # map_id -> parsed NPC list (read-only)
+        self.overlay: Dict[int, List[NpcRecord]] = {} # map_id -> runtime NPC records
+        self._lock = threading.Lock()
+
+    # ===== Index =====
+
+    def load_index(self) -> Dict[int, str]:
+        """map_id -> NPC file name. Read once; without an index, map_<id>_npcs.json is assumed."""
+        with self._lock:
+            if self.files is None:
+                index_path = os.path.join(self.npcs_dir, "index.json")
+                if os.path.exists(index_path):
+                    with open(index_path, 'r', encoding='utf-8') as f:
+                        index = json.load(f)
+                    self.files = {entry["map_id"]: entry["file"] for entry in index.get("npc_files", [])}
+                else:
+                    self.files = {}
+            return self.files
+
+    def path(self, map_id: int) -> Optional[str]:
+        files = self.load_index()
+        if files:
+            name = files.get(map_id)
+            return os.path.join(self.npcs_dir, name) if name else None
+        return os.path.join(self.npcs_dir, f"map_{map_id}_npcs.json")
+
+    # ===== Definitions =====
+
+    def read(self, map_id: int) -> Optional[List[NpcRecord]]:
+        """NPC records of a map from disk, or None if it has no NPC file. Thread-safe."""
+        path = self.path(map_id)
+        if path is None or not os.path.exists(path):
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return [NpcRecord.from_dict(npc) for npc in json.load(f).get("npcs", [])]
+
+    def is_cached(self, map_id: int) -> bool:
+        return map_id in self.definitions or map_id in self.overlay
+
+    def put(self, map_id: int, npcs: Optional[List[NpcRecord]]):
+        """Store definitions read elsewhere (e.g. on the prefetch worker)."""
+        self.definitions[map_id] = npcs if npcs is not None else []
+
+    def get_definitions(self, map_id: int) -> List[NpcRecord]:
+        npcs = self.definitions.get(map_id)
+        if npcs is None:
+            npcs = self.definitions[map_id] = self.read(map_id) or []
+        return npcs
+
+    # ===== Runtime overlay =====
+
+    def enter(self, map_id: int) -> List[NpcRecord]:
+        """
+        Runtime NPC records of a map. The first visit copies the definitions
+        (remembering each NPC's origin); later visits return the same records.
+        """
+        npcs = self.overlay.get(map_id)
+        if npcs is not None:
+            return npcs
+        npcs = []
+        for definition in self.get_definitions(map_id):
+            npc = definition.clone()
+            npc.origin_x = npc.x
+            npc.origin_y = npc.y
+            npcs.append(npc)
+        self.overlay[map_id] = npcs
+        return npcs
@@ -0,0 +1,175 @@
+"""
+Array-backed NPC columns.
+
+NpcStore keeps the per-NPC numbers the wander update needs (position,
+origin, flags, sprite) in parallel array.array columns indexed like
+NpcSystem.active_npcs. wander() moves a set of NPCs in one batched pass:
+one RNG call for all of them, range and bounds limits, the player box and
+the collision grid. With NumPy installed, large batches run as whole-array
+operations straight over the columns and the grid's flag bytes; without
+it, the same pass runs as a tight Python loop. Both give identical results
+for the same random state.
+
+The NPC records stay the owners of everything else (dialog, chest state);
+NpcSystem copies positions back for the NPCs that moved.
+"""
+import array
+import random
+from typing import List, Optional
+
+from world.collision import BLOCKED, TILE_SIZE
+from world.records import NpcRecord
+
+try:
+    import numpy
+except ImportError: # Optional: the Python loop is used instead
+    numpy = None
+
+# ===== Flags =====
+MOBILE = 0x01
+CHEST = 0x02
+SHOP = 0x04
+
+STEPS = (-8, 0, 0, 8) # Per axis: two of four draws stay put, so NPCs mostly idle
+WANDER_RANGE = 32 # Max distance from origin per axis (px)
+BOUNDS = (0, 0, 240, 200) # Allowed NPC positions (px, inclusive)
+MARGIN = 4 # Collision box margin inside the 16x16 sprite
+NUMPY_MIN_BATCH = 32 # Below this the Python loop is faster than NumPy setup
+
+
+class NpcStore:
+    COLUMNS = ("ids", "x", "y", "origin_x", "origin_y", "flags", "sprite_u", "sprite_v")
+
+    def __init__(self, count: int = 0):
+        self.count = count
+        for name in self.COLUMNS:
+            setattr(self, name, array.array("i", [0]) * count)
+        self.mobile: List[int] = [] # Indices with MOBILE set (flags are fixed after loading)
+        self.use_numpy = numpy is not None
+
+    @classmethod
+    def from_npcs(cls, npcs: List[NpcRecord]) -> "NpcStore":
+        store = cls(len(npcs))
+        for i, npc in enumerate(npcs):
+            store.ids[i] = npc.id
+            store.x[i] = npc.x
+            store.y[i] = npc.y
+            store.origin_x[i] = npc.x if npc.origin_x is None else npc.origin_x
+            store.origin_y[i] = npc.y if npc.origin_y is None else npc.origin_y
+            store.flags[i] = ((MOBILE if npc.mobile else 0) |
+                              (CHEST if npc.is_chest else 0) |
+                              (SHOP if npc.is_shop else 0))
+            store.sprite_u[i] = npc.sprite_u
+            store.sprite_v[i] = npc.sprite_v
+        store.mobile = store.mobile_indices()
+        return store
+
+    def __len__(self):
+        return self.count
+
+    def mobile_indices(self) -> List[int]:
+        flags = self.flags
+        return [i for i in range(self.count) if flags[i] & MOBILE]
+
+    def in_rect(self, indices: List[int], x0: float, y0: float, x1: float, y1: float) -> List[int]:
+        """The indices whose 16x16 boxes overlap the rectangle [x0, x1) x [y0, y1)."""
+        xs, ys = self.x, self.y
+        return [i for i in indices if xs[i] < x1 and xs[i] + 16 > x0 and ys[i] < y1 and ys[i] + 16 > y0]
+
+    def set_position(self, i: int, x: int, y: int):
+        self.x[i] = x
+        self.y[i] = y
+
+    # ===== Wander =====
+
+    def wander(self, grid=None, player=None, skip_id: Optional[int] = None,
+               indices: Optional[List[int]] = None, rng=random) -> List[int]:
+        """
+        One random step for each NPC in indices (default: all mobile NPCs).
+        A step is dropped if it leaves the origin range or BOUNDS, overlaps
+        the player's 16x16 box, or the grid blocks it. Returns the indices
+        of the NPCs that moved; their columns already hold the new position.
+        """
+        if indices is None:
+            indices = self.mobile
+        if skip_id is not None and skip_id in self.ids:
+            ids = self.ids
+            indices = [i for i in indices if ids[i] != skip_id]
+        if not indices:
+            return []
+        codes = rng.getrandbits(8 * len(indices)).to_bytes(len(indices), "little")
+        px, py = (player.x, player.y) if player is not None else (None, None)
+        if self.use_numpy and len(indices) >= NUMPY_MIN_BATCH:
+            return self._wander_numpy(indices, codes, grid, px, py)
+        return self._wander_python(indices, codes, grid, px, py)
+
+    def _wander_python(self, indices, codes, grid, px, py) -> List[int]:
+        xs, ys, ox, oy = self.x, self.y, self.origin_x, self.origin_y
+        bx0, by0, bx1, by1 = BOUNDS
+        box_blocked = grid.box_blocked if grid is not None else None
+        moved = []
+        for i, code in zip(indices, codes):
+            dx = STEPS[code & 3]
+            dy = STEPS[(code >> 2) & 3]
+            if dx == 0 and dy == 0:
+                continue
+            nx = xs[i] + dx
+            ny = ys[i] + dy
+            if abs(nx - ox[i]) > WANDER_RANGE or abs(ny - oy[i]) > WANDER_RANGE:
+                continue
+            if not (bx0 <= nx <= bx1 and by0 <= ny <= by1):
+                continue
+            if px is not None and nx < px + 16 and nx + 16 > px and ny < py + 16 and ny + 16 > py:
+                continue
+            if box_blocked is not None and box_blocked(nx, ny, margin=MARGIN):
+                continue
+            xs[i] = nx
+            ys[i] = ny
+            moved.append(i)
+        return moved
+
+    def _wander_numpy(self, indices, codes, grid, px, py) -> List[int]:
+        np = numpy
+        idx = np.asarray(indices, dtype=np.intp)
+        code = np.frombuffer(codes, dtype=np.uint8)
+        steps = np.array(STEPS, dtype=np.intc)
+        dx = steps[code & 3]
+        dy = steps[(code >> 2) & 3]
+        xs = np.frombuffer(self.x, dtype=np.intc)
+        ys = np.frombuffer(self.y, dtype=np.intc)
+        nx = xs[idx] + dx
+        ny = ys[idx] + dy
+
+        bx0, by0, bx1, by1 = BOUNDS
+        ok = (dx != 0) | (dy != 0)
+        ok &= np.abs(nx - np.frombuffer(self.origin_x, dtype=np.intc)[idx]) <= WANDER_RANGE
+        ok &= np.abs(ny - np.frombuffer(self.origin_y, dtype=np.intc)[idx]) <= WANDER_RANGE
+        ok &= (nx >= bx0) & (nx <= bx1) & (ny >= by0) & (ny <= by1)
+        if px is not None:
+            ok &= ~((nx < px + 16) & (nx + 16 > px) & (ny < py + 16) & (ny + 16 > py))
+
+        flags = getattr(grid, "flags", None)
+        if isinstance(flags, bytearray):
+            # CollisionGrid: four corners gathered straight from the flag bytes
+            width, height = grid.width, grid.height
+            x0 = (nx + MARGIN) // TILE_SIZE
+            y0 = (ny + MARGIN) // TILE_SIZE
+            x1 = (nx + TILE_SIZE - MARGIN) // TILE_SIZE
+            y1 = (ny + TILE_SIZE - MARGIN) // TILE_SIZE
+            inside = (x0 >= 0) & (y0 >= 0) & (x1 < width) & (y1 < height)
+            ok &= inside
+            cells = np.frombuffer(flags, dtype=np.uint8)
+            x0, x1 = np.clip(x0, 0, width - 1), np.clip(x1, 0, width - 1)
+            y0, y1 = np.clip(y0, 0, height - 1) * width, np.clip(y1, 0, height - 1) * width
+            corners = cells[y0 + x0] | cells[y0 + x1] | cells[y1 + x0] | cells[y1 + x1]
+            ok &= (corners & BLOCKED) == 0
+        elif grid is not None:
+            # Other grids (chunked maps): per-candidate queries for the survivors
+            for k in np.flatnonzero(ok):
+                if grid.box_blocked(int(nx[k]), int(ny[k]), margin=MARGIN):
+                    ok[k] = False
+
+        moved = idx[ok]
+        xs[moved] = nx[ok]
+        ys[moved] = ny[ok]
+        return moved.tolist()
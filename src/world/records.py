@@ -0,0 +1,157 @@
+"""
+Typed entity records.
+
+NPCs, enemies and items are loaded from JSON as dicts, but at runtime they
+live in small __slots__ classes: fields are attribute reads instead of
+hash lookups, and an instance is a fixed-size struct rather than a dict.
+
+Each record class lists its fields as (attribute, JSON key, default).
+from_dict() / to_dict() are the adapters at the JSON and event boundaries
+(files, event payloads). A record remembers which fields its source had,
+and to_dict() writes only those plus fields that since changed from their
+default; keys a class does not know are kept in `extra`. A dict therefore
+comes back with exactly its own keys, and consumers that test for a key
+(e.g. MenuSystem's item "type") see the same data as before. Fields whose
+value is None are left out.
+"""
+import copy
+from typing import Any, Dict, Optional
+
+
+class Record:
+    __slots__ = ("extra", "present")
+    FIELDS = () # (attribute, JSON key, default)
+    KEYS = frozenset()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.KEYS = frozenset(key for _, key, _ in cls.FIELDS)
+
+    def __init__(self, **fields):
+        present = 0
+        for bit, (attr, _, default) in enumerate(self.FIELDS):
+            if attr in fields:
+                setattr(self, attr, fields.pop(attr))
+                present |= 1 << bit
+            else:
+                setattr(self, attr, copy.copy(default))
+        self.present = present # Bit per FIELDS entry given by the source
+        self.extra: Optional[Dict[str, Any]] = fields or None # Unknown keys, None if there are none
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Record":
+        record = cls.__new__(cls)
+        present = 0
+        for bit, (attr, key, default) in enumerate(cls.FIELDS):
+            if key in data:
+                setattr(record, attr, data[key])
+                present |= 1 << bit
+            else:
+                setattr(record, attr, copy.copy(default))
+        record.present = present
+        keys = cls.KEYS
+        record.extra = {key: value for key, value in data.items() if key not in keys} or None
+        return record
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {}
+        present = self.present
+        for bit, (attr, key, default) in enumerate(self.FIELDS):
+            value = getattr(self, attr)
+            if value is None or (not present >> bit & 1 and value == default):
+                continue
+            data[key] = value.to_dict() if isinstance(value, Record) else value
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def clone(self) -> "Record":
+        """Copy whose lists, dicts and nested records are not shared with this one."""
+        record = self.__class__.__new__(self.__class__)
+        for attr, _, _ in self.FIELDS:
+            value = getattr(self, attr)
+            if isinstance(value, Record):
+                value = value.clone()
+            elif isinstance(value, (list, dict)):
+                value = copy.deepcopy(value)
+            setattr(record, attr, value)
+        record.present = self.present
+        record.extra = copy.deepcopy(self.extra)
+        return record
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.to_dict()!r})"
+
+
+class ItemRecord(Record):
+    __slots__ = ("name", "type", "hp_bonus", "atk_bonus", "def_bonus", "spd_bonus",
+                 "price", "desc", "target_type")
+    FIELDS = (
+        ("name", "name", "Item"),
+        ("type", "type", None), # e.g. "weapon", "shield", "ITEM" (consumable)
+        ("hp_bonus", "hp_bonus", 0),
+        ("atk_bonus", "atk_bonus", 0),
+        ("def_bonus", "def_bonus", 0),
+        ("spd_bonus", "spd_bonus", 0),
+        ("price", "price", 0),
+        ("desc", "desc", None),
+        ("target_type", "target_type", None), # Weapons: SINGLE or ALL
+    )
+
+
+class EnemyRecord(Record):
+    __slots__ = ("name", "hp", "max_hp", "atk", "defense", "spd", "xp_reward",
+                 "sprite_u", "sprite_v", "sprite_bank")
+    FIELDS = (
+        ("name", "name", "Enemy"),
+        ("hp", "hp", 10),
+        ("max_hp", "max_hp", 10),
+        ("atk", "atk", 5),
+        ("defense", "def", 0), # 'def' is keyword
+        ("spd", "spd", 2),
+        ("xp_reward", "xp_reward", 0),
+        ("sprite_u", "sprite_u", 0),
+        ("sprite_v", "sprite_v", 32),
+        ("sprite_bank", "sprite_bank", 0),
+    )
+
+    def spawn(self) -> "EnemyRecord":
+        """A fresh battle instance of this template, at full HP."""
+        enemy = self.clone()
+        enemy.hp = enemy.max_hp
+        return enemy
+
+
+class NpcRecord(Record):
+    __slots__ = ("id", "map_id", "x", "y", "origin_x", "origin_y", "sprite_u", "sprite_v",
+                 "mobile", "is_chest", "is_shop", "opened", "dialog", "item_reward")
+    FIELDS = (
+        ("id", "id", 0),
+        ("map_id", "map_id", None),
+        ("x", "x", 0),
+        ("y", "y", 0),
+        ("origin_x", "origin_x", None), # Set when the NPC enters the runtime overlay
+        ("origin_y", "origin_y", None),
+        ("sprite_u", "sprite_u", 0),
+        ("sprite_v", "sprite_v", 32),
+        ("mobile", "mobile", False),
+        ("is_chest", "is_chest", False),
+        ("is_shop", "is_shop", False),
+        ("opened", "opened", False),
+        ("dialog", "dialog", []),
+        ("item_reward", "item_reward", None), # ItemRecord
+    )
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "NpcRecord":
+        npc = super().from_dict(data)
+        if isinstance(npc.item_reward, dict):
+            npc.item_reward = ItemRecord.from_dict(npc.item_reward)
+        return npc
+
+
+def item_from(data: Optional[Dict[str, Any]]) -> Optional[ItemRecord]:
+    """ItemRecord of an event payload's item (None stays None)."""
+    if data is None or isinstance(data, ItemRecord):
+        return data
+    return ItemRecord.from_dict(data)
@@ -0,0 +1,114 @@
+"""
+Uniform spatial hash (broadphase) for entity boxes.
+
+Boxes are bucketed by the tile-sized cells they touch, so a rectangle or
+radius query only looks at the few entities near it instead of all of
+them. Positions are updated incrementally: move() only touches the buckets
+when a box crosses into different cells.
+
+Keys are whatever the owner uses to find its entities (NpcSystem uses the
+index into active_npcs).
+"""
+from typing import Dict, Hashable, List, Optional, Tuple
+
+CELL_SIZE = 16
+
+
+class SpatialHash:
+    __slots__ = ("cell_size", "buckets", "boxes", "cells")
+
+    def __init__(self, cell_size: int = CELL_SIZE):
+        self.cell_size = cell_size
+        self.buckets: Dict[Tuple[int, int], List[Hashable]] = {} # cell -> keys
+        self.boxes: Dict[Hashable, Tuple[float, float, float, float]] = {} # key -> (x, y, w, h)
+        self.cells: Dict[Hashable, Tuple[int, int, int, int]] = {} # key -> covered cell range
+
+    def _cell_range(self, x: float, y: float, w: float, h: float) -> Tuple[int, int, int, int]:
+        # Inclusive of the far edge: conservative, the exact test filters
+        size = self.cell_size
+        return int(x // size), int(y // size), int((x + w) // size), int((y + h) // size)
+
+    def insert(self, key: Hashable, x: float, y: float, w: float = 16, h: float = 16):
+        if key in self.boxes:
+            self.remove(key)
+        cells = self._cell_range(x, y, w, h)
+        self.boxes[key] = (x, y, w, h)
+        self.cells[key] = cells
+        cx0, cy0, cx1, cy1 = cells
+        buckets = self.buckets
+        for cy in range(cy0, cy1 + 1):
+            for cx in range(cx0, cx1 + 1):
+                bucket = buckets.get((cx, cy))
+                if bucket is None:
+                    buckets[(cx, cy)] = [key]
+                else:
+                    bucket.append(key)
+
+    def remove(self, key: Hashable):
+        if key not in self.boxes:
+            return
+        del self.boxes[key]
+        cx0, cy0, cx1, cy1 = self.cells.pop(key)
+        buckets = self.buckets
+        for cy in range(cy0, cy1 + 1):
+            for cx in range(cx0, cx1 + 1):
+                bucket = buckets[(cx, cy)]
+                bucket.remove(key)
+                if not bucket:
+                    del buckets[(cx, cy)]
+
+    def move(self, key: Hashable, x: float, y: float):
+        """Update a box's position; buckets change only if its cells do."""
+        _, _, w, h = self.boxes[key]
+        if self._cell_range(x, y, w, h) == self.cells[key]:
+            self.boxes[key] = (x, y, w, h)
+        else:
+            self.insert(key, x, y, w, h)
+
+    def clear(self):
+        self.buckets.clear()
+        self.boxes.clear()
+        self.cells.clear()
+
+    def __len__(self):
+        return len(self.boxes)
+
+    def __contains__(self, key):
+        return key in self.boxes
+
+    # ===== Queries =====
+
+    def _candidates(self, x0: float, y0: float, x1: float, y1: float):
+        size = self.cell_size
+        buckets = self.buckets
+        seen = set()
+        for cy in range(int(y0 // size), int(y1 // size) + 1):
+            for cx in range(int(x0 // size), int(x1 // size) + 1):
+                bucket = buckets.get((cx, cy))
+                if bucket is None:
+                    continue
+                for key in bucket:
+                    if key not in seen:
+                        seen.add(key)
+                        yield key
+
+    def query_rect(self, x: float, y: float, w: float, h: float) -> List[Hashable]:
+        """Keys whose boxes overlap the rectangle (touching edges do not count)."""
+        boxes = self.boxes
+        hits = []
+        for key in self._candidates(x, y, x + w, y + h):
+            bx, by, bw, bh = boxes[key]
+            if x < bx + bw and x + w > bx and y < by + bh and y + h > by:
+                hits.append(key)
+        return hits
+
+    def nearest(self, x: float, y: float, radius: float) -> Optional[Hashable]:
+        """Key whose box origin is closest to (x, y) and strictly within radius."""
+        boxes = self.boxes
+        best, best_d2 = None, radius * radius
+        for key in self._candidates(x - radius, y - radius, x + radius, y + radius):
+            bx, by, _, _ = boxes[key]
+            d2 = (x - bx) ** 2 + (y - by) ** 2
+            if d2 < best_d2:
+                best, best_d2 = key, d2
+        return best
@@ -0,0 +1,149 @@
+"""
+Pre-baked map layers.
+
+The ground and object layers are static once a map is loaded, so each one is
+baked into a Pyxel Tilemap: every 16x16 map tile becomes 2x2 tilemap cells
+pointing at the tile's 8x8 cells in the sprite sheet (image bank 0). Drawing
+a layer is then a single bltm() over the visible rectangle instead of a
+Python loop with one blt() per tile.
+
+The object layer only draws LAYER2_TILES, so every other tile has to point
+at a fully transparent (color 0) 8x8 cell of the sprite sheet. If the sheet
+has none, the object layer is not baked and MapSystem keeps its tile loop
+for it.
+"""
+from typing import Iterable, List, Optional, Tuple
+
+TILE_SIZE = 16
+CELL_SIZE = 8
+CELLS_PER_TILE = TILE_SIZE // CELL_SIZE
+
+# Object-layer tiles drawn on top of the ground (matches gen_pixel_art.py)
+LAYER2_TILES = frozenset([1, 2, 6, 7, 8, 9, 51, 64, 65, 66, 67, 68]) # Buildings, castle, stairs
+
+
+def tile_cell(tile: int) -> Tuple[int, int]:
+    """Top-left 8x8 cell (image_tx, image_ty) of a sheet tile (16 tiles per row)."""
+    return (tile % 16) * CELLS_PER_TILE, (tile // 16) * CELLS_PER_TILE
+
+
+def find_blank_cell(image, colkey: int = 0) -> Optional[Tuple[int, int]]:
+    """
+    An 8x8 cell filled entirely with colkey, searched from the bottom-right
+    of the sheet (where unused space usually is). None if there is none.
+    """
+    for cy in range(image.height // CELL_SIZE - 1, -1, -1):
+        for cx in range(image.width // CELL_SIZE - 1, -1, -1):
+            x, y = cx * CELL_SIZE, cy * CELL_SIZE
+            if all(image.pget(x + i, y + j) == colkey for j in range(CELL_SIZE) for i in range(CELL_SIZE)):
+                return cx, cy
+    return None
+
+
+def layer_lines(rows: List[List[int]], width: int, height: int,
+                include: Optional[Iterable[int]] = None, blank: Optional[Tuple[int, int]] = None) -> List[str]:
+    """
+    Tilemap.set() data for a layer: rows of 'xxyy' hex cells, two cell rows
+    per tile row. Pure Python, so it can run on a prefetch worker thread.
+    """
+    include = frozenset(include) if include is not None else None
+    pairs = {} # tile id -> (top cells, bottom cells)
+
+    def cells(tile):
+        if include is not None and tile not in include:
+            cx, cy = blank
+            top = bottom = f"{cx:02x}{cy:02x} {cx:02x}{cy:02x}"
+        else:
+            cx, cy = tile_cell(tile)
+            top = f"{cx:02x}{cy:02x} {cx + 1:02x}{cy:02x}"
+            bottom = f"{cx:02x}{cy + 1:02x} {cx + 1:02x}{cy + 1:02x}"
+        pairs[tile] = (top, bottom)
+        return pairs[tile]
+
+    lines = []
+    for ty in range(height):
+        row = rows[ty] if ty < len(rows) else ()
+        top, bottom = [], []
+        for tx in range(width):
+            tile = row[tx] if tx < len(row) else 0
+            pair = pairs.get(tile) or cells(tile)
+            top.append(pair[0])
+            bottom.append(pair[1])
+        lines.append(" ".join(top))
+        lines.append(" ".join(bottom))
+    return lines
+
+
+class BakedLayer:
+    """A map layer baked into a Tilemap; cells of skipped tiles show `blank`."""
+
+    def __init__(self, pyxel, rows: List[List[int]], width: int, height: int,
+                 include: Optional[Iterable[int]] = None, blank: Optional[Tuple[int, int]] = None, img: int = 0,
+                 lines: Optional[List[str]] = None):
+        self.include = frozenset(include) if include is not None else None
+        self.blank = blank
+        self.tilemap = pyxel.Tilemap(width * CELLS_PER_TILE, height * CELLS_PER_TILE, img)
+        if lines is None:
+            lines = layer_lines(rows, width, height, self.include, blank)
+        if lines:
+            self.tilemap.set(0, 0, lines)
+
+    def cell_for(self, tile: int) -> Optional[Tuple[int, int]]:
+        """Sheet cell of a tile, or None if this layer does not draw it."""
+        if self.include is not None and tile not in self.include:
+            return None
+        return tile_cell(tile)
+
+    def set_tile(self, tx: int, ty: int, tile: int):
+        """Re-bake one map tile (2x2 cells) after a mutation."""
+        cell = self.cell_for(tile)
+        for dy in range(CELLS_PER_TILE):
+            for dx in range(CELLS_PER_TILE):
+                target = self.blank if cell is None else (cell[0] + dx, cell[1] + dy)
+                self.tilemap.pset(tx * CELLS_PER_TILE + dx, ty * CELLS_PER_TILE + dy, target)
+
+    def draw(self, pyxel, x0: int, y0: int, x1: int, y1: int, colkey: Optional[int] = None, ox: int = 0, oy: int = 0):
+        """
+        Blit map tiles [x0, x1) x [y0, y1) at their world position. (ox, oy)
+        is the map tile at the tilemap's origin (a chunk's corner).
+        """
+        if x1 <= x0 or y1 <= y0:
+            return
+        x, y = x0 * TILE_SIZE, y0 * TILE_SIZE
+        u, v = (x0 - ox) * TILE_SIZE, (y0 - oy) * TILE_SIZE
+        w, h = (x1 - x0) * TILE_SIZE, (y1 - y0) * TILE_SIZE
+        if colkey is None:
+            pyxel.bltm(x, y, self.tilemap, u, v, w, h)
+        else:
+            pyxel.bltm(x, y, self.tilemap, u, v, w, h, colkey)
+
+
+class BakedMap:
+    """Ground (opaque) and object (colkey 0) layers of one map."""
+
+    def __init__(self, pyxel, map_data, blank: Optional[Tuple[int, int]], lines: Optional[dict] = None):
+        width = map_data.get("width", 16)
+        height = map_data.get("height", 16)
+        layers = map_data.get("layers", {})
+        lines = lines or {}
+        self.ground = BakedLayer(pyxel, layers.get("ground", []), width, height, lines=lines.get("ground"))
+        self.objects = None
+        if blank is not None:
+            self.objects = BakedLayer(pyxel, layers.get("objects", []), width, height,
+                                      include=LAYER2_TILES, blank=blank, lines=lines.get("objects"))
+
+    @staticmethod
+    def prepare(map_data, blank: Optional[Tuple[int, int]]) -> dict:
+        """Precomputed Tilemap.set() data for BakedMap(lines=...), off the main thread."""
+        width = map_data.get("width", 16)
+        height = map_data.get("height", 16)
+        layers = map_data.get("layers", {})
+        lines = {"ground": layer_lines(layers.get("ground", []), width, height)}
+        if blank is not None:
+            lines["objects"] = layer_lines(layers.get("objects", []), width, height, LAYER2_TILES, blank)
+        return lines
+
+    def set_tile(self, layer: str, tx: int, ty: int, tile: int):
+        baked = self.ground if layer == "ground" else self.objects
+        if baked is not None:
+            baked.set_tile(tx, ty, tile)
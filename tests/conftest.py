@@ -0,0 +1,11 @@
+import os
+import sys
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+if SRC not in sys.path:
+    sys.path.insert(0, SRC)
+
+# Install the headless Pyxel backend BEFORE any concept imports pyxel
+from engine.headless import install
+
+install()
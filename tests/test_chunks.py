@@ -0,0 +1,93 @@
+import json
+import os
+
+import pytest
+
+from world.chunks import open_chunked_map, write_chunked_map
+from world.collision import CollisionGrid
+from world.encounters import EncounterTable
+
+MAPS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src", "assets", "data", "maps")
+
+
+def shipped_maps():
+    with open(os.path.join(MAPS_DIR, "index.json"), 'r', encoding='utf-8') as f:
+        return [entry["file"] for entry in json.load(f)["maps"]]
+
+
+def load_json(name):
+    with open(os.path.join(MAPS_DIR, name), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def chunked(tmp_path, map_data, chunk_size, max_chunks=4):
+    path = str(tmp_path / f"map_{chunk_size}.chunks")
+    write_chunked_map(map_data, path, chunk_size)
+    return open_chunked_map(path, max_chunks)["chunks"]
+
+
+def assert_same_as_grids(store, map_data):
+    grid = CollisionGrid.from_map(map_data)
+    table = EncounterTable.from_map(map_data)
+    width, height = map_data["width"], map_data["height"]
+    for ty in range(-1, height + 1):
+        for tx in range(-1, width + 1):
+            assert store.flags_at(tx, ty) == grid.flags_at(tx, ty), (tx, ty)
+            assert store.is_walkable(tx, ty) == grid.is_walkable(tx, ty), (tx, ty)
+            assert store.rule_at(tx, ty) == table.rule_at(tx, ty), (tx, ty)
+    for y in range(-12, height * 16 + 12, 7):
+        for x in range(-12, width * 16 + 12, 7):
+            assert store.box_blocked(x, y) == grid.box_blocked(x, y), (x, y)
+            assert store.box_blocked(x, y, margin=0) == grid.box_blocked(x, y, margin=0), (x, y)
+    assert list(store.heatmap()) == table.heatmap()
+    assert store.rule_counts() == table.rule_counts()
+
+
+# ===== Parity with CollisionGrid / EncounterTable =====
+
+@pytest.mark.parametrize("chunk_size", [8, 32])
+@pytest.mark.parametrize("name", shipped_maps())
+def test_chunked_map_matches_grids(tmp_path, name, chunk_size):
+    map_data = load_json(name)
+    store = chunked(tmp_path, map_data, chunk_size)
+    assert_same_as_grids(store, map_data)
+    assert len(store.resident()) <= store.max_chunks
+
+
+@pytest.mark.parametrize("chunk_size", [8, 32])
+def test_edits_match_grids(tmp_path, chunk_size):
+    map_data = load_json("world_map.json")
+    store = chunked(tmp_path, map_data, chunk_size)
+    grid = CollisionGrid.from_map(map_data)
+    table = EncounterTable.from_map(map_data)
+    edits = [("objects", 3, 3, 2), ("ground", 40, 9, 0), ("ground", 63, 63, 300), ("objects", 20, 50, 0)]
+    for layer, tx, ty, tile in edits:
+        store.set_tile(layer, tx, ty, tile)
+        map_data["layers"][layer][ty][tx] = tile
+        grid.refresh_tile(map_data, tx, ty)
+        table.refresh_tile(map_data, tx, ty)
+    assert_same_as_grids(store, map_data)
+
+
+# ===== Edits =====
+
+def test_edits_survive_eviction_without_pinning(tmp_path):
+    map_data = load_json("world_map.json")
+    store = chunked(tmp_path, map_data, 8, max_chunks=2)
+    for i in range(64): # One edit in every chunk of the 64x64 map
+        store.set_tile("ground", (i % 8) * 8, (i // 8) * 8, 1)
+        assert len(store.resident()) <= 2
+    for i in range(64):
+        assert store.tile("ground", (i % 8) * 8, (i // 8) * 8) == 1
+
+
+def test_wide_tile_in_byte_layer(tmp_path):
+    map_data = load_json("village_house.json")
+    store = chunked(tmp_path, map_data, 8, max_chunks=1)
+    store.set_tile("ground", 1, 1, 300)
+    assert store.tile("ground", 1, 1) == 300
+    assert store.tile("ground", 2, 1) == map_data["layers"]["ground"][1][2]
+    store.chunk(1, 1) # Evict, then page the widened chunk back in
+    assert store.tile("ground", 1, 1) == 300
+    with pytest.raises(ValueError):
+        store.set_tile("ground", 1, 1, 1 << 16)
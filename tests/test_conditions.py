@@ -0,0 +1,124 @@
+import os
+import uuid
+
+import pytest
+import yaml
+
+from cs_framework.core.event import Event
+from sync.conditions import ConditionError, SAFE_BUILTINS, compile_condition
+
+RULES_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src", "sync", "rules.yaml")
+
+
+class GameState:
+    def __init__(self, current_state):
+        self.current_state = current_state
+
+
+def make_event(**payload):
+    return Event("Test", payload, uuid.uuid4())
+
+
+def legacy_condition(source, runner, concepts_map):
+    """The eval()-based condition compile_condition replaced."""
+    class AttrDict:
+        def __init__(self, obj):
+            self._obj = obj
+
+        def __getattr__(self, name):
+            if isinstance(self._obj, dict) and name in self._obj:
+                return self._obj[name]
+            if hasattr(self._obj, "payload") and isinstance(self._obj.payload, dict) and name in self._obj.payload:
+                return self._obj.payload[name]
+            if hasattr(self._obj, name):
+                return getattr(self._obj, name)
+            return None
+
+    def condition_fn(event):
+        try:
+            ctx = {"event": AttrDict(event), "runner": runner, "concepts": concepts_map,
+                   "get_concept": concepts_map.get}
+            return eval(source, {"__builtins__": dict(SAFE_BUILTINS)}, ctx)
+        except Exception:
+            return False
+
+    return condition_fn
+
+
+def rule_conditions():
+    with open(RULES_PATH, 'r', encoding='utf-8') as f:
+        rules = yaml.safe_load(f)
+    syncs = rules.get("synchronizations", rules) if isinstance(rules, dict) else rules
+    return [(sync["name"], sync["condition"]) for sync in syncs if sync.get("condition")]
+
+
+# ===== Allowlist =====
+
+@pytest.mark.parametrize("source", [
+    "event.npc_id in [3, 6, 7]",
+    "event.npc_id not in (3, 6, 7)",
+    "get_concept('GameState').current_state == 'EXPLORING'",
+    "event.result == 'WIN' and len(str(event.xp)) > 0",
+    "not event.flag or event.count // 2 >= -1",
+    "event.items[0] if event.items else None",
+    "concepts['GameState'].current_state is not None",
+])
+def test_allowed_expressions_compile(source):
+    assert callable(compile_condition(source, None, {"GameState": GameState("EXPLORING")}))
+
+
+@pytest.mark.parametrize("source", [
+    "__import__('os')",                          # unknown name
+    "open('/etc/passwd')",                       # unknown name
+    "event.__class__",                           # private attribute
+    "get_concept('GameState')._secret",          # private attribute
+    "event.payload.get('x')",                    # call of a non-builtin
+    "str(event, encoding='utf-8')",              # keyword arguments
+    "[x for x in event.items]",                  # comprehension
+    "lambda: 1",                                 # lambda
+    "(x := 1)",                                  # assignment expression
+    "event.x ==",                                # syntax error
+])
+def test_rejected_expressions_raise(source):
+    with pytest.raises(ConditionError):
+        compile_condition(source, None, {})
+
+
+# ===== Evaluation =====
+
+def test_evaluation_error_is_false():
+    condition = compile_condition("event.count > 1", None, {})
+    assert condition(make_event(count=5)) is True
+    assert condition(make_event()) is False # None > 1 raises TypeError
+    assert compile_condition("get_concept('Missing').current_state == 'X'", None, {})(make_event()) is False
+    assert compile_condition("int(event.text) == 3", None, {})(make_event(text="three")) is False
+
+
+def test_event_fields_resolve_like_before():
+    condition = compile_condition("event.name == 'Test' and event.npc_id == 3", None, {})
+    assert condition(make_event(npc_id=3))
+    assert condition({"name": "Test", "npc_id": 3}) # plain dict events
+    assert not condition(make_event(npc_id=4))
+
+
+def test_concept_binding_sees_live_state():
+    state = GameState("EXPLORING")
+    condition = compile_condition("get_concept('GameState').current_state == 'EXPLORING'", None, {"GameState": state})
+    assert condition(make_event())
+    state.current_state = "DIALOG"
+    assert not condition(make_event())
+
+
+def test_rules_yaml_conditions_match_eval():
+    conditions = rule_conditions()
+    assert conditions
+    states = ["EXPLORING", "DIALOG", "SHOP", "BATTLE", "MENU"]
+    events = [make_event()] + [make_event(npc_id=i) for i in range(10)] + \
+        [make_event(result=r, xp=10) for r in ("WIN", "LOSE", "ESCAPE")]
+    for name, source in conditions:
+        for current in states:
+            concepts_map = {"GameState": GameState(current)}
+            new = compile_condition(source, None, concepts_map, name)
+            old = legacy_condition(source, None, concepts_map)
+            for event in events:
+                assert new(event) == old(event), (name, source, current, event.payload)
@@ -0,0 +1,38 @@
+from engine.headless import HeadlessGame
+from engine.scenario import state_fingerprint
+from sync.profiling import PHASES, RuleProfiler
+
+INPUTS = {0: [("press", "RIGHT")], 20: [("release", "RIGHT"), ("press", "DOWN")], 40: [("release", "DOWN")]}
+
+
+def play(profile: bool):
+    game = HeadlessGame(seed=3)
+    profiler = game.runner.enable_profiling(RuleProfiler(json_path=None)) if profile else None
+    game.run(60, inputs=INPUTS)
+    return game, profiler
+
+
+def test_profiling_does_not_change_dispatch():
+    plain, _ = play(profile=False)
+    profiled, profiler = play(profile=True)
+    assert state_fingerprint(plain) == state_fingerprint(profiled)
+    phases = {row["phase"] for row in profiler.rows()}
+    assert {"match", "rule", "map", "action"} <= phases <= set(PHASES)
+
+
+def test_disable_profiling_keeps_stats():
+    game, profiler = play(profile=True)
+    calls = sum(row["calls"] for row in profiler.rows())
+    game.runner.disable_profiling()
+    game.run(10)
+    assert sum(row["calls"] for row in profiler.rows()) == calls
+
+
+def test_failing_action_is_counted_and_reported():
+    game, profiler = play(profile=True)
+    player = game.concept("Player")
+    player.initiate_move = lambda payload: (_ for _ in ()).throw(RuntimeError("move bug"))
+    game.apply_input([("press", "RIGHT")])
+    game.run(5)
+    errors = [row for row in profiler.rows("action") if row["key"] == "Player.initiate_move"]
+    assert errors and errors[0]["errors"] > 0
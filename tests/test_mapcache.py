@@ -0,0 +1,46 @@
+import json
+import os
+import shutil
+
+from world.mapcache import LIST_TILE_BYTES, MapCache, decoded_size
+from world.mapformat import write_binary_map
+
+MAPS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src", "assets", "data", "maps")
+
+
+def copy_maps(tmp_path):
+    maps_dir = tmp_path / "maps"
+    shutil.copytree(MAPS_DIR, maps_dir)
+    return str(maps_dir)
+
+
+def test_size_is_decoded_layers_not_file_size(tmp_path):
+    cache = MapCache(copy_maps(tmp_path), max_maps=16, max_bytes=1 << 30)
+    cache.prefer_binary = False
+    cache.load_index()
+    data = cache[1]
+    assert cache.bytes == data["width"] * data["height"] * len(data["layers"]) * LIST_TILE_BYTES
+    assert cache.bytes != os.path.getsize(cache.path(1))
+
+
+def test_binary_map_counts_plane_bytes(tmp_path):
+    maps_dir = copy_maps(tmp_path)
+    cache = MapCache(maps_dir, max_maps=16, max_bytes=1 << 30)
+    cache.load_index()
+    with open(cache.path(1), 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    write_binary_map(data, os.path.splitext(cache.path(1))[0] + ".bin")
+    loaded = cache[1]
+    itemsizes = [rows.plane.itemsize for rows in loaded["layers"].values()]
+    assert cache.bytes == decoded_size(loaded) == data["width"] * data["height"] * sum(itemsizes)
+
+
+def test_byte_budget_evicts_least_recent(tmp_path):
+    cache = MapCache(copy_maps(tmp_path), max_maps=16)
+    cache.prefer_binary = False
+    cache.load_index()
+    cache.max_bytes = decoded_size(cache[0]) + decoded_size(cache[2])
+    cache.get(2)
+    cache.get(1) # 64x64: over budget with either small map resident
+    assert cache.loaded() == [1]
+    assert cache.stats["evictions"] == 2
@@ -0,0 +1,29 @@
+import uuid
+
+from cs_framework.core.event import Event
+from sync.mappers import compile_payload_mapper
+
+
+def make_event(**payload):
+    return Event("Test", payload, uuid.uuid4())
+
+
+def test_constant_payload_is_a_fresh_dict():
+    mapper = compile_payload_mapper({"map_id": 0, "mode": "fixed"})
+    first = mapper(make_event())
+    assert type(first) is dict
+    assert first == {"map_id": 0, "mode": "fixed"}
+    first["map_id"] = 5 # An action changing its payload must not leak into the rule
+    assert mapper(make_event()) == {"map_id": 0, "mode": "fixed"}
+
+
+def test_empty_payload_is_a_dict():
+    assert type(compile_payload_mapper({})(make_event())) is dict
+    assert type(compile_payload_mapper(None)(make_event())) is dict
+
+
+def test_event_references_resolve():
+    mapper = compile_payload_mapper({"x": "event.x", "source": "event.name", "fixed": 1})
+    assert mapper(make_event(x=3)) == {"x": 3, "source": "Test", "fixed": 1}
+    assert mapper(make_event()) == {"x": None, "source": "Test", "fixed": 1}
+    assert mapper({"x": 7, "name": "Raw"}) == {"x": 7, "source": "Raw", "fixed": 1}
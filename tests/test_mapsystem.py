@@ -0,0 +1,29 @@
+from concepts.mapsystem import MapSystem
+from world.tilemap import CELLS_PER_TILE, tile_cell
+
+
+def loaded_system():
+    system = MapSystem()
+    system.map_data.load_index()
+    # As after the first draw: the sheet was probed, so loads prepare tilemap lines
+    system.blank_cell = (31, 31)
+    system.blank_probed = True
+    return system
+
+
+def test_edit_before_first_draw_reaches_the_bake():
+    system = loaded_system()
+    system.map_data.get(20) # Loaded (as by a prefetch) but not drawn yet
+    assert 20 in system.baked_lines
+    system.set_tile("ground", 1, 1, 5, map_id=20)
+    assert 20 not in system.baked_lines
+    baked = system.get_baked_map(20)
+    assert baked.ground.tilemap.pget(1 * CELLS_PER_TILE, 1 * CELLS_PER_TILE) == tile_cell(5)
+
+
+def test_edit_after_first_draw_updates_the_bake():
+    system = loaded_system()
+    baked = system.get_baked_map(20)
+    system.set_tile("ground", 2, 3, 7, map_id=20)
+    assert system.get_baked_map(20) is baked
+    assert baked.ground.tilemap.pget(2 * CELLS_PER_TILE + 1, 3 * CELLS_PER_TILE + 1) == (tile_cell(7)[0] + 1, tile_cell(7)[1] + 1)
@@ -0,0 +1,85 @@
+import json
+import os
+import random
+
+import pytest
+
+from engine.headless import HeadlessGame
+from engine.scenario import state_fingerprint
+from world import npcstore
+from world.chunks import open_chunked_map, write_chunked_map
+from world.collision import CollisionGrid
+from world.npcstore import BOUNDS, NUMPY_MIN_BATCH, NpcStore
+from world.records import NpcRecord
+
+MAPS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src", "assets", "data", "maps")
+NPCS = 200
+TICKS = 50
+SEED = 7
+
+
+class Player:
+    x = 120
+    y = 96
+
+
+def village():
+    with open(os.path.join(MAPS_DIR, "village.json"), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def make_store():
+    rng = random.Random(SEED)
+    bx0, by0, bx1, by1 = BOUNDS
+    npcs = [NpcRecord(id=i, x=rng.randrange(bx0, bx1 + 1, 8), y=rng.randrange(by0, by1 + 1, 8), mobile=i % 10 != 0)
+            for i in range(NPCS)]
+    return NpcStore.from_npcs(npcs)
+
+
+def wander_ticks(store, grid):
+    rng = random.Random(SEED)
+    ticks = []
+    for _ in range(TICKS):
+        moved = store.wander(grid, Player, skip_id=3, rng=rng)
+        ticks.append((sorted(moved), store.x.tolist(), store.y.tolist()))
+    return ticks
+
+
+def grids(tmp_path):
+    map_data = village()
+    path = str(tmp_path / "village.chunks")
+    write_chunked_map(map_data, path, 8)
+    return {"none": None, "grid": CollisionGrid.from_map(map_data), "chunks": open_chunked_map(path, 2)["chunks"]}
+
+
+@pytest.mark.parametrize("kind", ["none", "grid", "chunks"])
+def test_numpy_and_python_wander_match(tmp_path, kind):
+    pytest.importorskip("numpy")
+    grid = grids(tmp_path)[kind]
+    python, vectorized = make_store(), make_store()
+    python.use_numpy = False
+    assert vectorized.use_numpy and len(vectorized.mobile) >= NUMPY_MIN_BATCH
+    expected = wander_ticks(python, grid)
+    assert wander_ticks(vectorized, grid) == expected
+    assert any(moved for moved, _, _ in expected)
+
+
+def test_wander_without_numpy(tmp_path, monkeypatch):
+    grid = grids(tmp_path)["grid"]
+    reference = make_store()
+    reference.use_numpy = False
+    expected = wander_ticks(reference, grid)
+
+    monkeypatch.setattr(npcstore, "numpy", None)
+    store = make_store()
+    assert not store.use_numpy
+    assert wander_ticks(store, grid) == expected
+
+    inputs = {0: [("press", "RIGHT")], 30: [("release", "RIGHT")]}
+    game = HeadlessGame(seed=SEED)
+    assert not game.concept("NpcSystem").store.use_numpy
+    game.run(60, inputs=inputs)
+    monkeypatch.undo()
+    with_numpy = HeadlessGame(seed=SEED)
+    with_numpy.run(60, inputs=inputs)
+    assert state_fingerprint(game) == state_fingerprint(with_numpy)
@@ -0,0 +1,54 @@
+"""
+Rule Analysis Tool for CSFW RPG
+Prints the causal graph report for src/sync/rules.yaml:
+root events, chain depths, cycles, dead and unreachable rules.
+"""
+import argparse
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(ROOT, "src"))
+
+from concepts.gameloop import GameLoop
+from concepts.inputsystem import InputSystem
+from concepts.mapsystem import MapSystem
+from concepts.player import Player
+from concepts.npcsystem import NpcSystem
+from concepts.battlesystem import BattleSystem
+from concepts.gamestate import GameState
+from concepts.camerasystem import CameraSystem
+from concepts.menusystem import MenuSystem
+from concepts.shopsystem import ShopSystem
+from concepts.effectsystem import EffectSystem
+from sync.analysis import analyze_rules
+
+CONCEPTS = {
+    "GameLoop": GameLoop,
+    "InputSystem": InputSystem,
+    "MapSystem": MapSystem,
+    "Player": Player,
+    "NpcSystem": NpcSystem,
+    "BattleSystem": BattleSystem,
+    "GameState": GameState,
+    "CameraSystem": CameraSystem,
+    "MenuSystem": MenuSystem,
+    "ShopSystem": ShopSystem,
+    "EffectSystem": EffectSystem
+}
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyze synchronization rules.")
+    parser.add_argument("rules", nargs="?", default=os.path.join(ROOT, "src", "sync", "rules.yaml"))
+    parser.add_argument("--max-depth", type=int, default=10, help="Runner.max_depth used for pass planning")
+    parser.add_argument("--strict", action="store_true", help="Exit with status 1 on cycles or dead rules")
+    args = parser.parse_args()
+
+    graph = analyze_rules(args.rules, CONCEPTS)
+    print(graph.report(args.max_depth))
+
+    if args.strict and (graph.cycles() or graph.dead_rules):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
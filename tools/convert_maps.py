@@ -0,0 +1,86 @@
+"""
+Map Converter for CSFW RPG
+Writes a binary container (.bin, see world/mapformat.py) next to every map
+listed in assets/data/maps/index.json. MapSystem prefers the .bin when it is
+newer than the JSON.
+
+    python tools/convert_maps.py            # convert all maps
+    python tools/convert_maps.py --check    # verify .bin files match their JSON
+    python tools/convert_maps.py --clean    # remove .bin and .chunks files
+    python tools/convert_maps.py --chunked  # write chunk stores (.chunks) instead
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(ROOT, "src"))
+
+from world.chunks import EXTENSION as CHUNKS_EXTENSION, write_chunked_map
+from world.mapformat import read_binary_map, to_lists, write_binary_map
+
+MAPS_DIR = os.path.join(ROOT, "src", "assets", "data", "maps")
+
+def map_files(maps_dir):
+    """(index entry, JSON path, .bin path) of every JSON map in the index."""
+    with open(os.path.join(maps_dir, "index.json"), 'r', encoding='utf-8') as f:
+        index = json.load(f)
+    for entry in index.get("maps", []):
+        path = os.path.join(maps_dir, entry["file"])
+        if path.endswith(".json") and os.path.exists(path):
+            yield entry, path, os.path.splitext(path)[0] + ".bin"
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert JSON maps to the binary map format.")
+    parser.add_argument("--maps-dir", default=MAPS_DIR, help="Directory containing index.json")
+    parser.add_argument("--check", action="store_true", help="Compare existing .bin files with their JSON")
+    parser.add_argument("--clean", action="store_true", help="Delete .bin and .chunks files")
+    parser.add_argument("--chunked", action="store_true", help="Write paged chunk stores (world/chunks.py)")
+    args = parser.parse_args()
+
+    failures = 0
+    for entry, json_path, bin_path in map_files(args.maps_dir):
+        chunks_path = os.path.splitext(json_path)[0] + CHUNKS_EXTENSION
+        if args.clean:
+            for path in (bin_path, chunks_path):
+                if os.path.exists(path):
+                    os.remove(path)
+                    print(f"Removed {os.path.relpath(path, args.maps_dir)}")
+            continue
+
+        with open(json_path, 'r', encoding='utf-8') as f:
+            map_data = json.load(f)
+
+        if args.check:
+            if not os.path.exists(bin_path):
+                print(f"MISSING {entry['name']}")
+                failures += 1
+                continue
+            binary = read_binary_map(bin_path)
+            layers = to_lists(binary)
+            binary.pop("layers")
+            expected = {k: v for k, v in map_data.items() if k != "layers"}
+            ok = binary == expected and layers == map_data.get("layers", {})
+            print(f"{'OK' if ok else 'DIFF':<7} {entry['name']}")
+            failures += not ok
+            continue
+
+        if args.chunked:
+            write_chunked_map(map_data, chunks_path)
+            print(f"{entry['name']:<16} {os.path.getsize(json_path):>9} B json -> "
+                  f"{os.path.getsize(chunks_path):>8} B chunks")
+            continue
+
+        write_binary_map(map_data, bin_path)
+        start = time.perf_counter()
+        read_binary_map(bin_path)
+        load_ms = (time.perf_counter() - start) * 1000
+        print(f"{entry['name']:<16} {os.path.getsize(json_path):>9} B json -> {os.path.getsize(bin_path):>8} B bin "
+              f"(load {load_ms:.2f} ms)")
+
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Encounter Heatmap for CSFW RPG
+Compiles each map's encounter rules (world/encounters.py) and exports the
+effective encounter rate of every tile, so designers can see which rule
+wins where. Chunked maps (.chunks, see world/chunks.py) are read chunk band
+by chunk band, so a large world never has to be in memory at once.
+
+    python tools/encounter_heatmap.py                 # per-rule summary
+    python tools/encounter_heatmap.py --out heatmaps  # + <map>.csv and <map>.pgm
+    python tools/encounter_heatmap.py --map 1         # one map only
+"""
+import argparse
+import json
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(ROOT, "src"))
+
+from world.chunks import EXTENSION as CHUNKS_EXTENSION, open_chunked_map
+from world.encounters import EncounterTable
+
+MAPS_DIR = os.path.join(ROOT, "src", "assets", "data", "maps")
+
+def describe(rule):
+    rule_type = rule.get("type", "global")
+    if rule_type == "tile":
+        return f"tile {rule.get('tile_ids', [])}"
+    if rule_type == "rect":
+        return f"rect ({rule.get('x', 0)},{rule.get('y', 0)} {rule.get('w', 0)}x{rule.get('h', 0)})"
+    return rule_type
+
+def write_csv(path, heatmap):
+    with open(path, 'w', encoding='utf-8') as f:
+        for row in heatmap:
+            f.write(",".join(f"{rate:g}" for rate in row) + "\n")
+
+def write_pgm(path, heatmap, width, height, peak, scale=4):
+    """Greyscale image, white = peak (the highest rate on the map)."""
+    peak = peak or 1.0
+    with open(path, 'wb') as f:
+        f.write(f"P5 {width * scale} {height * scale} 255\n".encode("ascii"))
+        for row in heatmap:
+            line = bytes(int(255 * rate / peak) for rate in row for _ in range(scale))
+            f.write(line * scale)
+
+def main():
+    parser = argparse.ArgumentParser(description="Export per-tile encounter rates.")
+    parser.add_argument("--maps-dir", default=MAPS_DIR, help="Directory containing index.json")
+    parser.add_argument("--map", type=int, help="Only this map id")
+    parser.add_argument("--out", help="Write <map>.csv and <map>.pgm heatmaps here")
+    args = parser.parse_args()
+
+    with open(os.path.join(args.maps_dir, "index.json"), 'r', encoding='utf-8') as f:
+        index = json.load(f)
+    if args.out:
+        os.makedirs(args.out, exist_ok=True)
+
+    for entry in index.get("maps", []):
+        if args.map is not None and entry["id"] != args.map:
+            continue
+        path = os.path.join(args.maps_dir, entry["file"])
+        if not os.path.exists(path):
+            print(f"{entry['name']} (id={entry['id']}): {entry['file']} not found, skipped")
+            continue
+        if path.endswith(CHUNKS_EXTENSION):
+            # The chunk store answers the EncounterTable queries itself
+            map_data = open_chunked_map(path)
+            table = map_data["chunks"]
+        else:
+            with open(path, 'r', encoding='utf-8') as f:
+                map_data = json.load(f)
+            table = EncounterTable.from_map(map_data)
+        total = table.width * table.height
+        print(f"{entry['name']} (id={entry['id']}, {table.width}x{table.height})")
+        if not table.rules:
+            print(f"  no rules, flat rate {map_data.get('encounter_rate', 0.0):g} on every step")
+            continue
+
+        counts = table.rule_counts()
+        for number, rule in enumerate(table.rules, 1):
+            share = 100.0 * counts[number] / total if total else 0.0
+            note = "  (never wins)" if counts[number] == 0 else ""
+            print(f"  #{number} {describe(rule):<28} rate {rule.get('rate', 0.0):<6g} "
+                  f"{counts[number]:>7} tiles {share:5.1f}%{note}")
+        if counts[0]:
+            print(f"  -- no rule                    rate 0      {counts[0]:>7} tiles {100.0 * counts[0] / total:5.1f}%")
+
+        if args.out:
+            peak = max((rule.get("rate", 0.0) for number, rule in enumerate(table.rules, 1) if counts[number]),
+                       default=0.0)
+            stem = os.path.join(args.out, os.path.splitext(os.path.basename(entry["file"]))[0])
+            write_csv(stem + ".csv", table.heatmap())
+            write_pgm(stem + ".pgm", table.heatmap(), table.width, table.height, peak)
+            print(f"  -> {stem}.csv, {stem}.pgm")
+
+if __name__ == "__main__":
+    main()
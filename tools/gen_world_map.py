@@ -1,141 +1,127 @@
+"""
+World Map Generator for CSFW RPG
+Generates a layered overworld of any size: plains, forest and desert on the
+ground layer; mountains (border and ridges) and village markers on the
+object layer; portals back to the villages.
+
+    python tools/gen_world_map.py --width 64 --height 64 --out world_gen.json
+    python tools/gen_world_map.py --width 1024 --height 1024 \\
+        --out src/assets/data/maps/world_big.chunks --id 90 --name "Big World"
+
+Outputs ending in .chunks are streamed band by band into a chunk store
+(world/chunks.py), so even very large worlds are never held in memory as a
+whole. --id registers the map in assets/data/maps/index.json.
+"""
+import argparse
 import json
-import random
+import math
 import os
+import random
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(ROOT, "src"))
+
+from world.chunks import CHUNK_SIZE, EXTENSION, ChunkWriter
+
+MAPS_DIR = os.path.join(ROOT, "src", "assets", "data", "maps")
+
+# 0=Grass, 4=Forest, 5=Desert (ground); 6=Mountain, 7=Village (objects)
+VILLAGES = [
+    # (x, y, portal target map, target x, target y)
+    (8, 3, 0, 10, 14),  # Village A
+    (40, 40, 2, 8, 14), # Village B
+]
+
+ENCOUNTER_RULES = [
+    {"type": "tile", "tile_ids": [4], "rate": 0.03, "enemies": ["Wolf", "Spider"]},
+    {"type": "tile", "tile_ids": [5], "rate": 0.03, "enemies": ["Scorpion", "Snake"]},
+    {"type": "tile", "tile_ids": [0, 3], "rate": 0.005, "enemies": ["Slime", "Bat"]},
+]
+
+def villages(width, height):
+    return [v for v in VILLAGES if 0 < v[0] < width - 1 and 0 < v[1] < height - 1]
 
-def generate_map():
-    width = 64
-    height = 64
-    
-    # 0=Grass, 4=Forest, 5=Desert, 6=Mountain, 7=Village, 2=Water
-    tiles = [[0 for _ in range(width)] for _ in range(height)]
-    
-    # Simple biome generation
-    for y in range(height):
+def generate_rows(width, height, y0, y1, rng, sites):
+    """Ground and object rows for map rows [y0, y1). Rows must be generated in order."""
+    clearings = {(x + i, y + j) for x, y, *_ in sites for i in (-1, 0, 1) for j in (-1, 0, 1)}
+    clearings.add((8, 8)) # Arrival tile from Village A
+    markers = {(x, y) for x, y, *_ in sites}
+    ground, objects = [], []
+    for y in range(y0, y1):
+        ground_row, object_row = [], []
         for x in range(width):
             # Noise approximation using sin/cos for smoothish transitions
-            import math
-            nx = x * 0.1
-            ny = y * 0.1
-            noise_val = math.sin(nx) + math.cos(ny) + random.random() * 0.5
-            
-            # Biome logic
+            noise_val = math.sin(x * 0.1) + math.cos(y * 0.1) + rng.random() * 0.5
             if noise_val > 1.5:
-                tiles[y][x] = 4 # Forest
+                tile = 4 # Forest
             elif noise_val < -0.5:
-                tiles[y][x] = 5 # Desert
+                tile = 5 # Desert
             else:
-                tiles[y][x] = 0 # Plains
-            
-            # Mountain barriers
-            if noise_val > 2.2:
-                tiles[y][x] = 6
-                
+                tile = 0 # Plains
+            obj = 6 if noise_val > 2.2 else 0 # Mountain ridges
+
+            if (x, y) in clearings:
+                tile, obj = 0, 0
+            if (x, y) in markers:
+                obj = 7
             # Borders as mountains
-            if x == 0 or x == width-1 or y == 0 or y == height-1:
-                tiles[y][x] = 6
-
-    # Place Villages (Portals)
-    # Village A (Connection to Map 0)
-    # Map 0 portal points to Target X=8, Y=8. So let's make 8,8 safe.
-    tiles[8][8] = 0
-    # Add a visual "Village" entrance nearby?
-    # Actually Map 0 portal -> transforms player to 8,8 on Map 1.
-    # We want a portal ON Map 1 to go back to Map 0.
-    # Let's put a Village tile at 8,3.
-    tiles[3][8] = 7 
-    
-    # Village B (Another safe spot)
-    vx, vy = 40, 40
-    tiles[vy][vx] = 7
-    # Clear area around
-    for i in [-1,0,1]:
-        for j in [-1,0,1]:
-            if tiles[vy+j][vx+i] != 7:
-                tiles[vy+j][vx+i] = 0
-
-    # Load existing maps (specifically to allow cloning Map 0)
-    maps_file = 'assets/data/maps.json'
-    with open(maps_file, 'r') as f:
-        data = json.load(f)
-    
-    # Load existing maps (specifically to allow cloning Map 0)
-    maps_file = 'assets/data/maps.json'
-    with open(maps_file, 'r') as f:
-        data = json.load(f)
-    
-    existing_maps = {m['id']: m for m in data['maps']}
-    
-    # Create Map 2 (Village B) - 32x32
-    import copy
-    
-    # Generate 32x32 tiles for Village B (Simple walled village)
-    vb_w, vb_h = 32, 32
-    vb_tiles = [[0 for _ in range(vb_w)] for _ in range(vb_h)]
-    for y in range(vb_h):
-        for x in range(vb_w):
-            if x == 0 or x == vb_w-1 or y == 0 or y == vb_h-1:
-                vb_tiles[y][x] = 1 # Wall
-            elif x % 4 == 0 and y % 4 == 0:
-                 vb_tiles[y][x] = 3 # Path/Decor
-            else:
-                 vb_tiles[y][x] = 0 # Grass
-    
-    # Create a wider opening in the bottom wall (3x3 area)
-    for y in [29, 30, 31]:
-        for x in [15, 16, 17]:
-            vb_tiles[y][x] = 3 # Path/Walkable
-
-    map_village_b = {
-        "id": 2,
-        "name": "Village B",
-        "width": vb_w,
-        "height": vb_h,
-        "tiles": vb_tiles,
-        "objects": [],
-        "portals": [
-            {
-                "x": 16,
-                "y": 30, # Portal at y=30 for consistency
-                "target_map": 1,
-                "target_x": 40,
-                "target_y": 41
-            }
-        ],
-        "encounter_rate": 0.0
-    }
-    
-    # Update Map 1 (World Map)
-    new_map = {
-        "id": 1,
-        "name": "World Map",
+            if x == 0 or x == width - 1 or y == 0 or y == height - 1:
+                obj = 6
+            ground_row.append(tile)
+            object_row.append(obj)
+        ground.append(ground_row)
+        objects.append(object_row)
+    return ground, objects
+
+def register(map_id, name, out_path):
+    index_path = os.path.join(MAPS_DIR, "index.json")
+    with open(index_path, 'r', encoding='utf-8') as f:
+        index = json.load(f)
+    entry = {"id": map_id, "name": name, "file": os.path.relpath(out_path, MAPS_DIR).replace(os.sep, "/")}
+    index["maps"] = [m for m in index["maps"] if m["id"] != map_id] + [entry]
+    with open(index_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=4)
+    print(f"Registered map {map_id} ({name}) in {index_path}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a layered world map.")
+    parser.add_argument("--width", type=int, default=64)
+    parser.add_argument("--height", type=int, default=64)
+    parser.add_argument("--seed", type=int, default=None, help="Random seed (default: random)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="Tiles per chunk side (.chunks output)")
+    parser.add_argument("--out", default="world_gen.json", help="Output path (.json, or .chunks for a chunk store)")
+    parser.add_argument("--id", type=int, help="Register the map in index.json under this id")
+    parser.add_argument("--name", default="World Map", help="Map name")
+    args = parser.parse_args()
+
+    width, height = args.width, args.height
+    rng = random.Random(args.seed)
+    sites = villages(width, height)
+    meta = {
+        "id": args.id if args.id is not None else 1,
+        "name": args.name,
         "width": width,
         "height": height,
-        "tiles": tiles,
+        "encounter_rules": ENCOUNTER_RULES,
         "objects": [],
-        "portals": [
-            # Portal to Village A (Map 0)
-            {"x": 8, "y": 3, "target_map": 0, "target_x": 10, "target_y": 14},
-            # Portal to Village B (Map 2)
-            {"x": 40, "y": 40, "target_map": 2, "target_x": 10, "target_y": 14}
-        ],
-        "encounter_rate": 0.1
+        "portals": [{"x": x, "y": y, "target_map": target, "target_x": tx, "target_y": ty}
+                    for x, y, target, tx, ty in sites],
     }
-    
-    # Reassemble map list
-    maps_list = []
-    if 0 in existing_maps:
-        maps_list.append(existing_maps[0])
-    
-    maps_list.append(new_map)
-    
-    if map_village_b:
-        maps_list.append(map_village_b)
-    
-    data['maps'] = maps_list
-    
-    with open(maps_file, 'w') as f:
-        json.dump(data, f, indent=4)
-    print("Generated 64x64 World Map with Multiple Villages in maps.json")
+
+    if args.out.endswith(EXTENSION):
+        with ChunkWriter(args.out, meta, width, height, chunk_size=args.chunk_size) as writer:
+            for y0 in range(0, height, args.chunk_size):
+                ground, objects = generate_rows(width, height, y0, min(height, y0 + args.chunk_size), rng, sites)
+                writer.write_band({"ground": ground, "objects": objects})
+    else:
+        ground, objects = generate_rows(width, height, 0, height, rng, sites)
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(dict(meta, layers={"ground": ground, "objects": objects}), f)
+    print(f"Generated {width}x{height} world map -> {args.out} ({os.path.getsize(args.out)} bytes)")
+
+    if args.id is not None:
+        register(args.id, args.name, os.path.abspath(args.out))
 
 if __name__ == "__main__":
-    generate_map()
+    main()
@@ -0,0 +1,54 @@
+"""
+Scenario Runner for CSFW RPG
+Runs YAML/JSON scenarios headlessly (in parallel) and reports pass/fail
+plus per-tick timing, e.g.:
+
+    python tools/run_scenarios.py tests/scenarios/ --workers 8 --budget-ms 16.6
+
+Scenarios live in tests/scenarios/. tests/scenario_mock_input.yaml belongs
+to `csfw run-scenario tests/setup_runner.py ...`, whose setup holds RIGHT.
+"""
+import argparse
+import json
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(ROOT, "src"))
+
+from engine.scenario import run_scenarios, summarize
+
+def main():
+    parser = argparse.ArgumentParser(description="Run headless scenarios.")
+    parser.add_argument("paths", nargs="*", default=[os.path.join(ROOT, "tests", "scenarios")], help="Scenario files or directories")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--replays", type=int, default=1, help="Re-run each scenario and require identical final state")
+    parser.add_argument("--budget-ms", type=float, default=None, help="Fail scenarios whose p95 tick time exceeds this")
+    parser.add_argument("--json", dest="json_path", help="Write the timing summary to this file")
+    args = parser.parse_args()
+
+    results = [summarize(r) for r in run_scenarios(args.paths, workers=args.workers, replays=args.replays)]
+
+    if args.budget_ms is not None:
+        for r in results:
+            if r["passed"] and r["tick_ms_p95"] > args.budget_ms:
+                r["passed"] = False
+                r["error"] = f"p95 tick {r['tick_ms_p95']:.2f} ms exceeds budget {args.budget_ms} ms"
+
+    print(f"{'Scenario':<32} {'Result':<6} {'Ticks':>6} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8}")
+    for r in results:
+        print(f"{r['name']:<32} {'PASS' if r['passed'] else 'FAIL':<6} {r['ticks']:>6} "
+              f"{r['tick_ms_p50']:>8.2f} {r['tick_ms_p95']:>8.2f} {r['tick_ms_max']:>8.2f}")
+        if r["error"]:
+            print(f"    {r['error']}")
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=4)
+
+    failed = sum(1 for r in results if not r["passed"])
+    print(f"{len(results) - failed}/{len(results)} scenarios passed")
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()